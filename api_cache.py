@@ -0,0 +1,156 @@
+"""
+Persistent on-disk cache for YouTube Data API responses
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from quota import quota_cost
+
+# Seconds a cached response is served without asking the API again
+DEFAULT_TTLS = {
+    'search.list': 6 * 3600,
+    'channels.list': 3600,
+    'playlistItems.list': 900,
+    'videos.list': 3600,
+}
+
+DEFAULT_CACHE_PATH = os.path.join('.yt_cache', 'api_cache.sqlite3')
+
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'fresh'])
+
+
+def make_cache_key(method, params):
+    """Build a stable key from the API method and its normalized parameters"""
+    normalized = {
+        k: ','.join(v) if isinstance(v, (list, tuple)) else v
+        for k, v in params.items()
+        if v is not None and k != 'key'
+    }
+    payload = json.dumps([method, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-method TTLs and LRU size bounding.
+
+    Any object exposing ``get``, ``put``, ``refresh`` and ``stats`` with the
+    same signatures can be passed to ``YouTubeAnalytics`` instead.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale': 0,
+                          'evictions': 0, 'units_saved': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                etag TEXT,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)'
+        )
+        self._conn.commit()
+
+    def get(self, method, params):
+        """Return a CacheEntry for the call, or None if nothing is stored"""
+        key = make_cache_key(method, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+
+            body, etag, stored_at = row
+            fresh = now - stored_at < self.ttls.get(method, 0)
+            if fresh:
+                self._counters['hits'] += 1
+                self._counters['units_saved'] += quota_cost(method)
+            else:
+                self._counters['stale'] += 1
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        return CacheEntry(json.loads(body), etag, fresh)
+
+    def put(self, method, params, body):
+        """Store a response body, evicting least recently used entries if needed"""
+        key = make_cache_key(method, params)
+        payload = json.dumps(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, method, body.get('etag'), payload, len(payload), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, method, params):
+        """Mark a stale entry fresh again after a 304 Not Modified revalidation"""
+        key = make_cache_key(method, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, key)
+            )
+            self._conn.commit()
+            self._counters['revalidated'] += 1
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters along with the current cache footprint"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        stats['entries'] = entries
+        stats['size_bytes'] = size
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _evict(self):
+        """Delete least recently accessed rows until the cache fits max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed_at ASC'
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self._counters['evictions'] += len(doomed)
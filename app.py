@@ -1,18 +1,83 @@
 """
 Main application file - Cleaned for public data only
 """
+import logging
 import streamlit as st
 import warnings
 warnings.filterwarnings('ignore')
 
 from youtube import YouTubeAnalytics
-from ui_components import setup_page_config, load_custom_css, display_api_key_input
+from api_cache import ResponseCache
+from quota import QuotaScheduler
+from video_store import VideoStore
+from snapshot_store import SnapshotStore
+from instrumentation import ApiMetrics, DEFAULT_METRICS_FILE
+from channel_registry import ChannelRegistry
+from transcripts import TranscriptStore
+from search_index import SearchIndex
+from ui_components import (
+    setup_page_config, 
+    load_custom_css, 
+    display_api_key_input, 
+    display_performance_options,
+    display_cache_stats,
+    display_quota_stats,
+    display_api_diagnostics
+)
 from tab_controllers import (
     handle_channel_search_tab, 
     handle_analytics_dashboard_tab, 
     handle_video_analysis_tab
 )
 
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def get_response_cache():
+    """Share one on-disk API response cache across reruns and sessions"""
+    return ResponseCache()
+
+@st.cache_resource
+def get_quota_scheduler():
+    """Share one quota budget across every analyst using this server"""
+    return QuotaScheduler()
+
+@st.cache_resource
+def get_video_store():
+    """Share the local video store used for incremental syncs"""
+    return VideoStore()
+
+@st.cache_resource
+def get_snapshot_store():
+    """Share the columnar snapshot store of channel and video stats"""
+    return SnapshotStore()
+
+@st.cache_resource
+def get_transcript_store():
+    """Share the compressed on-disk transcript cache"""
+    return TranscriptStore()
+
+@st.cache_resource
+def get_search_index():
+    """Share the full-text index of fetched videos"""
+    return SearchIndex()
+
+@st.cache_resource
+def get_api_metrics():
+    """Share one record of API call latency, bytes and quota units across sessions"""
+    return ApiMetrics()
+
+@st.cache_resource
+def get_channel_registry():
+    """Share the indexed registry of known channels, seeded with the predefined ones"""
+    return ChannelRegistry.load()
+
+@st.cache_resource(show_spinner=False)
+def get_yt_analytics(api_key):
+    """Keep one API client per key so reruns reuse its service object and connections"""
+    return YouTubeAnalytics(api_key, cache=get_response_cache(), scheduler=get_quota_scheduler(),
+                            metrics=get_api_metrics())
+
 def main():
     setup_page_config()
     load_custom_css()
@@ -24,7 +89,9 @@ def main():
     if not api_key:
         return
     
-    yt_analytics = YouTubeAnalytics(api_key)
+    yt_analytics = get_yt_analytics(api_key)
+    display_performance_options()
+    snapshot_store = get_snapshot_store()
     
     tab1, tab2, tab3 = st.tabs([
         "🔍 Channel Search", 
@@ -33,13 +100,24 @@ def main():
     ])
     
     with tab1:
-        handle_channel_search_tab(yt_analytics)
+        handle_channel_search_tab(yt_analytics, snapshot_store, get_channel_registry())
     
     with tab2:
-        handle_analytics_dashboard_tab()
+        handle_analytics_dashboard_tab(snapshot_store)
     
     with tab3:
-        handle_video_analysis_tab(yt_analytics)
+        handle_video_analysis_tab(
+            yt_analytics, get_video_store(), snapshot_store, get_transcript_store(), get_search_index()
+        )
+    
+    display_quota_stats(yt_analytics.scheduler.stats())
+    display_cache_stats(yt_analytics.cache.stats())
+    display_api_diagnostics(yt_analytics.metrics)
+    # Textfile for a Prometheus node_exporter collector, refreshed on every rerun
+    try:
+        yt_analytics.metrics.write_prometheus(DEFAULT_METRICS_FILE)
+    except OSError as e:
+        logger.warning("Could not write %s: %s", DEFAULT_METRICS_FILE, e)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,302 @@
+"""
+Asyncio YouTube API client for crawls with hundreds of requests in flight
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextlib import aclosing
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from instrumentation import ApiMetrics
+from quota import QuotaExceededError, QuotaScheduler, classify_error, quota_cost
+from youtube import (
+    DEFAULT_FIELDS,
+    PartialFetchError,
+    _parse_channel_columns,
+    _parse_search_columns,
+    _parse_video_columns,
+    _rows,
+)
+
+DEFAULT_ROOT_URL = 'https://youtube.googleapis.com/'
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncYouTubeAnalytics:
+    """Coroutine counterpart of YouTubeAnalytics on one shared aiohttp session
+
+    The list() methods return the same rows as YouTubeAnalytics, so
+    process_channel_data and process_video_data take them unchanged, and
+    go through the same quota scheduler, response cache, metrics and
+    fields selections. At most max_concurrency requests are in flight at
+    once, over a connection pool of the same size. Cancelling the task
+    that awaits a method cancels its outstanding requests. Use as an async
+    context manager, or await close(), inside the event loop that makes
+    the calls; aiohttp is imported when the client is created, so the
+    rest of the app works without it.
+    """
+
+    def __init__(self, api_key, cache=None, scheduler=None, api_endpoint=None, metrics=None,
+                 fields=None, max_concurrency=64, timeout=30.0, session=None):
+        import aiohttp
+        self._aiohttp = aiohttp
+        self.api_key = api_key
+        self.root_url = api_endpoint or DEFAULT_ROOT_URL
+        if not self.root_url.endswith('/'):
+            self.root_url += '/'
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self.fields = dict(DEFAULT_FIELDS, **(fields or {}))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connection pool, unless the session was passed in by the caller"""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+        self._semaphore = None
+
+    def _connection(self):
+        """Return (session, semaphore), creating them in the running event loop on first use"""
+        if self._session is None:
+            self._session = self._aiohttp.ClientSession(
+                connector=self._aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=self._aiohttp.ClientTimeout(total=self.timeout)
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session, self._semaphore
+
+    async def _execute(self, resource, priority='normal', **params):
+        """Run a list() call on a resource through the response cache and quota scheduler"""
+        method = f'{resource}.list'
+        start = time.perf_counter()
+        cached = await asyncio.to_thread(self.cache.get, method, params) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            self.metrics.record(method, params, (time.perf_counter() - start) * 1000,
+                                outcome='cache_hit', priority=priority)
+            return cached.body
+
+        url = f'{self.root_url}youtube/v3/{resource}'
+        query = {name: str(value) for name, value in params.items() if value is not None}
+        query.update(key=self.api_key, alt='json')
+        headers = {'If-None-Match': cached.etag} if cached is not None and cached.etag else {}
+        session, semaphore = self._connection()
+
+        attempts = 0
+        received = 0
+        outcome = 'error'
+        try:
+            while True:
+                # acquire() can sleep while the bucket refills, so it runs off the event loop
+                await asyncio.to_thread(self.scheduler.acquire, method, priority)
+                attempts += 1
+                try:
+                    async with semaphore:
+                        async with session.get(url, params=query, headers=headers) as reply:
+                            status = reply.status
+                            content = await reply.read()
+                    received += len(content)
+                    if status >= 300:
+                        raise HttpError(httplib2.Response({'status': status}), content, uri=url)
+                    response = json.loads(content)
+                    outcome = 'ok'
+                    break
+                except Exception as e:
+                    if cached is not None and getattr(getattr(e, 'resp', None), 'status', None) == 304:
+                        await asyncio.to_thread(self.cache.refresh, method, params)
+                        outcome = 'not_modified'
+                        return cached.body
+                    kind = 'transient' if isinstance(e, self._aiohttp.ClientConnectionError) else classify_error(e)
+                    if kind == 'quota':
+                        self.scheduler.exhaust()
+                        raise QuotaExceededError(f"Daily quota exhausted while calling {method}") from e
+                    if kind != 'transient' or attempts > self.scheduler.max_retries:
+                        raise
+                    self.scheduler.record_retry(method)
+                    await asyncio.sleep(self.scheduler.backoff_delay(attempts))
+        finally:
+            self.metrics.record(
+                method, params, (time.perf_counter() - start) * 1000, received,
+                quota_cost(method) * attempts, max(attempts - 1, 0), outcome, priority
+            )
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, method, params, response)
+        return response
+
+    async def search_channels(self, query, max_results=50, priority='normal'):
+        """Search for channels based on query"""
+        search_response = await self._execute(
+            'search',
+            priority=priority,
+            q=query,
+            part='snippet',
+            type='channel',
+            maxResults=max_results,
+            relevanceLanguage='en',
+            fields=self.fields['search_channels']
+        )
+
+        snippets = [item['snippet'] for item in search_response.get('items', [])]
+        return _rows(_parse_search_columns(snippets, [snippet['channelId'] for snippet in snippets]))
+
+    async def get_channel_snippets(self, channel_ids, priority='normal'):
+        """Fetch search-result rows for known channel IDs, all 50-ID chunks at once"""
+        responses = await asyncio.gather(*(
+            self._execute('channels', priority=priority, part='snippet', id=','.join(channel_ids[i:i+50]),
+                          fields=self.fields['channel_snippets'])
+            for i in range(0, len(channel_ids), 50)
+        ))
+        channels = []
+        for response in responses:
+            items = response.get('items', [])
+            channels.extend(_rows(_parse_search_columns(
+                [item['snippet'] for item in items], [item['id'] for item in items]
+            )))
+        return channels
+
+    async def get_channel_stats(self, channel_ids, priority='normal'):
+        """Get detailed channel statistics, fetching all 50-ID chunks concurrently
+
+        Output order follows channel_ids. Failed chunks raise
+        PartialFetchError once the others are done, whose results keep
+        the chunks that succeeded.
+        """
+        chunks = [channel_ids[i:i+50] for i in range(0, len(channel_ids), 50)]
+        results = await asyncio.gather(*(self._fetch_channel_chunk(chunk, priority) for chunk in chunks))
+
+        all_data = []
+        errors = {}
+        for chunk_number, (chunk_data, error) in enumerate(results, start=1):
+            if error is not None:
+                label = f"channel chunk {chunk_number}/{len(chunks)}"
+                logger.error("Error fetching %s: %s", label, error)
+                errors[label] = error
+            all_data.extend(chunk_data)
+
+        if errors:
+            raise PartialFetchError(f"{len(errors)} of {len(chunks)} channel chunks failed", all_data, errors)
+        return all_data
+
+    async def _fetch_channel_chunk(self, chunk, priority='normal'):
+        """Fetch one chunk of up to 50 channels, returning (rows, error)"""
+        try:
+            response = await self._execute(
+                'channels',
+                priority=priority,
+                part='snippet,contentDetails,statistics',
+                id=','.join(chunk),
+                fields=self.fields['channel_stats']
+            )
+        except Exception as e:
+            return [], e
+
+        return _rows(_parse_channel_columns(response.get('items', []))), None
+
+    async def get_video_details(self, playlist_id, max_results=50, priority='normal'):
+        """Get video details from a channel's playlist"""
+        videos = []
+        async with aclosing(self.iter_video_columns(playlist_id, max_results, priority)) as pages:
+            async for columns in pages:
+                videos.extend(_rows(columns))
+        return videos
+
+    async def get_video_details_for_channels(self, playlist_ids, max_results=50, priority='normal'):
+        """Get video details for several uploads playlists concurrently
+
+        Returns a dict mapping playlist_id to its list of videos, like
+        YouTubeAnalytics.get_video_details_for_channels. Failed playlists
+        raise PartialFetchError once the others are done; pages fetched
+        before a failure are kept in its results.
+        """
+        videos = {playlist_id: [] for playlist_id in playlist_ids}
+        errors = {}
+
+        async def fetch(playlist_id):
+            try:
+                async with aclosing(self.iter_video_columns(playlist_id, max_results, priority)) as pages:
+                    async for columns in pages:
+                        videos[playlist_id].extend(_rows(columns))
+            except Exception as e:
+                logger.error("Error fetching playlist %s: %s", playlist_id, e)
+                errors[f"playlist {playlist_id}"] = e
+
+        await asyncio.gather(*(fetch(playlist_id) for playlist_id in videos))
+        if errors:
+            raise PartialFetchError(f"{len(errors)} playlist calls failed", videos, errors)
+        return videos
+
+    async def iter_video_columns(self, playlist_id, max_results=50, priority='normal'):
+        """Yield a playlist's videos page by page as dicts of column lists, in playlist order
+
+        The videos().list call for each page runs while the next
+        playlistItems page is fetched. Closing the generator, or an error,
+        cancels the calls still in flight.
+        """
+        pending = deque()
+        try:
+            async with aclosing(self._iter_playlist_pages(playlist_id, max_results, priority)) as pages:
+                async for video_ids in pages:
+                    pending.append(asyncio.ensure_future(self._fetch_video_columns(video_ids, priority)))
+                    while pending and pending[0].done():
+                        yield pending.popleft().result()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _iter_playlist_pages(self, playlist_id, max_results, priority='normal'):
+        """Yield lists of video IDs, one per playlistItems page"""
+        fetched = 0
+        next_page_token = None
+
+        while fetched < max_results:
+            response = await self._execute(
+                'playlistItems',
+                priority=priority,
+                part='snippet',
+                playlistId=playlist_id,
+                maxResults=min(50, max_results - fetched),
+                pageToken=next_page_token,
+                fields=self.fields['playlist_items']
+            )
+
+            video_ids = [item['snippet']['resourceId']['videoId'] for item in response.get('items', [])]
+            fetched += len(video_ids)
+            if video_ids:
+                yield video_ids
+
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+
+    async def _fetch_video_columns(self, video_ids, priority='normal'):
+        """Get statistics, snippet and duration for up to 50 video IDs as column lists"""
+        stats_response = await self._execute(
+            'videos',
+            priority=priority,
+            part='statistics,snippet,contentDetails',
+            id=','.join(video_ids),
+            fields=self.fields['video_details']
+        )
+
+        return _parse_video_columns(stats_response.get('items', []))
@@ -0,0 +1,116 @@
+"""
+Multi-channel crawl throughput: thread-pool client vs the asyncio client
+
+Run from the project root:
+
+    python -m benchmarks.bench_async --channels 100 --videos 200 --latency 0.2 --workers 8 32 --concurrency 64 256
+
+Every run crawls the same --channels uploads playlists of --videos videos
+each from a FakeYouTubeServer that waits --latency seconds per request.
+The thread rows use crawl_channels over YouTubeAnalytics with the given
+pages in flight; the asyncio rows use
+AsyncYouTubeAnalytics.get_video_details_for_channels with the given
+concurrency limit. Both hand their rows to process_video_data, so the
+frames are compared for equality as well as timed.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from async_youtube import AsyncYouTubeAnalytics
+from crawler import crawl_channels
+from data_processor import process_video_data
+from fake_youtube import FakeYouTubeServer, SyntheticFixtures
+from quota import QuotaScheduler
+from youtube import YouTubeAnalytics
+
+
+def run_threads(endpoint, channels, videos, workers):
+    yt_analytics = YouTubeAnalytics('benchmark-key', scheduler=QuotaScheduler(capacity=10 ** 12),
+                                    api_endpoint=endpoint)
+    video_df, _ = crawl_channels(yt_analytics, channels, max_results=videos, max_in_flight=workers)
+    return video_df
+
+
+async def run_async(endpoint, channels, videos, concurrency):
+    async with AsyncYouTubeAnalytics('benchmark-key', scheduler=QuotaScheduler(capacity=10 ** 12),
+                                     api_endpoint=endpoint, max_concurrency=concurrency) as yt_analytics:
+        videos_by_playlist = await yt_analytics.get_video_details_for_channels(
+            [channel['playlist_id'] for channel in channels], videos
+        )
+    return process_video_data.__wrapped__([
+        dict(video, channel_id=channel['channel_id'], channel_title=channel['channel_title'])
+        for channel in channels
+        for video in videos_by_playlist[channel['playlist_id']]
+    ])
+
+
+def client_threads():
+    """Threads alive in this process, leaving out the fake server's per-connection threads"""
+    return sum('process_request_thread' not in thread.name for thread in threading.enumerate())
+
+
+def peak_threads(fn):
+    """Run fn() and return (result, seconds, most client threads alive at once)"""
+    peak = client_threads()
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.wait(0.01):
+            peak = max(peak, client_threads())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        seconds = time.perf_counter() - start
+        done.set()
+        sampler.join()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--videos', type=int, default=200, help='videos crawled per channel')
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per API round trip')
+    parser.add_argument('--workers', type=int, nargs='+', default=[8, 32], help='thread-pool pages in flight')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[64, 256],
+                        help='asyncio requests in flight')
+    args = parser.parse_args()
+
+    fixtures = SyntheticFixtures(n_channels=args.channels, videos_per_channel=args.videos)
+    with FakeYouTubeServer(fixtures, latency=args.latency) as server:
+        setup = YouTubeAnalytics('benchmark-key', scheduler=QuotaScheduler(capacity=10 ** 12),
+                                 api_endpoint=server.endpoint)
+        _, search = fixtures.respond('search', {'q': 'data', 'maxResults': str(args.channels)})
+        channels = setup.get_channel_stats([item['id']['channelId'] for item in search['items']], max_workers=8)
+
+        print(f"{len(channels)} channels x {args.videos} videos, {args.latency * 1000:.0f} ms API latency\n")
+        print(f"{'client':<22}{'seconds':>9}{'videos':>9}{'HTTP req/s':>12}{'threads':>9}")
+        reference = None
+        runs = [(f'threads, {workers} in flight', lambda workers=workers: run_threads(
+                    server.endpoint, channels, args.videos, workers))
+                for workers in args.workers]
+        runs += [(f'asyncio, {limit} in flight', lambda limit=limit: asyncio.run(run_async(
+                    server.endpoint, channels, args.videos, limit)))
+                 for limit in args.concurrency]
+        for label, fn in runs:
+            process_video_data.cache_clear()
+            before = server.request_count()
+            video_df, seconds, threads = peak_threads(fn)
+            requests = server.request_count() - before
+            print(f"{label:<22}{seconds:>9.2f}{len(video_df):>9,}{requests / seconds:>12,.0f}{threads:>9}")
+            if reference is None:
+                reference = video_df
+            elif not video_df.drop(columns='days_since_published').equals(
+                    reference.drop(columns='days_since_published')):
+                print(f"  warning: {label} returned a different frame")
+
+
+if __name__ == '__main__':
+    main()
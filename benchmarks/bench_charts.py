@@ -0,0 +1,61 @@
+"""
+Payload size and build time of chart figures in SVG vs large-data mode
+
+Run from the project root:
+
+    python -m benchmarks.bench_charts --sizes 1000 10000 100000
+
+For each size the multi-channel dashboard and a long snapshot-history
+series are built twice: with large-data mode disabled (SVG traces, a text
+label per point, every point serialized) and with the default thresholds
+(WebGL traces, hover-only labels, LTTB-downsampled lines). Build time is
+the figure construction, serialize time is fig.to_json(), which is what
+Streamlit ships to the browser; the payload column is its size. Browser
+paint time is not measured here, but it scales with the point and DOM
+counts that the payload reflects.
+"""
+import argparse
+import math
+import time
+
+from benchmarks.synthetic import make_channel_records, make_history_frame
+from data_processor import process_channel_data
+from visualizations import create_channel_history_chart, create_multi_channel_dashboard
+
+
+def _measure(build):
+    """Return (build ms, serialize ms, payload KiB) for a figure factory"""
+    start = time.perf_counter()
+    fig = build()
+    built = time.perf_counter()
+    payload = fig.to_json()
+    serialized = time.perf_counter()
+    return (built - start) * 1000, (serialized - built) * 1000, len(payload) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'chart':<22}{'points':>9}{'mode':>8}{'build ms':>11}{'json ms':>10}{'payload KiB':>13}")
+    for n in args.sizes:
+        channel_df = process_channel_data(make_channel_records(n))
+        history_df = make_history_frame(n)
+        cases = [
+            ('channel dashboard',
+             lambda: create_multi_channel_dashboard(channel_df, point_threshold=math.inf),
+             lambda: create_multi_channel_dashboard(channel_df)),
+            ('snapshot history',
+             lambda: create_channel_history_chart.__wrapped__(history_df, max_points=math.inf,
+                                                               point_threshold=math.inf),
+             lambda: create_channel_history_chart.__wrapped__(history_df)),
+        ]
+        for label, svg, large in cases:
+            for mode, build in (('svg', svg), ('large', large)):
+                build_ms, json_ms, kib = _measure(build)
+                print(f"{label:<22}{n:>9,}{mode:>8}{build_ms:>11.1f}{json_ms:>10.1f}{kib:>13,.0f}")
+
+
+if __name__ == '__main__':
+    main()
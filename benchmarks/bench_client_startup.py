@@ -0,0 +1,105 @@
+"""
+Per-interaction latency of building the API client vs reusing a cached one
+
+Run from the project root:
+
+    python -m benchmarks.bench_client_startup
+
+Compares what every Streamlit rerun used to pay (a fresh
+googleapiclient build plus a fresh HTTP connection per call) against the
+cached YouTubeAnalytics instance, which keeps its service object and
+pooled keep-alive connections. The reuse row times app.get_yt_analytics,
+the st.cache_resource getter each rerun calls, after its first call has
+built the client. API calls go to a local HTTP server, so the numbers
+isolate client overhead from network latency.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+
+from app import get_yt_analytics
+from youtube import YouTubeAnalytics
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({'items': []}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _timed(fn, repeat):
+    """Return per-call latencies in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(samples):
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+    return f"p50 {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def build_per_rerun():
+        build('youtube', 'v3', developerKey='benchmark-key')
+
+    cached = YouTubeAnalytics('benchmark-key')
+    cached.youtube = build('youtube', 'v3', developerKey='benchmark-key',
+                           static_discovery=True, cache_discovery=False,
+                           client_options={'api_endpoint': endpoint})
+
+    def call_fresh_connection():
+        cached.youtube.videos().list(part='id', id='x').execute(http=build_http())
+
+    def call_pooled_connection():
+        cached._execute('videos', part='id', id='x')
+
+    def get_cached_client():
+        get_yt_analytics('benchmark-key')
+
+    get_cached_client()
+    build_samples = _timed(build_per_rerun, args.repeat)
+    reuse_samples = _timed(get_cached_client, args.repeat)
+    fresh_samples = _timed(call_fresh_connection, args.repeat)
+    pooled_samples = _timed(call_pooled_connection, args.repeat)
+
+    rows = [
+        ('client build per rerun (before)', _summary(build_samples)),
+        ('client reuse per rerun (after)', _summary(reuse_samples)),
+        ('API call, new connection (before)', _summary(fresh_samples)),
+        ('API call, pooled connection (after)', _summary(pooled_samples)),
+    ]
+    for label, result in rows:
+        print(f"{label:<38}{result}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
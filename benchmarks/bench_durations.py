@@ -0,0 +1,52 @@
+"""
+Vectorized ISO-8601 duration parsing vs a per-row apply baseline
+
+Run from the project root:
+
+    python -m benchmarks.bench_durations --rows 1000000
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_durations
+from data_processor import parse_iso8601_durations
+
+_DURATION_RE = re.compile(r'^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+
+def parse_duration_naive(value):
+    """Per-value reference parser, the shape of code the vectorized version replaces"""
+    match = _DURATION_RE.match(str(value))
+    if match is None or not any(match.groups()):
+        return np.nan
+    weeks, days, hours, minutes, seconds = (float(part or 0) for part in match.groups())
+    return weeks * 604800 + days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    durations = make_durations(args.rows)
+
+    start = time.perf_counter()
+    naive = durations.apply(parse_duration_naive)
+    naive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = parse_iso8601_durations(durations)
+    vectorized_seconds = time.perf_counter() - start
+
+    assert np.allclose(naive.to_numpy(), vectorized.to_numpy(), equal_nan=True)
+    print(f"rows:        {args.rows:,}")
+    print(f"apply:       {naive_seconds:8.3f} s")
+    print(f"vectorized:  {vectorized_seconds:8.3f} s")
+    print(f"speedup:     {naive_seconds / vectorized_seconds:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+End-to-end search -> stats -> videos -> process -> chart timings against a local fake API
+
+Run from the project root:
+
+    python -m benchmarks.bench_end_to_end --iterations 50 --latency 0.02 --concurrency 4
+
+Each flow repeats what the tab controllers do for one user: search for
+channels, fetch their statistics, fetch the top channel's uploads, build
+the channel and video DataFrames and summaries, then build and serialize
+the dashboard, performance and trend figures. Memoization is bypassed so
+every flow does the full work. API calls go to a FakeYouTubeServer with
+the given per-request latency, or replay a recorded cassette with
+--cassette. Per stage the report gives p50/p95 latency, how many stage
+runs per second the given concurrency sustains, and the HTTP requests per
+second the API stages issue.
+"""
+import argparse
+import statistics
+import threading
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from data_processor import (
+    get_channel_summary_stats,
+    get_video_summary_stats,
+    process_channel_data,
+    process_video_data,
+)
+from fake_youtube import FakeYouTubeServer, RecordedFixtures, SyntheticFixtures
+from quota import QuotaScheduler
+from visualizations import (
+    create_channel_comparison_chart,
+    create_engagement_trends_chart,
+    create_video_performance_chart,
+)
+from youtube import YouTubeAnalytics
+
+STAGES = ['search', 'stats', 'videos', 'process', 'chart']
+
+# Fake server resources each API stage calls
+STAGE_RESOURCES = {
+    'search': ['search'],
+    'stats': ['channels', 'batch'],
+    'videos': ['playlistItems', 'videos'],
+}
+
+
+def run_flow(yt_analytics, query, channels, videos, samples, lock):
+    """Run one search-to-chart flow, appending per-stage latencies in milliseconds"""
+    timings = {}
+
+    def timed(stage, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[stage] = (time.perf_counter() - start) * 1000
+        return result
+
+    found = timed('search', lambda: yt_analytics.search_channels(query, max_results=channels))
+    channel_data = timed('stats', lambda: yt_analytics.get_channel_stats(
+        [channel['channel_id'] for channel in found], max_workers=8
+    ))
+    top_channel = max(channel_data, key=lambda channel: channel['subscribers'])
+    video_data = timed('videos', lambda: yt_analytics.get_video_details(
+        top_channel['playlist_id'], videos, pipelined=True
+    ))
+
+    def process():
+        channel_df = process_channel_data.__wrapped__(channel_data)
+        video_df = process_video_data.__wrapped__(video_data)
+        get_channel_summary_stats.__wrapped__(channel_df)
+        get_video_summary_stats.__wrapped__(video_df)
+        return channel_df, video_df
+
+    channel_df, video_df = timed('process', process)
+
+    def chart():
+        for fig in (
+            create_channel_comparison_chart.__wrapped__(channel_df),
+            create_video_performance_chart.__wrapped__(video_df, top_channel['channel_title']),
+            create_engagement_trends_chart.__wrapped__(video_df),
+        ):
+            fig.to_json()
+
+    timed('chart', chart)
+    with lock:
+        for stage, elapsed in timings.items():
+            samples[stage].append(elapsed)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per API round trip')
+    parser.add_argument('--channels', type=int, default=50, help='search results per flow')
+    parser.add_argument('--videos', type=int, default=200, help='videos fetched per flow')
+    parser.add_argument('--page-size', type=int, default=50, help='playlistItems page size')
+    parser.add_argument('--cassette', help='replay recorded responses, synthetic on a miss')
+    parser.add_argument('--query', default='data science')
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore', message='Converting to PeriodArray')
+
+    fixtures = SyntheticFixtures(n_channels=args.channels, videos_per_channel=args.videos,
+                                 page_size=args.page_size)
+    if args.cassette:
+        fixtures = RecordedFixtures(args.cassette, fallback=fixtures)
+
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    with FakeYouTubeServer(fixtures, latency=args.latency) as server:
+        yt_analytics = YouTubeAnalytics(
+            'benchmark-key', scheduler=QuotaScheduler(capacity=10 ** 12), api_endpoint=server.endpoint
+        )
+        # Warm up imports, connections and plotly's validators outside the measurement
+        run_flow(yt_analytics, args.query, args.channels, args.videos, defaultdict(list), lock)
+        server.requests.clear()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            for future in [pool.submit(run_flow, yt_analytics, args.query, args.channels,
+                                       args.videos, samples, lock)
+                           for _ in range(args.iterations)]:
+                future.result()
+        wall = time.perf_counter() - start
+        requests = dict(server.requests)
+
+    print(f"{args.iterations} flows, concurrency {args.concurrency}, "
+          f"{args.latency * 1000:.0f} ms API latency, {wall:.2f} s wall\n")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'runs/s':>10}{'HTTP req':>10}{'HTTP req/s':>12}")
+    for stage in STAGES:
+        values = samples[stage]
+        busy = sum(values) / 1000 / args.concurrency
+        http = sum(requests.get(resource, 0) for resource in STAGE_RESOURCES.get(stage, []))
+        http_columns = f"{http:>10,}{http / busy:>12,.1f}" if stage in STAGE_RESOURCES else f"{'-':>10}{'-':>12}"
+        print(f"{stage:<10}{statistics.median(values):>10.1f}{_percentile(values, 95):>10.1f}"
+              f"{len(values) / busy:>10.1f}{http_columns}")
+    print(f"\n{'flows/s':<10}{args.iterations / wall:>10.2f}"
+          f"   HTTP req/s {sum(requests.values()) / wall:,.1f}")
+
+
+if __name__ == '__main__':
+    main()
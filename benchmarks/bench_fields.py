@@ -0,0 +1,131 @@
+"""
+Response bytes and parse time with partial-response fields vs whole parts
+
+Run from the project root:
+
+    python -m benchmarks.bench_fields --pages 400 --channels 20 --videos 500
+
+The first table serializes --pages videos().list and playlistItems().list
+responses from the synthetic fixtures, whole and trimmed to the
+DEFAULT_FIELDS selections, and times json.loads and building a DataFrame
+from them, once through per-item row dicts as the client used to and
+once through column lists. The second crawls --channels channels of --videos
+uploads each against a local FakeYouTubeServer, once with fields disabled
+and once with the defaults, and reports the response bytes the client
+received and the wall time.
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from crawler import crawl_channels
+from data_processor import process_video_data
+from fake_youtube import FakeYouTubeServer, SyntheticFixtures, apply_fields
+from quota import QuotaScheduler
+from youtube import DEFAULT_FIELDS, YouTubeAnalytics, _parse_video_columns
+
+
+def parse_video_rows(items):
+    """Per-item row dicts, as videos().list responses were parsed before column parsing"""
+    return [{
+        'video_id': item['id'],
+        'title': item['snippet']['title'],
+        'description': item['snippet'].get('description', '')[:300],
+        'published_date': item['snippet']['publishedAt'],
+        'views': int(item['statistics'].get('viewCount', 0)),
+        'likes': int(item['statistics'].get('likeCount', 0)),
+        'comments': int(item['statistics'].get('commentCount', 0)),
+        'duration': item.get('contentDetails', {}).get('duration', 'N/A')
+    } for item in items]
+
+
+def make_pages(fixtures, pages):
+    """Return ({'videos': [...], 'playlistItems': [...]} full bodies, same trimmed) as bytes"""
+    full = {'videos': [], 'playlistItems': []}
+    lean = {'videos': [], 'playlistItems': []}
+    for page in range(pages):
+        playlist_id = f'UU{page:022d}'
+        _, playlist = fixtures.respond('playlistItems', {'playlistId': playlist_id, 'maxResults': '50'})
+        video_ids = [item['snippet']['resourceId']['videoId'] for item in playlist['items']]
+        _, videos = fixtures.respond('videos', {'id': ','.join(video_ids)})
+        for resource, body, fields in [('playlistItems', playlist, DEFAULT_FIELDS['playlist_items']),
+                                       ('videos', videos, DEFAULT_FIELDS['video_details'])]:
+            full[resource].append(json.dumps(body).encode('utf-8'))
+            lean[resource].append(json.dumps(apply_fields(body, fields)).encode('utf-8'))
+    return full, lean
+
+
+def time_parse(bodies, parse):
+    """Return (seconds to json.loads every body, seconds to build one DataFrame with parse), best of 3"""
+    loads, build = [], []
+    for _ in range(3):
+        start = time.perf_counter()
+        pages = [json.loads(body)['items'] for body in bodies]
+        loads.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        parse(pages)
+        build.append(time.perf_counter() - start)
+    return min(loads), min(build)
+
+
+def parse_as_rows(pages):
+    return pd.DataFrame([row for items in pages for row in parse_video_rows(items)])
+
+
+def parse_as_columns(pages):
+    columns = [_parse_video_columns(items) for items in pages]
+    return pd.DataFrame({name: [value for page in columns for value in page[name]] for name in columns[0]})
+
+
+def crawl(server, channel_ids, videos, fields):
+    """Return (response KiB, seconds, video rows) for one crawl of channel_ids"""
+    yt_analytics = YouTubeAnalytics('benchmark-key', scheduler=QuotaScheduler(capacity=10 ** 12),
+                                    api_endpoint=server.endpoint, fields=fields)
+    start = time.perf_counter()
+    channels = yt_analytics.get_channel_stats(channel_ids)
+    video_df, _ = crawl_channels(yt_analytics, channels, max_results=videos)
+    seconds = time.perf_counter() - start
+    received = sum(method['response_kib'] for method in yt_analytics.metrics.summary().values())
+    return received, seconds, len(video_df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=200, help='50-video response pages to parse')
+    parser.add_argument('--channels', type=int, default=20, help='channels to crawl')
+    parser.add_argument('--videos', type=int, default=500, help='uploads crawled per channel')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per fake API round trip')
+    args = parser.parse_args()
+
+    full, lean = make_pages(SyntheticFixtures(), args.pages)
+    print(f"{args.pages} pages of 50 videos")
+    print(f"{'response':<16}{'full KiB':>10}{'fields KiB':>12}{'ratio':>8}")
+    for resource in ['playlistItems', 'videos']:
+        full_size = sum(map(len, full[resource])) / 1024
+        lean_size = sum(map(len, lean[resource])) / 1024
+        print(f"{resource:<16}{full_size:>10,.0f}{lean_size:>12,.0f}{full_size / lean_size:>7.1f}x")
+
+    print(f"\n{'videos parse':<24}{'loads ms':>10}{'frame ms':>10}{'total ms':>10}")
+    for label, bodies, parse in [('full parts, rows', full['videos'], parse_as_rows),
+                                 ('full parts, columns', full['videos'], parse_as_columns),
+                                 ('fields, rows', lean['videos'], parse_as_rows),
+                                 ('fields, columns', lean['videos'], parse_as_columns)]:
+        loads, build = time_parse(bodies, parse)
+        print(f"{label:<24}{loads * 1000:>10.1f}{build * 1000:>10.1f}{(loads + build) * 1000:>10.1f}")
+
+    fixtures = SyntheticFixtures(n_channels=args.channels, videos_per_channel=args.videos)
+    with FakeYouTubeServer(fixtures, latency=args.latency) as server:
+        _, search = fixtures.respond('search', {'q': 'data', 'maxResults': str(args.channels)})
+        channel_ids = [item['id']['channelId'] for item in search['items']]
+        print(f"\ncrawl of {len(channel_ids)} channels x {args.videos} videos")
+        print(f"{'fields':<10}{'KiB received':>14}{'seconds':>10}{'videos':>9}")
+        for label, fields in [('none', dict.fromkeys(DEFAULT_FIELDS)), ('default', None)]:
+            process_video_data.cache_clear()
+            received, seconds, rows = crawl(server, channel_ids, args.videos, fields)
+            print(f"{label:<10}{received:>14,.0f}{seconds:>10.2f}{rows:>9,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Memory of the default vs compact channel and video DataFrame layouts
+
+Run from the project root:
+
+    python -m benchmarks.bench_memory --channels 10000 --videos 100000
+"""
+import argparse
+
+import pandas as pd
+
+from benchmarks.synthetic import make_channel_records, make_video_records
+from data_processor import memory_report, process_channel_data, process_video_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--channels', type=int, default=10_000)
+    parser.add_argument('--videos', type=int, default=100_000)
+    args = parser.parse_args()
+
+    pd.set_option('display.width', 120)
+    for label, df in [
+        (f'channels ({args.channels:,} rows)', process_channel_data(make_channel_records(args.channels))),
+        (f'videos ({args.videos:,} rows)', process_video_data(make_video_records(args.videos))),
+    ]:
+        report = memory_report(df)
+        report[['bytes', 'compact_bytes']] = (report[['bytes', 'compact_bytes']] / 1024).round(1)
+        print(f"\n== {label} ==  (sizes in KiB)")
+        print(report.rename(columns={'bytes': 'KiB', 'compact_bytes': 'compact_KiB'}).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Search index build rate, size and query latency against a str.contains scan
+
+Run from the project root:
+
+    python -m benchmarks.bench_search_index --docs 1000000 --batch 100000
+
+Synthetic documents are added --batch at a time, as incremental crawls
+would add them, then the index is reopened from disk (its postings are
+memory-mapped, so this is cheap) and every query is timed on the reopened
+index. The baseline scans a DataFrame of the same titles and descriptions
+with str.contains, which is how searching worked without an index.
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import SEARCH_TERMS, make_documents
+from search_index import SearchIndex
+
+QUERIES = ['pandas', 'transformers', 'python tutorial', 'deep learning neural network',
+           'spark sql interview', 'gradient boosting regression']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--docs', type=int, default=200_000)
+    parser.add_argument('--batch', type=int, default=50_000, help='documents per add() call')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per query')
+    parser.add_argument('--no-baseline', action='store_true', help='skip the str.contains scan')
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs)
+    directory = tempfile.mkdtemp(prefix='search-index-')
+    try:
+        index = SearchIndex(directory)
+        start = time.perf_counter()
+        for i in range(0, len(documents), args.batch):
+            index.add(documents[i:i + args.batch])
+        build_seconds = time.perf_counter() - start
+        stats = index.stats()
+        print(f"indexed {args.docs:,} docs in {build_seconds:.1f} s ({args.docs / build_seconds:,.0f} docs/s), "
+              f"{stats['segments']} segment(s), {stats['terms']:,} terms, {stats['size_bytes'] / 2**20:.1f} MiB")
+
+        start = time.perf_counter()
+        index = SearchIndex(directory)
+        print(f"reopened in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        frame = None
+        if not args.no_baseline:
+            frame = pd.DataFrame(documents)
+            frame['text'] = frame['title'] + ' ' + frame['description']
+
+        print(f"\n{'query':<32}{'hits':>8}{'index p50 ms':>14}{'p95 ms':>9}{'contains ms':>13}")
+        for query in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                index.search(query, limit=20)
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            p95 = samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))]
+            hits = sum(term in SEARCH_TERMS for term in query.split())
+            scan_ms = ''
+            if frame is not None:
+                start = time.perf_counter()
+                mask = pd.Series(False, index=frame.index)
+                for term in query.split():
+                    mask |= frame['text'].str.contains(term, case=False, regex=False)
+                scan_ms = f"{(time.perf_counter() - start) * 1000:13.1f}"
+                hits = int(mask.sum())
+            print(f"{query:<32}{hits:>8,}{statistics.median(samples):>14.2f}{p95:>9.2f}{scan_ms}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Rerun cost of the per-row channel search results layout vs the compact table
+
+Run from the project root:
+
+    python -m benchmarks.bench_search_results --results 10 50 200 --repeat 5
+
+Each layout renders the given number of synthetic search results in a
+Streamlit AppTest. "first" is the initial run; "rerun" is the run
+triggered by selecting one channel, which re-executes the whole script:
+clicking a row checkbox in the per-row layout, or a plain rerun with the
+selection already in session state for the table (AppTest cannot edit
+a data_editor). Element counts are the widgets and other elements the
+browser must diff on every rerun.
+"""
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def search_results_app(layout, n):
+    """App script run by AppTest: one search results layout over n synthetic channels"""
+    import os
+    import sys
+    sys.path.insert(0, os.getcwd())
+    from ui_components import display_channel_search_results, display_channel_search_table
+
+    channels = [
+        {'channel_id': f'UC{i:022d}', 'title': f'Channel {i}',
+         'description': f'Synthetic channel {i} about data science and machine learning.' * 3,
+         'thumbnail': f'https://yt3.ggpht.com/synthetic/{i}=s88'}
+        for i in range(n)
+    ]
+    if layout == 'table':
+        display_channel_search_table(channels)
+    else:
+        display_channel_search_results(channels)
+
+
+def count_elements(node):
+    children = getattr(node, 'children', None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def measure(layout, n, repeat):
+    """Return (first run ms, rerun ms, element count) medians over repeat fresh apps"""
+    first, rerun, elements = [], [], 0
+    for _ in range(repeat):
+        at = AppTest.from_function(search_results_app, args=(layout, n), default_timeout=60)
+        start = time.perf_counter()
+        at.run()
+        first.append((time.perf_counter() - start) * 1000)
+        elements = count_elements(at._tree)
+
+        start = time.perf_counter()
+        if layout == 'table':
+            at.session_state.selected_channel_ids = ['UC' + '0' * 22]
+            at.run()
+        else:
+            at.checkbox[0].check().run()
+        rerun.append((time.perf_counter() - start) * 1000)
+    return statistics.median(first), statistics.median(rerun), elements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--results', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'layout':<10}{'results':>9}{'first ms':>11}{'rerun ms':>11}{'elements':>10}")
+    for n in args.results:
+        for layout in ['per-row', 'table']:
+            first_ms, rerun_ms, elements = measure(layout, n, args.repeat)
+            print(f"{layout:<10}{n:>9}{first_ms:>11.1f}{rerun_ms:>11.1f}{elements:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Cold-start time of the API layer and the headless crawler, with and without Streamlit
+
+Run from the project root:
+
+    python -m benchmarks.bench_startup --repeat 10
+
+Each target runs in a fresh interpreter, so module caches from earlier
+runs do not hide import costs. "import streamlit + youtube" is what every
+scripted use of youtube.py paid while it imported Streamlit for st.error.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = [
+    ('python (empty)', ['-c', 'pass']),
+    ('import youtube', ['-c', 'import youtube']),
+    ('import streamlit + youtube', ['-c', 'import streamlit, youtube']),
+    ('crawl_cli.py --help', ['crawl_cli.py', '--help']),
+    ('crawl_cli imports (no network)', ['-c', 'import crawl_cli, crawler, data_processor, youtube']),
+]
+
+
+def _time_run(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for label, target in TARGETS:
+        _time_run(target)  # warm the OS file cache
+        samples = [_time_run(target) for _ in range(args.repeat)]
+        print(f"{label:<34}p50 {statistics.median(samples):8.1f} ms   min {min(samples):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
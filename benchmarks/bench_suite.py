@@ -0,0 +1,224 @@
+"""
+Regression suite for the data processing and figure building hot paths
+
+Run from the project root:
+
+    python -m benchmarks.bench_suite --sizes 100 1000 10000 100000 1000000
+    python -m benchmarks.bench_suite --save-baseline          # on the known-good commit
+    python -m benchmarks.bench_suite --baseline benchmarks/results/baseline.json
+
+Every case runs on synthetic data at each size, with memoization bypassed,
+and keeps the best and median of --repeat runs. Results are written as
+JSON to --output. With --baseline the best times are compared case by case
+and the command exits non-zero when any case is more than --threshold
+times slower and by more than --min-delta-ms, so a regression in datetime
+parsing or a groupby shows up before deploy. Baseline times are scaled by
+a calibration workload timed in both runs, which absorbs a throttled or
+busy host; timings are still only comparable on the same machine.
+"""
+import argparse
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+import data_processor
+import visualizations
+from benchmarks.synthetic import make_channel_records, make_history_frame, make_video_records
+
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+class Inputs:
+    """Synthetic inputs for one size, built on first use and shared by all cases"""
+
+    def __init__(self, n):
+        self.n = n
+        self._built = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self._built:
+            self._built[name] = getattr(self, f'_build_{name}')()
+        return self._built[name]
+
+    def _build_channel_records(self):
+        return make_channel_records(self.n)
+
+    def _build_video_records(self):
+        return make_video_records(self.n)
+
+    def _build_channel_df(self):
+        return data_processor.process_channel_data.__wrapped__(self.channel_records)
+
+    def _build_video_df(self):
+        return data_processor.process_video_data.__wrapped__(self.video_records)
+
+    def _build_history_df(self):
+        return make_history_frame(self.n, n_channels=10)
+
+
+def _unwrapped(fn):
+    """Bypass memoization so every run does the full work"""
+    return getattr(fn, '__wrapped__', fn)
+
+
+# name -> callable taking Inputs; every create_* builder in visualizations must appear here
+CASES = {
+    'process_channel_data': lambda data: _unwrapped(data_processor.process_channel_data)(data.channel_records),
+    'process_video_data': lambda data: _unwrapped(data_processor.process_video_data)(data.video_records),
+    'get_channel_summary_stats': lambda data: _unwrapped(data_processor.get_channel_summary_stats)(data.channel_df),
+    'get_video_summary_stats': lambda data: _unwrapped(data_processor.get_video_summary_stats)(data.video_df),
+    'get_format_breakdown': lambda data: _unwrapped(data_processor.get_format_breakdown)(data.video_df),
+    'create_channel_comparison_chart': lambda data: _unwrapped(visualizations.create_channel_comparison_chart)(
+        data.channel_df),
+    'create_single_channel_dashboard': lambda data: visualizations.create_single_channel_dashboard(
+        data.channel_df.iloc[0]),
+    'create_multi_channel_dashboard': lambda data: visualizations.create_multi_channel_dashboard(data.channel_df),
+    'create_video_performance_chart': lambda data: _unwrapped(visualizations.create_video_performance_chart)(
+        data.video_df, 'Benchmark Channel'),
+    'create_correlation_heatmap': lambda data: _unwrapped(visualizations.create_correlation_heatmap)(
+        data.channel_df),
+    'create_engagement_trends_chart': lambda data: _unwrapped(visualizations.create_engagement_trends_chart)(
+        data.video_df),
+    'create_channel_history_chart': lambda data: _unwrapped(visualizations.create_channel_history_chart)(
+        data.history_df),
+    'create_cross_channel_video_chart': lambda data: _unwrapped(visualizations.create_cross_channel_video_chart)(
+        data.video_df),
+}
+
+
+def check_coverage():
+    """Fail loudly when a figure builder is added without a benchmark case"""
+    builders = {name for name, _ in inspect.getmembers(visualizations, inspect.isfunction)
+                if name.startswith('create_')}
+    missing = sorted(builders - CASES.keys())
+    if missing:
+        raise SystemExit(f"No benchmark case for: {', '.join(missing)}")
+
+
+def run_case(fn, data, repeat):
+    """Return (best ms, median ms) over repeat runs, with the garbage collector paused like timeit"""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(data)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return min(samples), statistics.median(samples)
+
+
+def calibrate(repeat=5):
+    """Best time in ms of a fixed NumPy and pure-Python workload, a proxy for current machine speed"""
+    values = np.random.default_rng(0).random(200_000)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        np.sort(values)
+        sum(i * i for i in range(200_000))
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def compare(results, baseline, threshold, min_delta_ms, speed_factor=1.0):
+    """Print per-case ratios against a baseline and return the regressed case keys
+
+    speed_factor scales baseline times to the machine's current speed, so a
+    throttled or busy host does not read as a code regression.
+    """
+    regressions = []
+    print(f"\n{'case':<48}{'baseline ms':>13}{'now ms':>11}{'ratio':>8}")
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        ratio = result['best_ms'] / max(before['best_ms'] * speed_factor, 1e-6)
+        slower = ratio > threshold and result['best_ms'] - before['best_ms'] * speed_factor > min_delta_ms
+        flag = '  REGRESSION' if slower else ''
+        if flag:
+            regressions.append(key)
+        print(f"{key:<48}{before['best_ms']:>13.2f}{result['best_ms']:>11.2f}{ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='run only cases whose name contains this text')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'))
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"also write the results to {os.path.join(RESULTS_DIR, 'baseline.json')}")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='slowdown ratio that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                        help='ignore slowdowns smaller than this, which are timer noise')
+    args = parser.parse_args()
+    check_coverage()
+
+    calibration_ms = calibrate()
+    cases = {name: fn for name, fn in CASES.items() if not args.only or args.only in name}
+    results = {}
+    for n in args.sizes:
+        data = Inputs(n)
+        for name, fn in cases.items():
+            fn(data)  # build shared inputs and warm up outside the measurement
+            best_ms, median_ms = run_case(fn, data, args.repeat)
+            key = f"{name}[{n}]"
+            results[key] = {'case': name, 'rows': n, 'best_ms': round(best_ms, 3),
+                            'median_ms': round(median_ms, 3)}
+            print(f"{key:<48}{best_ms:>11.2f} ms  (median {median_ms:.2f} ms)", flush=True)
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plotly': plotly.__version__,
+        },
+        'calibration_ms': round(calibration_ms, 3),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    paths = [args.output] + ([os.path.join(RESULTS_DIR, 'baseline.json')] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != report['environment']:
+            print("warning: baseline was recorded in a different environment")
+        # Take the slower of the calibrations before and after the run as the current speed
+        speed_factor = 1.0
+        if baseline.get('calibration_ms'):
+            speed_factor = max(calibration_ms, calibrate()) / baseline['calibration_ms']
+            print(f"machine speed vs baseline: {1 / speed_factor:.2f}x (baseline times scaled to match)")
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta_ms, speed_factor)
+        if regressions:
+            raise SystemExit(f"\n{len(regressions)} case(s) slower than {args.threshold}x baseline")
+
+
+if __name__ == '__main__':
+    main()
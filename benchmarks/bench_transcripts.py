@@ -0,0 +1,60 @@
+"""
+Transcript ingestion throughput: sequential vs pooled fetching, and a warm-cache rerun
+
+Run from the project root:
+
+    python -m benchmarks.bench_transcripts --videos 400 --latency 0.2 --workers 1 8 32
+
+Transcripts come from a StubTranscriptSource that sleeps --latency seconds
+per video, standing in for a round trip to YouTube. Every worker count
+starts from an empty cache; the warm row reruns the last configuration
+against the filled cache, which should make no source calls at all. The
+cache size is compared with the same transcripts as plain JSON.
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import time
+
+from fake_youtube import StubTranscriptSource
+from transcripts import TranscriptStore, fetch_transcripts
+
+
+def run(video_ids, source, store, workers):
+    """Return (seconds, source calls) to drain fetch_transcripts"""
+    calls_before = sum(source.calls.values())
+    start = time.perf_counter()
+    for _ in fetch_transcripts(video_ids, source, store, max_workers=workers):
+        pass
+    return time.perf_counter() - start, sum(source.calls.values()) - calls_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--videos', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per stub fetch')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    video_ids = [f"vid{i:08d}" for i in range(args.videos)]
+    source = StubTranscriptSource(latency=args.latency)
+    print(f"{'run':<24}{'seconds':>10}{'videos/s':>12}{'fetches':>10}")
+    for workers in args.workers:
+        directory = tempfile.mkdtemp(prefix='transcripts-')
+        try:
+            store = TranscriptStore(directory)
+            seconds, calls = run(video_ids, source, store, workers)
+            print(f"{f'{workers} worker(s), cold':<24}{seconds:>10.2f}{args.videos / seconds:>12.1f}{calls:>10}")
+            if workers == args.workers[-1]:
+                seconds, calls = run(video_ids, source, store, workers)
+                print(f"{f'{workers} worker(s), warm':<24}{seconds:>10.2f}{args.videos / seconds:>12.1f}{calls:>10}")
+                raw = sum(len(json.dumps(store.get(video_id))) for video_id in video_ids)
+                size = store.stats()['size_bytes']
+                print(f"\ncache {size / 1024:.0f} KiB vs {raw / 1024:.0f} KiB as JSON ({raw / size:.1f}x smaller)")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Synthetic channel and video records shaped like YouTubeAnalytics output
+"""
+import numpy as np
+import pandas as pd
+
+
+def make_durations(n, seed=0):
+    """Return n ISO-8601 duration strings mixing Shorts, long-form and missing values"""
+    rng = np.random.default_rng(seed)
+    seconds = np.where(rng.random(n) < 0.3, rng.integers(5, 180, n), rng.integers(180, 4 * 3600, n))
+    hours, rest = np.divmod(seconds, 3600)
+    minutes, secs = np.divmod(rest, 60)
+
+    durations = pd.Series('PT', index=range(n))
+    durations += np.where(hours > 0, pd.Series(hours).astype(str) + 'H', '')
+    durations += np.where(minutes > 0, pd.Series(minutes).astype(str) + 'M', '')
+    durations += np.where(secs > 0, pd.Series(secs).astype(str) + 'S', '')
+    durations[rng.random(n) < 0.01] = 'N/A'
+    durations[rng.random(n) < 0.005] = 'P0D'
+    return durations
+
+
+def make_channel_records(n, seed=0):
+    """Return n get_channel_stats-style rows"""
+    rng = np.random.default_rng(seed)
+    countries = np.array(['US', 'IN', 'GB', 'CA', 'DE', 'Not specified'])
+    subscribers = rng.lognormal(11, 2, n).astype(np.int64)
+    videos = rng.integers(1, 5000, n)
+    years = rng.integers(2006, 2025, n)
+    return [
+        {
+            'channel_id': f'UC{i:022d}',
+            'channel_title': f'Channel {i}',
+            'created_date': f'{years[i]}-01-15T00:00:00Z',
+            'description': f'Synthetic channel {i} about data science and machine learning' * 4 + '...',
+            'country': countries[i % len(countries)],
+            'subscribers': int(subscribers[i]),
+            'total_videos': int(videos[i]),
+            'total_views': int(subscribers[i] * rng.integers(20, 300)),
+            'playlist_id': f'UU{i:022d}',
+        }
+        for i in range(n)
+    ]
+
+
+def make_video_records(n, n_channels=50, seed=0):
+    """Return n get_video_details-style rows spread across n_channels channels"""
+    rng = np.random.default_rng(seed)
+    views = rng.lognormal(9, 2, n).astype(np.int64)
+    likes = (views * rng.uniform(0.005, 0.08, n)).astype(np.int64)
+    comments = (likes * rng.uniform(0.01, 0.2, n)).astype(np.int64)
+    published = pd.Timestamp('2012-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 4500, n), unit='D')
+    published = published.strftime('%Y-%m-%dT%H:%M:%SZ')
+    durations = make_durations(n, seed)
+    channels = rng.integers(0, n_channels, n)
+    return [
+        {
+            'video_id': f'v{i:010d}',
+            'title': f'Synthetic video {i}: pandas, transformers and more',
+            'published_date': published[i],
+            'views': int(views[i]),
+            'likes': int(likes[i]),
+            'comments': int(comments[i]),
+            'duration': durations[i],
+            'channel_id': f'UC{channels[i]:022d}',
+            'channel_title': f'Channel {channels[i]}',
+        }
+        for i in range(n)
+    ]
+
+
+def make_history_frame(n, n_channels=1, seed=0):
+    """Return n channel snapshot rows, hourly per channel, shaped like SnapshotStore.read_channels"""
+    rng = np.random.default_rng(seed)
+    channels = np.arange(n) % n_channels
+    snapshot_at = pd.Timestamp('2020-01-01', tz='UTC') + pd.to_timedelta(np.arange(n) // n_channels, unit='h')
+    subscribers = rng.integers(0, 50, n)
+    views = rng.integers(0, 5_000, n)
+    frame = pd.DataFrame({
+        'snapshot_at': snapshot_at,
+        'channel_id': [f'UC{i:022d}' for i in channels],
+        'channel_title': [f'Channel {i}' for i in channels],
+        'subscribers': subscribers,
+        'total_views': views,
+    })
+    frame[['subscribers', 'total_views']] = frame.groupby('channel_id')[['subscribers', 'total_views']].cumsum()
+    return frame
+
+
+SEARCH_TERMS = ['pandas', 'transformers', 'python', 'numpy', 'pytorch', 'tensorflow', 'sql', 'regression',
+                'statistics', 'tutorial', 'deep', 'learning', 'neural', 'network', 'kaggle', 'interview',
+                'visualization', 'matplotlib', 'scikit', 'clustering', 'llm', 'gradient', 'boosting', 'spark']
+
+
+def make_documents(n, words_per_description=40, vocabulary=50_000, seed=0):
+    """Return n search index documents whose words follow Zipf's law, like real titles and descriptions"""
+    rng = np.random.default_rng(seed)
+    words = np.array([f'term{i}' for i in range(vocabulary)], dtype=object)
+    # The named search terms take mid-frequency ranks, each appearing in roughly 0.1-1% of documents
+    words[100:100 + 40 * len(SEARCH_TERMS):40] = SEARCH_TERMS
+    weights = 1 / np.arange(1, vocabulary + 1)
+    ranks = rng.choice(vocabulary, size=(n, 8 + words_per_description), p=weights / weights.sum())
+    rows = words[ranks].tolist()
+    return [
+        {
+            'video_id': f'v{i:010d}',
+            'title': ' '.join(row[:8]),
+            'description': ' '.join(row[8:]),
+            'channel_title': f'Channel {i % 500}',
+        }
+        for i, row in enumerate(rows)
+    ]
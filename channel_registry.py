@@ -0,0 +1,215 @@
+"""
+Indexed registry of known channels with O(1) ID lookup and fuzzy name search
+"""
+import bisect
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import defaultdict
+
+DEFAULT_REGISTRY_PATH = os.path.join('.yt_cache', 'channels.json')
+
+# Predefined Data Science/ML/Programming channels, name -> channel ID
+PREDEFINED_CHANNELS = {
+    'Krish Naik': 'UCNU_lfiiWBdtULKOw6X0Dig',
+    'Data Professor': 'UCh3RpsDV8pS_fXJ6NBX4fhQ',
+    'CodeWithHarry': 'UCeVMnSShP_Iviwkknt83cww',
+    '3Blue1Brown': 'UCYO_jab_esuFRV4b17AJtAw',
+    'StatQuest': 'UCtYLUTtgS3k1Fg4y5tAhLbw',
+    'sentdex': 'UCfzlCWGWYyIQ0aLC5w48gBQ',
+    'CS Dojo': 'UCxX9wt5FWQUAAz4UrysqK9A',
+    'Corey Schafer': 'UCCezIgC97PvUuR4_gbFUs5g',
+    'Two Minute Papers': 'UCbfYPyITQ-7l4upoX8nvctg',
+    'Simplilearn': 'UCsvqVGtbbyHaMoevxPAq9Fg',
+    'edureka!': 'UCkw4JCwteGrDHIsyIIKo4tQ',
+    'Joma Tech': 'UCV0qA-eDDICsRR9rPcnG7tw',
+    'Siraj Raval': 'UCWN3xxRkmTPmbKwht9FuE5A',
+    'Ken Jee': 'UCiT9RITQ9PW6BhXK0y2jaeg',
+    'Tech With Tim': 'UC4JX40jDee_tINbkjycV4Sg',
+    'Data School': 'UCnVzApLJE2ljPZSeQylSEyg'
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_name(name):
+    """Casefold a channel name and collapse punctuation and whitespace to single spaces"""
+    return _NON_ALNUM.sub(' ', name.casefold()).strip()
+
+
+def _trigrams(normalized):
+    """Word trigrams padded like pg_trgm, so short names and word starts still match"""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i+3] for i in range(len(padded) - 2))
+    return grams
+
+
+class ChannelRegistry:
+    """Known channels indexed for O(1) ID -> name lookup and fuzzy name search
+
+    Names are indexed twice: a sorted list of full names and single words
+    answers prefix queries with a binary search, and an inverted trigram
+    index ranks typo-tolerant matches by Dice similarity. Both indexes are
+    updated in place as channels are added, so the registry can grow as
+    the app fetches channels and be persisted between runs.
+    """
+
+    def __init__(self, channels=None):
+        self._lock = threading.RLock()
+        self._names = {}
+        self._by_name = {}
+        self._prefix_keys = []
+        self._trigram_index = defaultdict(set)
+        self._trigram_counts = {}
+        if channels:
+            self.update(channels.items() if isinstance(channels, dict) else channels)
+
+    @classmethod
+    def load(cls, path=DEFAULT_REGISTRY_PATH, seed=PREDEFINED_CHANNELS):
+        """Load a registry saved with save(), starting from the seed name -> ID mapping"""
+        registry = cls(seed)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                registry.update((row['name'], row['channel_id']) for row in json.load(f)['channels'])
+        return registry
+
+    def save(self, path=DEFAULT_REGISTRY_PATH):
+        """Atomically write every channel to a JSON file"""
+        with self._lock:
+            rows = [{'channel_id': channel_id, 'name': name} for channel_id, name in self._names.items()]
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # A unique temporary file, so sessions saving at the same time don't write into each other's
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'channels': rows}, f, indent=1)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, channel_id):
+        return channel_id in self._names
+
+    def add(self, name, channel_id):
+        """Register or rename one channel"""
+        return self.update([(name, channel_id)])
+
+    def update(self, channels):
+        """Register or rename (name, channel_id) pairs and return how many changed"""
+        with self._lock:
+            changed = 0
+            for name, channel_id in channels:
+                previous = self._names.get(channel_id)
+                if previous == name:
+                    continue
+                if previous is not None:
+                    if changed:
+                        self._prefix_keys.sort()
+                    self._unindex(previous, channel_id)
+                self._names[channel_id] = name
+                self._index(name, channel_id)
+                changed += 1
+            if changed:
+                self._prefix_keys.sort()
+            return changed
+
+    def name_for(self, channel_id, default=None):
+        """Return the channel's name, or default when it is unknown"""
+        return self._names.get(channel_id, default)
+
+    def ids(self):
+        """Return every channel ID in registration order"""
+        with self._lock:
+            return list(self._names)
+
+    def items(self):
+        """Return (name, channel_id) pairs in registration order"""
+        with self._lock:
+            return [(name, channel_id) for channel_id, name in self._names.items()]
+
+    def resolve(self, name):
+        """Return the ID of the one channel whose normalized name equals name, or None
+
+        Names shared by several channels do not resolve, since any one of
+        them could be the channel meant.
+        """
+        with self._lock:
+            ids = self._by_name.get(normalize_name(name))
+            return next(iter(ids)) if ids and len(ids) == 1 else None
+
+    def search(self, query, limit=10, min_score=0.35):
+        """Rank channels for a name query as (channel_id, name, score), best first
+
+        Exact names score 1.0, names or words starting with the query 0.9,
+        and everything else its trigram Dice similarity to the query.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        with self._lock:
+            scores = {channel_id: 1.0 for channel_id in self._by_name.get(normalized, ())}
+            for channel_id in self._prefix_matches(normalized):
+                scores.setdefault(channel_id, 0.9)
+
+            query_grams = _trigrams(normalized)
+            shared = defaultdict(int)
+            for gram in query_grams:
+                for channel_id in self._trigram_index.get(gram, ()):
+                    shared[channel_id] += 1
+            for channel_id, count in shared.items():
+                score = 2 * count / (len(query_grams) + self._trigram_counts[channel_id])
+                if score >= min_score and score > scores.get(channel_id, 0):
+                    scores[channel_id] = score
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], self._names[item[0]]))
+            return [(channel_id, self._names[channel_id], round(score, 3))
+                    for channel_id, score in ranked[:limit]]
+
+    def _prefix_matches(self, normalized):
+        """Yield IDs whose full name or one of whose words starts with the query"""
+        position = bisect.bisect_left(self._prefix_keys, (normalized, ''))
+        while position < len(self._prefix_keys) and self._prefix_keys[position][0].startswith(normalized):
+            yield self._prefix_keys[position][1]
+            position += 1
+
+    def _keys(self, normalized):
+        return {normalized, *normalized.split()}
+
+    def _index(self, name, channel_id):
+        normalized = normalize_name(name)
+        self._by_name.setdefault(normalized, set()).add(channel_id)
+        self._prefix_keys.extend((key, channel_id) for key in self._keys(normalized))
+        grams = _trigrams(normalized)
+        self._trigram_counts[channel_id] = len(grams)
+        for gram in grams:
+            self._trigram_index[gram].add(channel_id)
+
+    def _unindex(self, name, channel_id):
+        normalized = normalize_name(name)
+        self._by_name[normalized].discard(channel_id)
+        for key in self._keys(normalized):
+            position = bisect.bisect_left(self._prefix_keys, (key, channel_id))
+            if position < len(self._prefix_keys) and self._prefix_keys[position] == (key, channel_id):
+                del self._prefix_keys[position]
+        for gram in _trigrams(normalized):
+            self._trigram_index[gram].discard(channel_id)
+
+
+_default_registry = None
+
+
+def default_registry():
+    """Return the shared registry of predefined channels"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ChannelRegistry(PREDEFINED_CHANNELS)
+    return _default_registry
@@ -0,0 +1,211 @@
+"""
+Headless channel and video crawler for cron jobs - no Streamlit required
+
+    YOUTUBE_API_KEY=... python crawl_cli.py --channels-file channel_ids.txt --output-dir data/
+    python crawl_cli.py --predefined --videos 100 --format csv --batched
+
+Fetches channel statistics and recent uploads, then writes
+channels_<timestamp> and videos_<timestamp> files in Parquet or CSV. Heavy
+modules are imported only after the arguments are parsed, so --help and
+argument errors return immediately. Exits with status 1 when any channel
+or playlist failed; whatever succeeded is still written.
+"""
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+logger = logging.getLogger('crawl_cli')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--channels-file', help='channel IDs, one per line or comma separated; # starts a comment')
+    source.add_argument('--predefined', action='store_true', help='crawl the predefined DS/ML channels')
+    parser.add_argument('--api-key', default=os.environ.get('YOUTUBE_API_KEY'),
+                        help='YouTube Data API key (default: $YOUTUBE_API_KEY)')
+    parser.add_argument('--api-endpoint', help='alternative API root, e.g. a fake_youtube server')
+    parser.add_argument('--videos', type=int, default=50, help='most recent uploads per channel')
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--batched', action='store_true',
+                        help='send each round of playlist and video calls as batch HTTP requests')
+    parser.add_argument('--workers', type=int, default=8, help='pages in flight without --batched')
+    parser.add_argument('--async-requests', type=int, metavar='N',
+                        help='crawl with the asyncio client, keeping up to N requests in flight (needs aiohttp)')
+    parser.add_argument('--cache', action='store_true', help='use the on-disk API response cache')
+    parser.add_argument('--transcripts', action='store_true',
+                        help='also fetch transcripts of the crawled videos into the transcript cache')
+    parser.add_argument('--transcript-workers', type=int, default=8, help='transcripts fetched at once')
+    parser.add_argument('--index', action='store_true',
+                        help='add the crawled videos and their cached transcripts to the full-text search index')
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error('an API key is required: pass --api-key or set YOUTUBE_API_KEY')
+    if args.async_requests and args.batched:
+        parser.error('--async-requests and --batched cannot be combined')
+    return args
+
+
+def read_channel_ids(path):
+    """Read channel IDs from a file, one per line or comma separated, skipping comments"""
+    channel_ids = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            channel_ids.extend(part.strip() for part in line.split(',') if part.strip())
+    return list(dict.fromkeys(channel_ids))
+
+
+def crawl(args):
+    """Fetch stats and videos; return (channel_df, video_df, errors)"""
+    from crawler import crawl_channels
+    from data_processor import load_predefined_channels, process_video_data
+    from youtube import PartialFetchError, YouTubeAnalytics
+
+    cache = None
+    if args.cache:
+        from api_cache import ResponseCache
+        cache = ResponseCache()
+    channel_ids = load_predefined_channels() if args.predefined else read_channel_ids(args.channels_file)
+
+    if args.async_requests:
+        import asyncio
+        channels, videos_by_playlist, errors, scheduler = asyncio.run(crawl_async(args, channel_ids, cache))
+        video_df = process_video_data(tag_videos(channels, videos_by_playlist))
+        return finish_crawl(args, channels, video_df, errors, scheduler)
+
+    yt_analytics = YouTubeAnalytics(args.api_key, cache=cache, api_endpoint=args.api_endpoint)
+    logger.info("Ready after %.0f ms", (time.perf_counter() - _STARTED) * 1000)
+
+    errors = {}
+    try:
+        channels = yt_analytics.get_channel_stats(channel_ids, priority='low', batched=args.batched)
+    except PartialFetchError as e:
+        channels, errors = e.results, dict(e.errors)
+    logger.info("Fetched stats for %d of %d channels", len(channels), len(channel_ids))
+
+    if args.batched:
+        try:
+            videos_by_playlist = yt_analytics.get_video_details_for_channels(
+                [channel['playlist_id'] for channel in channels], args.videos, priority='low'
+            )
+        except PartialFetchError as e:
+            videos_by_playlist = e.results
+            errors.update(e.errors)
+        video_df = process_video_data(tag_videos(channels, videos_by_playlist))
+    else:
+        video_df, crawl_errors = crawl_channels(
+            yt_analytics, channels, args.videos, max_in_flight=args.workers
+        )
+        errors.update(crawl_errors)
+    return finish_crawl(args, channels, video_df, errors, yt_analytics.scheduler)
+
+
+async def crawl_async(args, channel_ids, cache):
+    """Fetch stats and videos with the asyncio client; return (channels, videos by playlist, errors, scheduler)"""
+    from async_youtube import AsyncYouTubeAnalytics
+    from youtube import PartialFetchError
+
+    errors = {}
+    async with AsyncYouTubeAnalytics(args.api_key, cache=cache, api_endpoint=args.api_endpoint,
+                                     max_concurrency=args.async_requests) as yt_analytics:
+        logger.info("Ready after %.0f ms", (time.perf_counter() - _STARTED) * 1000)
+        try:
+            channels = await yt_analytics.get_channel_stats(channel_ids, priority='low')
+        except PartialFetchError as e:
+            channels, errors = e.results, dict(e.errors)
+        logger.info("Fetched stats for %d of %d channels", len(channels), len(channel_ids))
+
+        try:
+            videos_by_playlist = await yt_analytics.get_video_details_for_channels(
+                [channel['playlist_id'] for channel in channels], args.videos, priority='low'
+            )
+        except PartialFetchError as e:
+            videos_by_playlist = e.results
+            errors.update(e.errors)
+    return channels, videos_by_playlist, errors, yt_analytics.scheduler
+
+
+def tag_videos(channels, videos_by_playlist):
+    """Flatten videos by uploads playlist into rows carrying their channel's ID and title"""
+    return [
+        dict(video, channel_id=channel['channel_id'], channel_title=channel['channel_title'])
+        for channel in channels
+        for video in videos_by_playlist.get(channel['playlist_id'], [])
+    ]
+
+
+def finish_crawl(args, channels, video_df, errors, scheduler):
+    """Fetch transcripts and index as asked, log failures; return (channel_df, video_df, errors)"""
+    from data_processor import process_channel_data
+
+    if args.transcripts and not video_df.empty:
+        errors.update(fetch_video_transcripts(video_df['video_id'].tolist(), args.transcript_workers))
+
+    if args.index and not video_df.empty:
+        from search_index import SearchIndex, video_documents
+        from transcripts import TranscriptStore
+        index = SearchIndex()
+        index.add(video_documents(video_df, TranscriptStore()))
+        logger.info("Search index holds %d videos", len(index))
+
+    for label, error in errors.items():
+        logger.error("Failed: %s: %s", label, error)
+    channel_df = process_channel_data(channels) if channels else None
+    quota_spent = scheduler.stats()['spent']
+    logger.info("Fetched %d videos using %d quota units", len(video_df), quota_spent)
+    return channel_df, video_df, errors
+
+
+def fetch_video_transcripts(video_ids, workers):
+    """Fetch uncached transcripts into the transcript cache; return errors by label"""
+    from collections import Counter
+    from transcripts import fetch_transcripts
+
+    statuses = Counter()
+    errors = {}
+    for result in fetch_transcripts(video_ids, max_workers=workers, include_cached=False):
+        statuses[result.status] += 1
+        if result.status == 'error':
+            errors[f"transcript {result.video_id}"] = result.error
+    unique = len(set(video_ids))
+    logger.info("Transcripts for %d videos: %d already cached, %s", unique,
+                unique - sum(statuses.values()), dict(statuses))
+    return errors
+
+
+def write_frame(df, output_dir, name, fmt, stamp):
+    """Write one DataFrame as <name>_<stamp>.<fmt> and return its path"""
+    path = os.path.join(output_dir, f"{name}_{stamp}.{fmt}")
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), stream=sys.stderr,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    channel_df, video_df, errors = crawl(args)
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    for name, df in (('channels', channel_df), ('videos', video_df)):
+        if df is not None and not df.empty:
+            logger.info("Wrote %s", write_frame(df, args.output_dir, name, args.format, stamp))
+    logger.info("Done in %.1f s", time.perf_counter() - _STARTED)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Multi-channel video crawler with a fair, bounded worker pool
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import chain
+
+from data_processor import process_video_data
+
+
+def crawl_channels(yt_analytics, channels, max_results=50, max_in_flight=8,
+                   priority='low', on_progress=None, compact=False):
+    """Crawl uploads of many channels into one combined video DataFrame
+
+    channels is a list of get_channel_stats rows. Each channel's uploads are
+    fetched one page at a time: after a page completes the channel goes to
+    the back of a round-robin queue, so large catalogs cannot starve small
+    ones, and at most max_in_flight pages are being fetched at once.
+
+    on_progress, if given, is called from the calling thread after every
+    page with {channel_title: (fetched, target)}. Returns (video_df, errors)
+    where errors maps channel_title to the exception that stopped it.
+    """
+    titles = {channel['channel_id']: channel['channel_title'] for channel in channels}
+    streams = {}
+    progress = {}
+    batches = {}
+    fetched_counts = {}
+    for channel in channels:
+        channel_id = channel['channel_id']
+        streams[channel_id] = yt_analytics.iter_video_columns(
+            channel['playlist_id'], max_results, priority=priority
+        )
+        progress[channel_id] = (0, min(max_results, int(channel.get('total_videos', max_results))))
+        batches[channel_id] = []
+        fetched_counts[channel_id] = 0
+
+    ready = deque(streams)
+    in_flight = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        while ready or in_flight:
+            while ready and len(in_flight) < max_in_flight:
+                channel_id = ready.popleft()
+                in_flight[pool.submit(next, streams[channel_id], None)] = channel_id
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                channel_id = in_flight.pop(future)
+                fetched = fetched_counts[channel_id]
+                try:
+                    batch = future.result()
+                except Exception as e:
+                    errors[titles[channel_id]] = e
+                    continue
+                if batch is None:
+                    progress[channel_id] = (fetched, fetched)
+                    continue
+
+                size = len(batch['video_id'])
+                batch['channel_id'] = [channel_id] * size
+                batch['channel_title'] = [titles[channel_id]] * size
+                batches[channel_id].append(batch)
+                fetched = fetched_counts[channel_id] = fetched + size
+                progress[channel_id] = (fetched, max(progress[channel_id][1], fetched))
+                ready.append(channel_id)
+
+            if on_progress is not None:
+                on_progress({titles[channel_id]: counts for channel_id, counts in progress.items()})
+
+    # Pages arrive as column lists, so the combined frame is built column by column
+    ordered = [batch for channel_id in streams for batch in batches[channel_id]]
+    combined = {name: list(chain.from_iterable(batch[name] for batch in ordered))
+                for name in (ordered[0] if ordered else {})}
+    return process_video_data(combined, compact=compact), errors
@@ -4,27 +4,39 @@ Data processing and analysis functions - Public Data Only
 import pandas as pd
 import numpy as np
 
+from channel_registry import PREDEFINED_CHANNELS
+from memo import memoize
+from summary_stats import ChannelSummary, VideoSummary
+
+# Videos up to this length (in seconds) are counted as Shorts
+SHORTS_MAX_SECONDS = 180
+
+# Seconds per ISO-8601 duration designator, indexed by ASCII code, and which
+# designators belong after the T (M means minutes there, months before it)
+DURATION_UNIT_SECONDS = np.zeros(256, dtype=np.float64)
+DURATION_TIME_PART = np.zeros(256, dtype=bool)
+for designator, unit_seconds, time_part in [('W', 604800, False), ('D', 86400, False),
+                                            ('H', 3600, True), ('M', 60, True), ('S', 1, True)]:
+    DURATION_UNIT_SECONDS[ord(designator)] = unit_seconds
+    DURATION_TIME_PART[ord(designator)] = time_part
+
+# Column groups used by compact_dataframe
+CATEGORY_COLUMNS = ['country', 'channel_id', 'channel_title', 'format']
+COUNTER_COLUMNS = ['subscribers', 'total_videos', 'total_views', 'views', 'likes', 'comments',
+                   'created_year', 'days_since_published']
+RATE_COLUMNS = ['avg_views_per_video', 'subscriber_to_video_ratio', 'engagement_rate',
+                'comment_rate', 'duration_seconds', 'duration_minutes', 'views_per_minute']
+
+def today():
+    """Midnight today, which days_since_published counts calendar days from"""
+    return pd.Timestamp.now().normalize()
+
 def load_predefined_channels():
     """Load predefined channel IDs for data science/ML channels"""
-    return [
-        'UCNU_lfiiWBdtULKOw6X0Dig',  # Krish Naik
-        'UCh3RpsDV8pS_fXJ6NBX4fhQ',  # Data Professor
-        'UCeVMnSShP_Iviwkknt83cww',  # CodeWithHarry
-        'UCYO_jab_esuFRV4b17AJtAw',  # 3Blue1Brown
-        'UCtYLUTtgS3k1Fg4y5tAhLbw',  # StatQuest
-        'UCfzlCWGWYyIQ0aLC5w48gBQ',  # sentdex
-        'UCxX9wt5FWQUAAz4UrysqK9A',  # CS Dojo
-        'UCCezIgC97PvUuR4_gbFUs5g',  # Corey Schafer
-        'UCbfYPyITQ-7l4upoX8nvctg',  # Two Minute Papers
-        'UCsvqVGtbbyHaMoevxPAq9Fg',  # Simplilearn
-        'UCkw4JCwteGrDHIsyIIKo4tQ',  # edureka!
-        'UCV0qA-eDDICsRR9rPcnG7tw',  # Joma Tech
-        'UCWN3xxRkmTPmbKwht9FuE5A',  # Siraj Raval
-        'UCiT9RITQ9PW6BhXK0y2jaeg',  # Ken Jee
-        'UCV8e2g4IWQqK71bbzGDEI4Q'   # Tech With Tim
-    ]
+    return list(PREDEFINED_CHANNELS.values())
 
-def process_channel_data(channel_data):
+@memoize()
+def process_channel_data(channel_data, compact=False):
     """Process raw channel data into DataFrame with additional metrics"""
     df = pd.DataFrame(channel_data)
     
@@ -33,14 +45,20 @@ def process_channel_data(channel_data):
     df['avg_views_per_video'] = df['total_views'] / df['total_videos'].replace(0, 1)
     df['subscriber_to_video_ratio'] = df['subscribers'] / df['total_videos'].replace(0, 1)
     
-    return df
+    return compact_dataframe(df) if compact else df
 
-def process_video_data(video_data):
-    """Process video data and add engagement metrics"""
+@memoize(extra_key=lambda: today().isoformat())
+def process_video_data(video_data, compact=False):
+    """Process video rows, or a dict of video columns, and add engagement metrics
+    
+    days_since_published depends on the date, so cached results are keyed by it too.
+    """
     if not video_data:
         return pd.DataFrame()
     
     df = pd.DataFrame(video_data)
+    if df.empty:
+        return pd.DataFrame()
     
     # Ensure numeric columns
     numeric_cols = ['views', 'likes', 'comments']
@@ -51,59 +69,135 @@ def process_video_data(video_data):
     df['engagement_rate'] = (df['likes'] / df['views'].replace(0, 1)) * 100
     df['comment_rate'] = (df['comments'] / df['views'].replace(0, 1)) * 100
     
+    # Duration-based metrics
+    if 'duration' in df.columns:
+        df['duration_seconds'] = parse_iso8601_durations(df['duration'])
+        df['duration_minutes'] = df['duration_seconds'] / 60
+        df['is_short'] = df['duration_seconds'].between(1, SHORTS_MAX_SECONDS)
+        df['format'] = np.where(df['duration_seconds'].isna(), 'Unknown',
+                                np.where(df['is_short'], 'Short', 'Long-form'))
+        df['views_per_minute'] = df['views'] / df['duration_minutes'].where(df['duration_minutes'] > 0)
+    
     # Process dates
     df['published_date'] = pd.to_datetime(df['published_date'])
     
-    # Calculate days since published (simplified timezone handling)
+    # Calculate calendar days since published (simplified timezone handling)
     try:
-        now = pd.Timestamp.now().tz_localize(None)
         if df['published_date'].dt.tz is not None:
             published_naive = df['published_date'].dt.tz_localize(None)
         else:
             published_naive = df['published_date']
-        df['days_since_published'] = (now - published_naive).dt.days
+        df['days_since_published'] = (today() - published_naive.dt.normalize()).dt.days
     except Exception:
         df['days_since_published'] = 0
     
+    return compact_dataframe(df) if compact else df
+
+def compact_dataframe(df):
+    """Return a lower-memory copy of a channel or video DataFrame
+    
+    Repetitive labels become categoricals, counters are downcast to the
+    smallest integer type that fits, rates become float32 and the remaining
+    text columns use Arrow-backed strings.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORY_COLUMNS and series.nunique() <= len(series) // 2:
+            df[col] = series.astype('category')
+        elif col in COUNTER_COLUMNS and pd.api.types.is_numeric_dtype(series) and series.notna().all():
+            series = series.astype('int64') if (series % 1 == 0).all() else series
+            df[col] = pd.to_numeric(series, downcast='unsigned' if (series >= 0).all() else 'integer')
+        elif col in RATE_COLUMNS:
+            df[col] = series.astype('float32')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            df[col] = series.astype('string[pyarrow]')
     return df
 
+def memory_report(df):
+    """Compare per-column memory of the default layout with the compact one"""
+    compact = compact_dataframe(df)
+    before = df.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': before,
+        'compact_dtype': compact.dtypes.astype(str),
+        'compact_bytes': after,
+    })
+    report.loc['TOTAL'] = ['', before.sum(), '', after.sum()]
+    report['saved_pct'] = (1 - report['compact_bytes'] / report['bytes'].replace(0, 1)) * 100
+    return report.round({'saved_pct': 1})
+
+def parse_iso8601_durations(durations):
+    """Convert a Series of ISO-8601 durations to seconds in one vectorized pass
+    
+    The strings are viewed as a fixed-width uint8 matrix and scanned one
+    character column at a time across all rows, so the cost is a handful of
+    NumPy operations per character position regardless of row count. Values
+    that are not durations, such as 'N/A', become NaN.
+    """
+    raw = durations.astype(str).to_numpy().astype('S')
+    width = raw.dtype.itemsize
+    chars = raw.view(np.uint8).reshape(len(raw), width)
+    
+    seconds = np.zeros(len(raw), dtype=np.float64)
+    number = np.zeros(len(raw), dtype=np.float64)
+    in_time = np.zeros(len(raw), dtype=bool)
+    has_digits = np.zeros(len(raw), dtype=bool)
+    has_unit = np.zeros(len(raw), dtype=bool)
+    valid = chars[:, 0] == ord('P') if width else np.zeros(len(raw), dtype=bool)
+    
+    for column in chars[:, 1:].T:
+        digit = column - np.uint8(ord('0'))
+        is_digit = digit < 10
+        number = np.where(is_digit, number * 10 + digit, number)
+        has_digits |= is_digit
+        
+        is_time = column == ord('T')
+        valid &= ~(is_time & (in_time | has_digits))
+        in_time |= is_time
+        
+        unit_seconds = DURATION_UNIT_SECONDS[column]
+        is_unit = unit_seconds > 0
+        valid &= ~(is_unit & ((in_time != DURATION_TIME_PART[column]) | ~has_digits))
+        valid &= is_digit | is_time | is_unit | (column == 0)
+        seconds += number * unit_seconds
+        number[is_unit] = 0
+        has_unit |= is_unit
+        has_digits &= ~is_unit
+    
+    valid &= has_unit & ~has_digits
+    seconds[~valid] = np.nan
+    return pd.Series(seconds, index=durations.index, name='duration_seconds')
+
+@memoize()
+def get_format_breakdown(df):
+    """Compare Shorts and long-form videos on count, views and engagement"""
+    return df.groupby('format').agg(
+        videos=('video_id', 'count'),
+        avg_views=('views', 'mean'),
+        avg_engagement_rate=('engagement_rate', 'mean'),
+        avg_duration_minutes=('duration_minutes', 'mean'),
+        avg_views_per_minute=('views_per_minute', 'mean')
+    ).round(2)
+
+def process_video_stream(video_batches):
+    """Process an iterable of raw video batches, yielding one DataFrame per batch
+    
+    Batches bypass the memo cache: each page is seen once, and caching them
+    would only evict the whole-crawl frames worth keeping.
+    """
+    for batch in video_batches:
+        if batch:
+            yield process_video_data.__wrapped__(batch)
+
+@memoize()
 def get_channel_summary_stats(df):
     """Generate summary statistics for channels"""
-    return {
-        'total_channels': len(df),
-        'total_subscribers': df['subscribers'].sum(),
-        'total_videos': df['total_videos'].sum(),
-        'total_views': df['total_views'].sum(),
-        'avg_subscribers': df['subscribers'].mean(),
-        'avg_videos_per_channel': df['total_videos'].mean(),
-        'avg_views_per_channel': df['total_views'].mean(),
-        'median_subscribers': df['subscribers'].median(),
-        'top_channel': df.loc[df['subscribers'].idxmax(), 'channel_title'] if len(df) > 0 else 'N/A'
-    }
+    return ChannelSummary.from_frame(df).result()
 
+@memoize()
 def get_video_summary_stats(df):
     """Generate summary statistics for videos"""
-    if df.empty:
-        return {
-            'total_videos': 0,
-            'total_views': 0,
-            'total_likes': 0,
-            'total_comments': 0,
-            'avg_views': 0,
-            'avg_engagement_rate': 0,
-            'most_viewed_video': 'N/A'
-        }
-    
-    return {
-        'total_videos': len(df),
-        'total_views': int(df['views'].sum()),
-        'total_likes': int(df['likes'].sum()),
-        'total_comments': int(df['comments'].sum()),
-        'avg_views': int(df['views'].mean()),
-        'avg_engagement_rate': float(df['engagement_rate'].mean()),
-        'most_viewed_video': df.loc[df['views'].idxmax(), 'title'] if len(df) > 0 else 'N/A',
-        'avg_likes': int(df['likes'].mean()),
-        'avg_comments': int(df['comments'].mean()),
-        'median_views': int(df['views'].median()),
-        'top_engagement_video': df.loc[df['engagement_rate'].idxmax(), 'title'] if len(df) > 0 else 'N/A'
-    }
+    return VideoSummary.from_frame(df).result()
@@ -0,0 +1,537 @@
+"""
+Local stand-in for the YouTube Data API: synthetic and recorded fixtures, a fake server and a recorder,
+plus a stub transcript source
+"""
+import email
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from transcripts import TranscriptUnavailable
+
+# Query parameters that do not change which resources a response holds; the
+# server applies a fields selection to whatever the fixtures return
+IGNORED_PARAMS = {'key', 'alt', 'prettyPrint', 'quotaUser', 'fields'}
+
+_EPOCH = datetime(2012, 1, 1, tzinfo=timezone.utc)
+
+_THUMBNAIL_SIZES = {'default': (120, 90), 'medium': (320, 180), 'high': (480, 360),
+                    'standard': (640, 480), 'maxres': (1280, 720)}
+
+_DESCRIPTION_LINES = (
+    'In this video we walk through the code step by step.',
+    'Source code and notebook: https://github.com/example/synthetic-notebooks',
+    'Join the channel membership for early access: https://www.youtube.com/channel/join',
+    '00:00 Intro 02:15 Setup 07:40 The main idea 15:30 Worked example 24:10 Wrap-up',
+    'Subscribe and hit the bell icon so you never miss an upload!',
+    '#datascience #machinelearning #python #tutorial',
+)
+
+_TRANSCRIPT_WORDS = ('so', 'the', 'model', 'data', 'we', 'train', 'python', 'loss', 'function',
+                     'gradient', 'today', 'let', 'us', 'look', 'at', 'feature', 'and', 'a', 'test')
+
+
+def apply_fields(body, fields):
+    """Trim a response body to a partial-response fields expression, as the real API does
+
+    Supports comma-separated selections, a/b paths and a(b,c) sub-selections,
+    e.g. 'nextPageToken,items(id,snippet/title)'. Lists apply the selection
+    to every element.
+    """
+    tree, end = _parse_field_list(fields.replace(' ', ''), 0)
+    if end != len(fields.replace(' ', '')):
+        raise ValueError(f"Invalid fields expression: {fields}")
+    return _select(body, tree)
+
+
+def fixture_key(resource, params):
+    """Canonical lookup key for a list() call, independent of parameter order and API key"""
+    kept = sorted((name, str(value)) for name, value in params.items()
+                  if name not in IGNORED_PARAMS and value is not None)
+    return f"{resource}?{urlencode(kept)}"
+
+
+class SyntheticFixtures:
+    """Deterministic fake responses for search, channels, playlistItems and videos
+
+    Any channel ID resolves to a channel whose statistics are derived from
+    the ID, so predefined channel lists work unchanged. Every uploads
+    playlist holds videos_per_channel videos, served at most page_size per
+    page, which sets how many playlistItems pages a crawl needs.
+    """
+
+    def __init__(self, n_channels=50, videos_per_channel=200, page_size=50):
+        self.n_channels = n_channels
+        self.videos_per_channel = videos_per_channel
+        self.page_size = page_size
+
+    def respond(self, resource, params):
+        """Return (status, body) for one list() call"""
+        handler = getattr(self, f'_{resource}', None)
+        if handler is None:
+            return 404, _error_body(404, 'notFound', f'Unknown resource {resource}')
+        return 200, handler(params)
+
+    def _search(self, params):
+        count = min(int(params.get('maxResults', 5)), self.n_channels)
+        query = params.get('q', '')
+        items = []
+        for i in range(count):
+            channel_id = _synthetic_channel_id(i)
+            title = f'{query.title() or "Synthetic"} Channel {i}'
+            items.append({
+                'kind': 'youtube#searchResult',
+                'etag': _etag(channel_id),
+                'id': {'kind': 'youtube#channel', 'channelId': channel_id},
+                'snippet': {
+                    'publishedAt': _timestamp(i * 30),
+                    'channelId': channel_id,
+                    'title': title,
+                    'description': f'Synthetic channel {i} about {query or "everything"}. ' * 4,
+                    'thumbnails': {size: {'url': f'https://yt3.example.invalid/{channel_id}/{size}.jpg'}
+                                   for size in ('default', 'medium', 'high')},
+                    'channelTitle': title,
+                    'liveBroadcastContent': 'none',
+                    'publishTime': _timestamp(i * 30)
+                }
+            })
+        return {'kind': 'youtube#searchListResponse', 'items': items,
+                'pageInfo': {'totalResults': self.n_channels, 'resultsPerPage': count}}
+
+    def _channels(self, params):
+        items = []
+        for channel_id in filter(None, params.get('id', '').split(',')):
+            rng = random.Random(channel_id)
+            title = f'Channel {channel_id[-6:]}'
+            description = 'A synthetic channel used for offline runs. ' * 8
+            items.append({
+                'kind': 'youtube#channel',
+                'etag': _etag(channel_id),
+                'id': channel_id,
+                'snippet': {
+                    'title': title,
+                    'description': description,
+                    'customUrl': f'@channel{channel_id[-6:]}',
+                    'publishedAt': _timestamp(rng.uniform(0, 3000)),
+                    'thumbnails': _thumbnails(f'https://yt3.example.invalid/{channel_id}', 3),
+                    'localized': {'title': title, 'description': description},
+                    'country': rng.choice(['US', 'GB', 'IN', 'DE', 'CA'])
+                },
+                'contentDetails': {'relatedPlaylists': {'likes': '', 'uploads': 'UU' + channel_id[2:]}},
+                'statistics': {
+                    'viewCount': str(int(rng.lognormvariate(16, 2))),
+                    'subscriberCount': str(int(rng.lognormvariate(11, 2))),
+                    'hiddenSubscriberCount': False,
+                    'videoCount': str(self.videos_per_channel)
+                }
+            })
+        return {'kind': 'youtube#channelListResponse', 'items': items}
+
+    def _playlistItems(self, params):
+        playlist_id = params.get('playlistId', '')
+        start = int(params.get('pageToken') or 0)
+        end = min(start + min(int(params.get('maxResults', 5)), self.page_size), self.videos_per_channel)
+        channel_id = 'UC' + playlist_id[2:]
+        items = []
+        for i in range(start, end):
+            video_id = _synthetic_video_id(playlist_id, i)
+            rng = random.Random(video_id)
+            items.append({
+                'kind': 'youtube#playlistItem',
+                'etag': _etag(video_id),
+                'id': _etag(playlist_id + video_id)[:40],
+                'snippet': {
+                    'publishedAt': _timestamp(rng.uniform(0, 4000)),
+                    'channelId': channel_id,
+                    'title': f'Video {video_id}',
+                    'description': _description(rng),
+                    'thumbnails': _thumbnails(f'https://i.example.invalid/vi/{video_id}', 5),
+                    'channelTitle': f'Channel {channel_id[-6:]}',
+                    'playlistId': playlist_id,
+                    'position': i,
+                    'resourceId': {'kind': 'youtube#video', 'videoId': video_id},
+                    'videoOwnerChannelTitle': f'Channel {channel_id[-6:]}',
+                    'videoOwnerChannelId': channel_id
+                },
+                'contentDetails': {'videoId': video_id}
+            })
+        body = {'kind': 'youtube#playlistItemListResponse', 'items': items,
+                'pageInfo': {'totalResults': self.videos_per_channel, 'resultsPerPage': len(items)}}
+        if end < self.videos_per_channel:
+            body['nextPageToken'] = str(end)
+        return body
+
+    def _videos(self, params):
+        items = []
+        for video_id in filter(None, params.get('id', '').split(',')):
+            rng = random.Random(video_id)
+            views = int(rng.lognormvariate(9, 2))
+            seconds = rng.randint(15, 59) if rng.random() < 0.3 else rng.randint(180, 5400)
+            title = f'Video {video_id}'
+            description = _description(rng)
+            items.append({
+                'kind': 'youtube#video',
+                'etag': _etag(video_id),
+                'id': video_id,
+                'snippet': {
+                    'publishedAt': _timestamp(rng.uniform(0, 4000)),
+                    'channelId': 'UC' + '0' * 22,
+                    'title': title,
+                    'description': description,
+                    'thumbnails': _thumbnails(f'https://i.example.invalid/vi/{video_id}', 5),
+                    'channelTitle': 'Synthetic Channel',
+                    'tags': rng.sample(['python', 'data science', 'machine learning', 'tutorial', 'pandas',
+                                        'numpy', 'deep learning', 'statistics', 'sql', 'ai'], 6),
+                    'categoryId': '28',
+                    'liveBroadcastContent': 'none',
+                    'defaultLanguage': 'en',
+                    'localized': {'title': title, 'description': description},
+                    'defaultAudioLanguage': 'en'
+                },
+                'contentDetails': {
+                    'duration': _iso_duration(seconds),
+                    'dimension': '2d',
+                    'definition': 'hd',
+                    'caption': 'false',
+                    'licensedContent': True,
+                    'contentRating': {},
+                    'projection': 'rectangular'
+                },
+                'statistics': {
+                    'viewCount': str(views),
+                    'likeCount': str(int(views * rng.uniform(0.005, 0.08))),
+                    'favoriteCount': '0',
+                    'commentCount': str(int(views * rng.uniform(0.0005, 0.01)))
+                }
+            })
+        return {'kind': 'youtube#videoListResponse', 'items': items}
+
+
+class RecordedFixtures:
+    """Responses replayed from a cassette file, falling back to another fixture set on a miss"""
+
+    def __init__(self, path, fallback=None):
+        self.cassette = Cassette(path)
+        self.fallback = fallback
+
+    def respond(self, resource, params):
+        body = self.cassette.lookup(resource, params)
+        if body is not None:
+            return 200, body
+        if self.fallback is not None:
+            return self.fallback.respond(resource, params)
+        return 404, _error_body(404, 'notFound', f'No recording for {fixture_key(resource, params)}')
+
+
+class Cassette:
+    """JSON file of recorded response bodies keyed by fixture_key"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.responses = json.load(f)['responses']
+        except FileNotFoundError:
+            self.responses = {}
+
+    def lookup(self, resource, params):
+        return self.responses.get(fixture_key(resource, params))
+
+    def record(self, resource, params, body):
+        with self._lock:
+            self.responses[fixture_key(resource, params)] = body
+
+    def save(self):
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'responses': self.responses}, f, indent=1, sort_keys=True)
+
+
+class RecordingHttp:
+    """httplib2.Http wrapper that records successful list() responses into a Cassette
+
+    Pass it as YouTubeAnalytics(http_factory=...) while running against the
+    live API, then save the cassette and serve it with RecordedFixtures.
+    Batch requests pass through unrecorded, so record with batching off.
+    """
+
+    def __init__(self, http, cassette):
+        self._http = http
+        self.cassette = cassette
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        response, content = self._http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        if method == 'GET' and response.status == 200:
+            resource, params = _split_uri(uri)
+            self.cassette.record(resource, params, json.loads(content))
+        return response, content
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+
+class FakeYouTubeServer:
+    """Local HTTP server speaking the YouTube Data API list() and batch protocols
+
+    Every request (a batch counts once) waits latency seconds before being
+    answered. Responses carry ETags and honour If-None-Match with a 304.
+    Use as a context manager and point YouTubeAnalytics(api_endpoint=...)
+    at .endpoint.
+    """
+
+    def __init__(self, fixtures=None, latency=0.0, host='127.0.0.1', port=0):
+        self.fixtures = fixtures if fixtures is not None else SyntheticFixtures()
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def request_count(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def _count(self, name):
+        with self._lock:
+            self.requests[name] += 1
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _respond(self, path_and_query, if_none_match=None):
+        """Return (status, headers, body bytes) for one GET"""
+        resource, params = _split_uri(path_and_query)
+        self._count(resource)
+        status, body = self.fixtures.respond(resource, params)
+        if status != 200:
+            return status, {}, json.dumps(body).encode('utf-8')
+        etag = '"' + hashlib.md5(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest() + '"'
+        if if_none_match == etag:
+            return 304, {'ETag': etag}, b''
+        body = dict(body, etag=etag)
+        if params.get('fields'):
+            body = apply_fields(body, params['fields'])
+        return 200, {'ETag': etag}, json.dumps(body).encode('utf-8')
+
+
+class StubTranscriptSource:
+    """Offline transcript source for fetch_transcripts with deterministic segments
+
+    Each call sleeps latency seconds like a network round trip. IDs in
+    unavailable raise TranscriptUnavailable and IDs in failing raise
+    ConnectionError; calls counts fetches per video ID.
+    """
+
+    def __init__(self, latency=0.0, segments_per_video=120, unavailable=(), failing=()):
+        self.latency = latency
+        self.segments_per_video = segments_per_video
+        self.unavailable = set(unavailable)
+        self.failing = set(failing)
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, video_id):
+        with self._lock:
+            self.calls[video_id] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if video_id in self.unavailable:
+            raise TranscriptUnavailable(f"Transcripts are disabled for {video_id}")
+        if video_id in self.failing:
+            raise ConnectionError(f"Stub failure for {video_id}")
+        rng = random.Random(video_id)
+        return [
+            {'text': ' '.join(rng.choices(_TRANSCRIPT_WORDS, k=rng.randint(4, 12))),
+             'start': round(i * 4.2, 2), 'duration': 4.2}
+            for i in range(self.segments_per_video)
+        ]
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    # Room for hundreds of clients connecting at once, as the asyncio client does
+    request_queue_size = 1024
+
+
+def _make_handler(server):
+    """Build the request handler class bound to one FakeYouTubeServer"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            server._wait()
+            status, headers, body = server._respond(self.path, self.headers.get('If-None-Match'))
+            self._send(status, headers, body, 'application/json')
+
+        def do_POST(self):
+            payload = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if not urlsplit(self.path).path.endswith('/batch'):
+                self._send(404, {}, b'{}', 'application/json')
+                return
+            server._wait()
+            server._count('batch')
+            message = email.message_from_bytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + payload
+            )
+            boundary = 'fake_batch_boundary'
+            parts = []
+            for part in message.get_payload():
+                request_line, _, rest = part.get_payload().partition('\n')
+                inner_headers = email.message_from_string(rest)
+                status, headers, body = server._respond(
+                    request_line.split(' ')[1], inner_headers.get('If-None-Match')
+                )
+                header_lines = ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+                parts.append(
+                    f"--{boundary}\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                    f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}\r\n"
+                    f"Content-Type: application/json\r\n{header_lines}\r\n".encode('utf-8') + body + b"\r\n"
+                )
+            body = b''.join(parts) + f"--{boundary}--\r\n".encode('utf-8')
+            self._send(200, {}, body, f'multipart/mixed; boundary={boundary}')
+
+        def _send(self, status, headers, body, content_type):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client hung up, e.g. a cancelled request; nothing to answer
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _split_uri(uri):
+    """Split a list() request URI into (resource, params)"""
+    parts = urlsplit(uri)
+    return parts.path.rstrip('/').rsplit('/', 1)[-1], dict(parse_qsl(parts.query))
+
+
+def _error_body(code, reason, message):
+    return {'error': {'code': code, 'message': message, 'errors': [{'reason': reason, 'message': message}]}}
+
+
+def _parse_field_list(text, pos):
+    """Parse a comma-separated field selection starting at pos; return (tree, end position)
+
+    The tree maps field names to a nested tree, or to None for the whole field.
+    """
+    tree = {}
+    while True:
+        start = pos
+        while pos < len(text) and text[pos] not in ',()':
+            pos += 1
+        path = text[start:pos].split('/')
+        selection = None
+        if pos < len(text) and text[pos] == '(':
+            selection, pos = _parse_field_list(text, pos + 1)
+            if pos >= len(text) or text[pos] != ')':
+                raise ValueError(f"Unbalanced parentheses in fields expression: {text}")
+            pos += 1
+        for name in reversed(path[1:]):
+            selection = {name: selection}
+        _merge_selection(tree, path[0], selection)
+        if pos < len(text) and text[pos] == ',':
+            pos += 1
+            continue
+        return tree, pos
+
+
+def _merge_selection(tree, name, selection):
+    if name not in tree:
+        tree[name] = selection
+    elif tree[name] is None or selection is None:
+        tree[name] = None
+    else:
+        for child, child_selection in selection.items():
+            _merge_selection(tree[name], child, child_selection)
+
+
+def _select(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: _select(value[name], selection) for name, selection in tree.items() if name in value}
+    return value
+
+
+def _etag(seed):
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()[:27]
+
+
+def _thumbnails(url_base, count):
+    return {size: {'url': f'{url_base}/{size}.jpg', 'width': width, 'height': height}
+            for size, (width, height) in list(_THUMBNAIL_SIZES.items())[:count]}
+
+
+def _description(rng):
+    """Multi-line description of 200-2500 characters with links, chapters and hashtags"""
+    lines = []
+    target = rng.randint(200, 2500)
+    while sum(len(line) + 1 for line in lines) < target:
+        lines.append(rng.choice(_DESCRIPTION_LINES))
+    return '\n'.join(lines)
+
+
+def _synthetic_channel_id(index):
+    return f"UC{index:022d}"
+
+
+def _synthetic_video_id(playlist_id, index):
+    """Stable 11-character video ID for the index-th upload of a playlist"""
+    return f"{zlib.crc32(playlist_id.encode('utf-8')):06x}"[-6:] + f"{index:05d}"
+
+
+def _timestamp(days_after_epoch):
+    return (_EPOCH + timedelta(days=days_after_epoch)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _iso_duration(seconds):
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return 'PT' + (f'{hours}H' if hours else '') + (f'{minutes}M' if minutes else '') + f'{seconds}S'
@@ -0,0 +1,184 @@
+"""
+Per-call API instrumentation with JSON and Prometheus text exports
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from urllib.parse import urlencode
+
+CallRecord = namedtuple('CallRecord', [
+    'timestamp', 'method', 'priority', 'params_bytes', 'latency_ms',
+    'response_bytes', 'quota_units', 'retries', 'outcome', 'batched'
+])
+
+# Upper bounds of the Prometheus latency histogram, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DEFAULT_METRICS_FILE = os.path.join('.yt_cache', 'api_metrics.prom')
+
+
+def params_size(params):
+    """Size in bytes of the query string a set of list() parameters encodes to"""
+    return len(urlencode(sorted((k, v) for k, v in params.items() if v is not None)).encode('utf-8'))
+
+
+class MeteredHttp:
+    """httplib2.Http wrapper that counts response body bytes"""
+
+    def __init__(self, http):
+        self._http = http
+        self.response_bytes = 0
+
+    def request(self, *args, **kwargs):
+        response, content = self._http.request(*args, **kwargs)
+        self.response_bytes += len(content or b'')
+        return response, content
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+
+class ApiMetrics:
+    """Thread-safe record of every API call made through YouTubeAnalytics
+
+    Per-method totals and latency histograms cover the whole process
+    lifetime; the last max_records individual calls are kept for the
+    percentile and slowest-call views.
+    """
+
+    def __init__(self, max_records=2000, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=max_records)
+        self._calls = defaultdict(int)
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+
+    def record(self, method, params, latency_ms, response_bytes=0, quota_units=0, retries=0,
+               outcome='ok', priority='normal', batched=False):
+        """Store one call; outcome is ok, cache_hit, not_modified or error"""
+        call = CallRecord(self._clock(), method, priority, params_size(params), latency_ms,
+                          response_bytes, quota_units, retries, outcome, batched)
+        with self._lock:
+            self._records.append(call)
+            self._calls[(method, outcome)] += 1
+            totals = self._totals[method]
+            totals['latency_seconds'] += latency_ms / 1000
+            totals['params_bytes'] += call.params_bytes
+            totals['response_bytes'] += response_bytes
+            totals['quota_units'] += quota_units
+            totals['retries'] += retries
+            buckets = self._buckets[method]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency_ms / 1000 <= bound:
+                    buckets[i] += 1
+
+    def records(self):
+        """Return the retained calls, oldest first"""
+        with self._lock:
+            return list(self._records)
+
+    def slowest(self, n=10):
+        """Return the n slowest retained calls that reached the network"""
+        calls = [call for call in self.records() if call.outcome != 'cache_hit']
+        return sorted(calls, key=lambda call: call.latency_ms, reverse=True)[:n]
+
+    def summary(self):
+        """Return per-method counts, latency percentiles, bytes, quota units and retries"""
+        latencies = defaultdict(list)
+        for call in self.records():
+            if call.outcome != 'cache_hit':
+                latencies[call.method].append(call.latency_ms)
+
+        with self._lock:
+            methods = sorted(self._totals)
+            calls = dict(self._calls)
+            totals = {method: dict(self._totals[method]) for method in methods}
+
+        summary = {}
+        for method in methods:
+            outcomes = {outcome: count for (name, outcome), count in calls.items() if name == method}
+            summary[method] = {
+                'calls': sum(outcomes.values()),
+                'cache_hits': outcomes.get('cache_hit', 0),
+                'errors': outcomes.get('error', 0),
+                'p50_ms': _percentile(latencies[method], 50),
+                'p95_ms': _percentile(latencies[method], 95),
+                'response_kib': totals[method]['response_bytes'] / 1024,
+                'quota_units': int(totals[method]['quota_units']),
+                'retries': int(totals[method]['retries']),
+            }
+        return summary
+
+    def to_json(self, indent=2):
+        """Export the summary and retained calls as a JSON document"""
+        return json.dumps({
+            'generated_at': self._clock(),
+            'summary': self.summary(),
+            'calls': [call._asdict() for call in self.records()],
+        }, indent=indent)
+
+    def to_prometheus(self):
+        """Render counters and latency histograms in the Prometheus text exposition format"""
+        with self._lock:
+            calls = dict(self._calls)
+            totals = {method: dict(values) for method, values in self._totals.items()}
+            buckets = {method: list(values) for method, values in self._buckets.items()}
+
+        lines = [
+            '# HELP youtube_api_calls_total API calls by method and outcome.',
+            '# TYPE youtube_api_calls_total counter',
+        ]
+        for (method, outcome), count in sorted(calls.items()):
+            lines.append(f'youtube_api_calls_total{{method="{method}",outcome="{outcome}"}} {count}')
+
+        for name, key, help_text in [
+            ('youtube_api_quota_units_total', 'quota_units', 'Quota units charged.'),
+            ('youtube_api_retries_total', 'retries', 'Retried attempts after transient errors.'),
+            ('youtube_api_response_bytes_total', 'response_bytes', 'Response body bytes received.'),
+            ('youtube_api_request_params_bytes_total', 'params_bytes', 'Encoded request parameter bytes.'),
+        ]:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for method in sorted(totals):
+                lines.append(f'{name}{{method="{method}"}} {totals[method][key]:g}')
+
+        lines += [
+            '# HELP youtube_api_call_latency_seconds API call latency, cache hits included.',
+            '# TYPE youtube_api_call_latency_seconds histogram',
+        ]
+        for method in sorted(totals):
+            count = sum(n for (name, _), n in calls.items() if name == method)
+            for bound, n in zip(LATENCY_BUCKETS, buckets[method]):
+                lines.append(f'youtube_api_call_latency_seconds_bucket{{method="{method}",le="{bound:g}"}} {n}')
+            lines.append(f'youtube_api_call_latency_seconds_bucket{{method="{method}",le="+Inf"}} {count}')
+            lines.append(f'youtube_api_call_latency_seconds_sum{{method="{method}"}} '
+                         f'{totals[method]["latency_seconds"]:.6f}')
+            lines.append(f'youtube_api_call_latency_seconds_count{{method="{method}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path=DEFAULT_METRICS_FILE):
+        """Atomically write the Prometheus text to path, e.g. for a node_exporter textfile collector
+
+        Each call writes its own temporary file beside path, so concurrent
+        writers (one per app session) never interleave; the last replace wins.
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
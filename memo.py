@@ -0,0 +1,131 @@
+"""
+Content-hash memoization for data processing and chart building
+"""
+import functools
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Content hashes of pandas objects returned by memoized functions, keyed by id().
+# Those results are read-only by contract, so their hash is computed only once.
+_result_hashes = {}
+
+
+def content_hash(value):
+    """Hash DataFrames, Series, containers and scalars by content.
+
+    Raises TypeError for values whose content cannot be hashed (generators,
+    arbitrary objects), so callers can skip caching them.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update_hash(digest, value)
+    return digest.hexdigest()
+
+
+def _update_hash(digest, value):
+    """Feed one value into the running digest"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        known = _result_hashes.get(id(value))
+        if known is None:
+            known = _pandas_hash(value)
+            if id(value) in _result_hashes:
+                _result_hashes[id(value)] = known
+        digest.update(known)
+    elif isinstance(value, (list, dict)):
+        digest.update(b'json')
+        digest.update(json.dumps(value, sort_keys=True, default=_json_scalar).encode('utf-8'))
+    elif isinstance(value, tuple):
+        digest.update(b'(')
+        for item in value:
+            _update_hash(digest, item)
+        digest.update(b')')
+    elif value is None or isinstance(value, (str, int, float, bool, np.generic)):
+        digest.update(repr(value).encode('utf-8'))
+    else:
+        raise TypeError(f"Cannot content-hash {type(value).__name__}")
+
+
+def _pandas_hash(value):
+    """Digest a DataFrame or Series from its labels, dtypes and row hashes"""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'DataFrame')
+        digest.update(repr(list(zip(value.columns, value.dtypes.astype(str)))).encode('utf-8'))
+    else:
+        digest.update(b'Series')
+        digest.update(repr((value.name, str(value.dtype))).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    return digest.digest()
+
+
+def _remember_result(result):
+    """Mark a memoized pandas result so its content hash is reused while it lives"""
+    if isinstance(result, (pd.DataFrame, pd.Series)) and id(result) not in _result_hashes:
+        _result_hashes[id(result)] = None
+        weakref.finalize(result, _result_hashes.pop, id(result), None)
+
+
+def _json_scalar(value):
+    """Serialize the scalar types json does not know about, reject everything else"""
+    if isinstance(value, (np.generic, pd.Timestamp)):
+        return repr(value)
+    raise TypeError(f"Cannot content-hash {type(value).__name__}")
+
+
+def memoize(maxsize=16, extra_key=None):
+    """Cache results keyed by the content hash of the arguments, with LRU eviction.
+
+    Cached DataFrames and figures are returned as-is, so decorated functions
+    and their callers must treat them as read-only. Calls with arguments that
+    cannot be hashed bypass the cache. For results that also depend on
+    something outside the arguments, extra_key() is called on every call
+    and its value hashed into the key.
+    """
+    def decorator(fn):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        counters = {'hits': 0, 'misses': 0}
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                key_parts = (args, tuple(sorted(kwargs.items())))
+                if extra_key is not None:
+                    key_parts += (extra_key(),)
+                key = content_hash(key_parts)
+            except TypeError:
+                return fn(*args, **kwargs)
+
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    counters['hits'] += 1
+                    return cache[key]
+                counters['misses'] += 1
+
+            result = fn(*args, **kwargs)
+            _remember_result(result)
+            with lock:
+                cache[key] = result
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        def cache_info():
+            with lock:
+                return dict(counters, size=len(cache), maxsize=maxsize)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
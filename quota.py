@@ -0,0 +1,175 @@
+"""
+Quota accounting, token-bucket budgeting and retry policy for YouTube API calls
+"""
+import json
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+
+# Daily quota granted to a Google Cloud project by default
+DAILY_QUOTA = 10_000
+
+# Units charged per call; every other list() call costs 1 unit
+QUOTA_COSTS = {
+    'search.list': 100,
+}
+
+# Share of the daily budget that must remain after a call of each priority.
+# Low-priority work (bulk crawls) backs off first, interactive calls last.
+PRIORITY_RESERVES = {
+    'high': 0.0,
+    'normal': 0.05,
+    'low': 0.25,
+}
+
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call cannot be made within the remaining quota budget"""
+
+
+def quota_cost(method):
+    """Return the quota units charged for one call of an API method"""
+    return QUOTA_COSTS.get(method, 1)
+
+
+def _error_reason(error):
+    """Extract the API error reason (e.g. 'quotaExceeded') from an HttpError"""
+    try:
+        content = error.content.decode('utf-8') if isinstance(error.content, bytes) else error.content
+        return json.loads(content)['error']['errors'][0]['reason']
+    except Exception:
+        return None
+
+
+def classify_error(error):
+    """Classify an exception as 'quota', 'transient' or 'fatal'"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        if isinstance(error, (socket.timeout, TimeoutError, ConnectionError)):
+            return 'transient'
+        return 'fatal'
+
+    reason = _error_reason(error)
+    if status == 403 and reason in QUOTA_REASONS:
+        return 'quota'
+    if status == 429 or (status == 403 and reason in RATE_LIMIT_REASONS):
+        return 'transient'
+    if status >= 500:
+        return 'transient'
+    return 'fatal'
+
+
+class QuotaScheduler:
+    """Central gate for API calls: token-bucket budget, per-method accounting and retries.
+
+    The bucket holds the daily quota and refills continuously over
+    refill_period. Calls that would dip into the reserve for their priority
+    wait up to max_wait seconds for tokens, and are refused after that.
+    """
+
+    def __init__(self, capacity=DAILY_QUOTA, refill_period=24 * 3600, max_retries=4,
+                 base_delay=0.5, max_delay=32.0, max_wait=10.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.capacity = capacity
+        self.refill_rate = capacity / refill_period
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._spent = defaultdict(int)
+        self._calls = defaultdict(int)
+        self._retries = defaultdict(int)
+        self._refused = defaultdict(int)
+
+    def run(self, method, call, priority='normal'):
+        """Charge quota for method, then run call() retrying transient errors"""
+        attempt = 0
+        while True:
+            self.acquire(method, priority)
+            try:
+                return call()
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == 'quota':
+                    self.exhaust()
+                    raise QuotaExceededError(f"Daily quota exhausted while calling {method}") from e
+                if kind != 'transient' or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.record_retry(method)
+                self._sleep(self.backoff_delay(attempt))
+
+    def acquire(self, method, priority='normal'):
+        """Take tokens for one call, waiting briefly or refusing when the budget is low"""
+        cost = quota_cost(method)
+        reserve = PRIORITY_RESERVES[priority] * self.capacity
+        deadline = self._clock() + self.max_wait
+
+        while True:
+            with self._lock:
+                self._refill()
+                shortfall = cost + reserve - self._tokens
+                if shortfall <= 0:
+                    self._tokens -= cost
+                    self._spent[method] += cost
+                    self._calls[method] += 1
+                    return
+                wait = shortfall / self.refill_rate
+                if self._clock() + wait > deadline:
+                    self._refused[method] += 1
+                    raise QuotaExceededError(
+                        f"Not enough quota left for {method} at {priority} priority "
+                        f"({self._tokens:.0f} of {self.capacity:,} units remaining)"
+                    )
+            self._sleep(wait)
+
+    def exhaust(self):
+        """Empty the bucket after the API reported the daily quota as spent"""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = self._clock()
+
+    def record_retry(self, method):
+        """Count one retry of a call made outside run(), e.g. by the asyncio client"""
+        with self._lock:
+            self._retries[method] += 1
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def remaining(self):
+        """Return the number of quota units currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def stats(self):
+        """Return units spent, calls, retries and refusals per API method"""
+        with self._lock:
+            self._refill()
+            return {
+                'capacity': self.capacity,
+                'remaining': self._tokens,
+                'spent': sum(self._spent.values()),
+                'spent_by_method': dict(self._spent),
+                'calls_by_method': dict(self._calls),
+                'retries_by_method': dict(self._retries),
+                'refused_by_method': dict(self._refused),
+            }
+
+    def _refill(self):
+        """Add tokens accrued since the last update, capped at capacity"""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
@@ -0,0 +1,472 @@
+"""
+Full-text BM25 index over video titles, descriptions and transcripts with memory-mapped postings
+"""
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_INDEX_DIR = os.path.join('.yt_cache', 'search_index')
+
+# Seconds a merged-away segment stays on disk, so searches in other processes
+# that still hold the previous manifest can finish reading it
+RETIRED_SEGMENT_GRACE = 300
+
+# Term frequencies are weighted per field, so a title match outranks a passing mention
+FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0, 'transcript': 1.0}
+
+# Stored with each document and returned with search hits
+STORED_FIELDS = ['video_id', 'title', 'channel_title']
+
+# Longer tokens are almost always hashes or URLs; capping them keeps the term arrays narrow
+MAX_TOKEN_LENGTH = 32
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by for from how i if in into is it its me my no not of on or so '
+    'that the their then there these this to was we what when which who why will with you your'.split()
+)
+
+_TOKEN = re.compile(r'[0-9a-z]+')
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of a text, without stopwords or overlong tokens"""
+    return [token for token in _TOKEN.findall(text.casefold())
+            if token not in STOPWORDS and len(token) <= MAX_TOKEN_LENGTH]
+
+
+def video_documents(videos, transcript_store=None, channel_title=None):
+    """Turn get_video_details rows or a video DataFrame into index documents
+
+    Transcripts are read from transcript_store when it holds one for the
+    video; channel_title fills in rows that lack their own.
+    """
+    rows = videos.to_dict('records') if isinstance(videos, pd.DataFrame) else videos
+    for row in rows:
+        transcript = ''
+        if transcript_store is not None:
+            entry = transcript_store.get(row['video_id'])
+            if entry and entry['available']:
+                transcript = ' '.join(segment['text'] for segment in entry['segments'])
+        yield {
+            'video_id': row['video_id'],
+            'title': row.get('title') or '',
+            'description': row.get('description') or '',
+            'transcript': transcript,
+            'channel_title': row.get('channel_title') or channel_title or '',
+        }
+
+
+class _Segment:
+    """One immutable on-disk segment; only its deletion mask changes after it is written
+
+    Terms are a sorted fixed-width string array, so a lookup is a binary
+    search on the memory-mapped file. Postings of term i are docs[offsets[i]:offsets[i+1]]
+    with their field-weighted term frequencies in tfs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.terms = _load_array(path, 'terms')
+        self.offsets = _load_array(path, 'offsets')
+        self.docs = _load_array(path, 'docs')
+        self.tfs = _load_array(path, 'tfs')
+        self.lengths = _load_array(path, 'lengths')
+        self.ids = _load_array(path, 'ids')
+        self.id_order = _load_array(path, 'id_order')
+        self.stored_offsets = _load_array(path, 'stored_offsets')
+        self.reload_deleted()
+        self.total_length = float(self.lengths.sum())
+
+    def reload_deleted(self):
+        """Re-read the deletion mask, which another process may have updated"""
+        self.deleted = np.load(os.path.join(self.path, 'deleted.npy'))
+
+    @property
+    def n_docs(self):
+        return len(self.ids)
+
+    def live_count(self):
+        return self.n_docs - int(self.deleted.sum())
+
+    def postings(self, term):
+        """Return (docs, tfs) for a term, or None if the segment does not contain it"""
+        i = int(np.searchsorted(self.terms, term))
+        if i == len(self.terms) or self.terms[i] != term:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.docs[start:end], self.tfs[start:end]
+
+    def delete(self, video_ids):
+        """Mark live documents with these IDs deleted and return how many were"""
+        if not self.n_docs:
+            return 0
+        sorted_ids = self.ids[self.id_order]
+        positions = np.searchsorted(sorted_ids, video_ids)
+        positions[positions == self.n_docs] = 0
+        found = self.id_order[positions[sorted_ids[positions] == video_ids]]
+        found = found[~self.deleted[found]]
+        if len(found):
+            self.deleted[found] = True
+            _save_array(os.path.join(self.path, 'deleted.npy'), self.deleted)
+        return len(found)
+
+    def stored(self, local_ids):
+        """Return the stored fields of the given documents"""
+        rows = []
+        with open(os.path.join(self.path, 'stored.jsonl'), 'rb') as f:
+            for local in local_ids:
+                f.seek(self.stored_offsets[local])
+                rows.append(json.loads(f.readline()))
+        return rows
+
+    def stored_lines(self):
+        with open(os.path.join(self.path, 'stored.jsonl'), 'rb') as f:
+            return f.read().splitlines()
+
+
+class SearchIndex:
+    """Incrementally updated inverted index ranked with BM25
+
+    Each add() writes its documents as a new segment and marks older copies
+    of the same videos deleted, so re-indexing a video (for example once
+    its transcript arrives) replaces it. When there are more than
+    max_segments segments the smaller half is merged into one, dropping
+    deleted documents. Document frequencies count deleted documents until
+    they are merged away, as in Lucene. A manifest lists the live segments
+    and is replaced atomically, so a crash never exposes a partial segment.
+
+    Several processes (the app and crawl_cli --index) can share a
+    directory: writes hold a lock file and start from the manifest on
+    disk, and every read picks up a manifest another process replaced.
+    Merged-away segments are deleted RETIRED_SEGMENT_GRACE seconds later,
+    not while a search may still be reading them.
+    """
+
+    def __init__(self, directory=DEFAULT_INDEX_DIR, max_segments=8):
+        self.directory = directory
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._manifest_key = None
+        self._generation = 0
+        self._segments = []
+        self._retired = []
+        os.makedirs(directory, exist_ok=True)
+        self._refresh()
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return sum(segment.live_count() for segment in self._segments)
+
+    def add(self, documents):
+        """Index documents (dicts with video_id and any of the FIELD_WEIGHTS fields), replacing older copies"""
+        latest = {}
+        for document in documents:
+            latest[document['video_id']] = document
+        if not latest:
+            return 0
+        with self._writing():
+            segment = self._write_segment(_build_arrays(list(latest.values())))
+            video_ids = np.array(list(latest))
+            video_ids.sort()
+            for older in self._segments:
+                older.delete(video_ids)
+            self._segments.append(segment)
+            self._write_manifest()
+            if len(self._segments) > self.max_segments:
+                by_size = sorted(self._segments, key=lambda s: s.n_docs)
+                self.merge(by_size[:len(by_size) // 2 + 1])
+        return len(latest)
+
+    def merge(self, segments=None):
+        """Merge segments (default: all) into one, dropping deleted documents"""
+        with self._writing():
+            if segments is not None:
+                # Another process may have merged some of them away since they were picked
+                names = {segment.name for segment in segments}
+                segments = [segment for segment in self._segments if segment.name in names]
+            segments = list(self._segments if segments is None else segments)
+            if len(segments) < 2 and not any(segment.deleted.any() for segment in segments):
+                return
+            merged = []
+            if any(segment.live_count() for segment in segments):
+                merged.append(self._write_segment(_merge_arrays(segments)))
+            position = min(self._segments.index(segment) for segment in segments)
+            remaining = [segment for segment in self._segments if segment not in segments]
+            self._segments = remaining[:position] + merged + remaining[position:]
+            self._retired.extend([segment.name, time.time()] for segment in segments)
+            self._write_manifest()
+
+    def search(self, query, limit=20):
+        """Return up to limit hits as dicts of the stored fields plus score, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            self._refresh()
+            segments = list(self._segments)
+        total_docs = sum(segment.n_docs for segment in segments)
+        if not terms or not total_docs:
+            return []
+        avg_length = sum(segment.total_length for segment in segments) / total_docs or 1.0
+
+        postings = {term: [segment.postings(term) for segment in segments] for term in terms}
+        idf = {}
+        for term, per_segment in postings.items():
+            df = sum(len(found[0]) for found in per_segment if found is not None)
+            idf[term] = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+        candidates = []
+        for index, segment in enumerate(segments):
+            docs, contributions = [], []
+            for term in terms:
+                found = postings[term][index]
+                if found is None:
+                    continue
+                term_docs, tfs = found
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.lengths[term_docs] / avg_length)
+                docs.append(term_docs)
+                contributions.append(idf[term] * tfs * (BM25_K1 + 1) / (tfs + norm))
+            if not docs:
+                continue
+            scores = np.bincount(np.concatenate(docs), weights=np.concatenate(contributions),
+                                 minlength=segment.n_docs)
+            scores[segment.deleted] = 0
+            hits = np.flatnonzero(scores)
+            if len(hits) > limit:
+                hits = hits[np.argpartition(scores[hits], -limit)[-limit:]]
+            candidates.extend((scores[local], index, local) for local in hits)
+
+        candidates.sort(key=lambda hit: -hit[0])
+        results = []
+        for score, index, local in candidates[:limit]:
+            row = segments[index].stored([local])[0]
+            row['score'] = round(float(score), 3)
+            results.append(row)
+        return results
+
+    def stats(self):
+        """Return live and deleted document counts, segment count and size on disk"""
+        with self._lock:
+            self._refresh()
+            segments = list(self._segments)
+        size = sum(os.path.getsize(os.path.join(segment.path, name))
+                   for segment in segments for name in os.listdir(segment.path))
+        return {
+            'documents': sum(segment.live_count() for segment in segments),
+            'deleted': sum(int(segment.deleted.sum()) for segment in segments),
+            'segments': len(segments),
+            'terms': sum(len(segment.terms) for segment in segments),
+            'size_bytes': size,
+        }
+
+    @contextmanager
+    def _writing(self):
+        """Hold the thread lock and the cross-process lock file, re-entrantly, starting from the on-disk manifest"""
+        with self._lock:
+            if self._lock_file is not None:
+                yield
+                return
+            with open(os.path.join(self.directory, 'lock'), 'a+b') as f:
+                _lock_exclusive(f)
+                self._lock_file = f
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    self._lock_file = None
+                    _unlock(f)
+
+    def _refresh(self):
+        """Reload the segment list and deletion masks if another process replaced the manifest"""
+        path = os.path.join(self.directory, 'manifest.json')
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return
+        key = (info.st_ino, info.st_mtime_ns, info.st_size)
+        if key == self._manifest_key:
+            return
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        loaded = {segment.name: segment for segment in self._segments}
+        segments = []
+        for name in manifest['segments']:
+            segment = loaded.get(name)
+            if segment is None:
+                segment = _Segment(os.path.join(self.directory, name))
+            else:
+                segment.reload_deleted()
+            segments.append(segment)
+        self._segments = segments
+        self._generation = max(self._generation, manifest['generation'])
+        self._retired = manifest.get('retired', [])
+        self._manifest_key = key
+
+    def _write_manifest(self):
+        """Replace the manifest, deleting retired segments whose grace period is over"""
+        cutoff = time.time() - RETIRED_SEGMENT_GRACE
+        expired = [name for name, retired_at in self._retired if retired_at < cutoff]
+        self._retired = [entry for entry in self._retired if entry[1] >= cutoff]
+        path = os.path.join(self.directory, 'manifest.json')
+        _replace_file(path, lambda f: f.write(json.dumps({
+            'version': 1, 'generation': self._generation,
+            'segments': [segment.name for segment in self._segments], 'retired': self._retired,
+        }).encode('utf-8')))
+        info = os.stat(path)
+        self._manifest_key = (info.st_ino, info.st_mtime_ns, info.st_size)
+        for name in expired:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _write_segment(self, arrays):
+        """Write segment arrays to a new directory and open it memory-mapped"""
+        self._generation += 1
+        path = os.path.join(self.directory, f'segment_{self._generation:06d}')
+        # A crash between writing a segment and the manifest leaves an unlisted directory behind
+        while os.path.exists(path):
+            self._generation += 1
+            path = os.path.join(self.directory, f'segment_{self._generation:06d}')
+        temp_path = f'{path}.tmp'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+        stored_lines = arrays.pop('stored_lines')
+        with open(os.path.join(temp_path, 'stored.jsonl'), 'wb') as f:
+            f.writelines(line + b'\n' for line in stored_lines)
+        line_lengths = np.fromiter((len(line) + 1 for line in stored_lines), dtype=np.int64,
+                                   count=len(stored_lines))
+        arrays['stored_offsets'] = np.concatenate([[0], np.cumsum(line_lengths)[:-1]]).astype(np.int64)
+        arrays['id_order'] = np.argsort(arrays['ids'], kind='stable').astype(np.int32)
+        arrays['deleted'] = np.zeros(len(arrays['ids']), dtype=bool)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_path, f'{name}.npy'), array)
+        os.rename(temp_path, path)
+        return _Segment(path)
+
+
+def _build_arrays(documents):
+    """Tokenize documents into sorted term, posting and length arrays"""
+    tokens, token_docs, token_weights = [], [], []
+    for local, document in enumerate(documents):
+        for field, weight in FIELD_WEIGHTS.items():
+            found = tokenize(document.get(field) or '')
+            tokens.extend(found)
+            token_docs.extend([local] * len(found))
+            token_weights.extend([weight] * len(found))
+
+    codes, terms = pd.factorize(pd.Series(tokens, dtype=object), sort=True)
+    token_docs = np.asarray(token_docs, dtype=np.int64)
+    token_weights = np.asarray(token_weights, dtype=np.float32)
+
+    # Sum weights per (term, doc); keys sort by term, then doc
+    keys = codes.astype(np.int64) * len(documents) + token_docs
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    tfs = np.bincount(inverse, weights=token_weights).astype(np.float32)
+    posting_terms, posting_docs = np.divmod(unique_keys, len(documents))
+
+    return {
+        'terms': np.asarray(terms, dtype=str),
+        'offsets': _offsets(posting_terms, len(terms)),
+        'docs': posting_docs.astype(np.int32),
+        'tfs': tfs,
+        'lengths': np.bincount(token_docs, weights=token_weights, minlength=len(documents)).astype(np.float32),
+        'ids': np.asarray([document['video_id'] for document in documents], dtype=str),
+        'stored_lines': [json.dumps({field: document.get(field, '') for field in STORED_FIELDS}).encode('utf-8')
+                         for document in documents],
+    }
+
+
+def _merge_arrays(segments):
+    """Combine segments' live documents into one set of segment arrays without re-tokenizing"""
+    vocabulary = np.unique(np.concatenate([np.asarray(segment.terms) for segment in segments]))
+    all_terms, all_docs, all_tfs = [], [], []
+    lengths, ids, stored_lines = [], [], []
+    base = 0
+    for segment in segments:
+        live = ~segment.deleted
+        new_local = np.cumsum(live) - 1 + base
+        posting_terms = np.repeat(np.searchsorted(vocabulary, segment.terms), np.diff(segment.offsets))
+        docs = np.asarray(segment.docs)
+        keep = live[docs]
+        all_terms.append(posting_terms[keep])
+        all_docs.append(new_local[docs[keep]])
+        all_tfs.append(np.asarray(segment.tfs)[keep])
+        lengths.append(np.asarray(segment.lengths)[live])
+        ids.append(np.asarray(segment.ids)[live])
+        stored_lines.extend(line for line, alive in zip(segment.stored_lines(), live) if alive)
+        base += int(live.sum())
+
+    # Within a segment postings are sorted by (term, doc) and doc ranges increase
+    # from segment to segment, so a stable sort by term keeps docs ascending
+    terms = np.concatenate(all_terms)
+    order = np.argsort(terms, kind='stable')
+    counts = np.bincount(terms, minlength=len(vocabulary))
+    used = counts > 0
+    return {
+        'terms': vocabulary[used],
+        'offsets': np.concatenate([[0], np.cumsum(counts[used])]).astype(np.int64),
+        'docs': np.concatenate(all_docs)[order].astype(np.int32),
+        'tfs': np.concatenate(all_tfs)[order],
+        'lengths': np.concatenate(lengths),
+        'ids': np.concatenate(ids),
+        'stored_lines': stored_lines,
+    }
+
+
+def _offsets(posting_terms, n_terms):
+    return np.concatenate([[0], np.cumsum(np.bincount(posting_terms, minlength=n_terms))]).astype(np.int64)
+
+
+def _load_array(directory, name):
+    return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+
+
+def _save_array(path, array):
+    """Atomically replace a .npy file"""
+    _replace_file(path, lambda f: np.save(f, array))
+
+
+def _replace_file(path, write):
+    """Atomically replace path with what write(f) writes, through a unique temporary file beside it"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _lock_exclusive(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
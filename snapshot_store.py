@@ -0,0 +1,116 @@
+"""
+Columnar Parquet store of timestamped channel and video snapshots
+"""
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_SNAPSHOT_DIR = os.path.join('.yt_cache', 'snapshots')
+
+CHANNEL_SCHEMA = pa.schema([
+    ('channel_id', pa.string()),
+    ('channel_title', pa.string()),
+    ('created_date', pa.string()),
+    ('description', pa.string()),
+    ('country', pa.string()),
+    ('subscribers', pa.int64()),
+    ('total_videos', pa.int64()),
+    ('total_views', pa.int64()),
+    ('playlist_id', pa.string()),
+    ('snapshot_at', pa.timestamp('us', tz='UTC')),
+    ('snapshot_date', pa.string()),
+])
+
+VIDEO_SCHEMA = pa.schema([
+    ('channel_id', pa.string()),
+    ('video_id', pa.string()),
+    ('title', pa.string()),
+    ('published_date', pa.string()),
+    ('views', pa.int64()),
+    ('likes', pa.int64()),
+    ('comments', pa.int64()),
+    ('duration', pa.string()),
+    ('snapshot_at', pa.timestamp('us', tz='UTC')),
+    ('snapshot_date', pa.string()),
+])
+
+PARTITION_COLS = ['snapshot_date', 'channel_id']
+PARTITIONING = ds.partitioning(
+    pa.schema([('snapshot_date', pa.string()), ('channel_id', pa.string())]),
+    flavor='hive'
+)
+
+
+class SnapshotStore:
+    """Append-only snapshots partitioned by snapshot_date and channel_id.
+
+    Each append writes new Parquet files, so earlier snapshots are never
+    rewritten. Reads prune partitions and row groups with the given filters
+    and only decode the requested columns.
+    """
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR):
+        self.root = root
+        self.channels_path = os.path.join(root, 'channels')
+        self.videos_path = os.path.join(root, 'videos')
+
+    def append_channels(self, channel_data, fetched_at=None):
+        """Append one snapshot of get_channel_stats output"""
+        self._append(self.channels_path, CHANNEL_SCHEMA, channel_data, fetched_at)
+
+    def append_videos(self, channel_id, videos, fetched_at=None):
+        """Append one snapshot of get_video_details output for a channel"""
+        rows = [dict(video, channel_id=channel_id) for video in videos]
+        self._append(self.videos_path, VIDEO_SCHEMA, rows, fetched_at)
+
+    def read_channels(self, columns=None, channel_ids=None, start=None, end=None):
+        """Load channel snapshots as a DataFrame, filtered by channel and date range"""
+        return self._read(self.channels_path, CHANNEL_SCHEMA, columns, channel_ids, start, end)
+
+    def read_videos(self, columns=None, channel_ids=None, start=None, end=None):
+        """Load video snapshots as a DataFrame, filtered by channel and date range"""
+        return self._read(self.videos_path, VIDEO_SCHEMA, columns, channel_ids, start, end)
+
+    def _append(self, path, schema, rows, fetched_at):
+        """Write rows stamped with the snapshot time into the partitioned dataset"""
+        if not rows:
+            return
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        stamp = {'snapshot_at': fetched_at, 'snapshot_date': fetched_at.strftime('%Y-%m-%d')}
+        table = pa.Table.from_pylist([dict(row, **stamp) for row in rows], schema=schema)
+        pq.write_to_dataset(
+            table,
+            root_path=path,
+            partition_cols=PARTITION_COLS,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet"
+        )
+
+    def _read(self, path, schema, columns, channel_ids, start, end):
+        """Scan a dataset with column projection and predicate pushdown"""
+        if not os.path.isdir(path):
+            return schema.empty_table().to_pandas()
+
+        dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+        filters = []
+        if channel_ids is not None:
+            filters.append(ds.field('channel_id').isin(list(channel_ids)))
+        if start is not None:
+            filters.append(ds.field('snapshot_date') >= _date_key(start))
+        if end is not None:
+            filters.append(ds.field('snapshot_date') <= _date_key(end))
+
+        expression = None
+        for condition in filters:
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def _date_key(value):
+    """Normalize a date, datetime or ISO string to the YYYY-MM-DD partition key"""
+    if isinstance(value, str):
+        return value[:10]
+    return value.strftime('%Y-%m-%d')
@@ -0,0 +1,168 @@
+"""
+Single-pass, mergeable summary statistics for channel and video DataFrames
+"""
+import numpy as np
+
+
+class SummaryAccumulator:
+    """Running totals, maxima and medians over the rows seen so far
+
+    Subclasses name the columns to reduce. update() folds in a DataFrame
+    with one NumPy reduction per column and aggregate, merge() combines two
+    accumulators as if their rows had been concatenated in order, and the
+    finished values match the pandas reductions they replace: integer sums
+    are kept exactly, while float columns and medians keep their values so
+    they are reduced in the same order pandas would.
+    """
+    totals = ()
+    medians = ()
+    maxima = ()
+
+    def __init__(self):
+        self.count = 0
+        self._sums = {}
+        self._values = {}
+        self._best = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls().update(df)
+
+    def update(self, df):
+        """Fold the rows of a DataFrame into the running statistics"""
+        if len(df) == 0:
+            return self
+        self.count += len(df)
+
+        kept = set()
+        for col in self.totals:
+            values = df[col].to_numpy()
+            if values.dtype.kind in 'iu':
+                self._add_sum(col, values.sum())
+            else:
+                self._add_values(col, values)
+                kept.add(col)
+        for col in self.medians:
+            if col not in kept:
+                self._add_values(col, df[col].to_numpy())
+
+        for value_col, label_col in self.maxima:
+            values = df[value_col].to_numpy()
+            if values.dtype.kind == 'f':
+                values = np.where(np.isnan(values), -np.inf, values)
+            position = int(values.argmax())
+            self._add_best(value_col, values[position], df[label_col].iloc[position])
+        return self
+
+    def merge(self, other):
+        """Fold in another accumulator whose rows come after this one's"""
+        self.count += other.count
+        for col, total in other._sums.items():
+            self._add_sum(col, total)
+        for col, chunks in other._values.items():
+            self._values.setdefault(col, []).extend(chunks)
+        for col, (value, label) in other._best.items():
+            self._add_best(col, value, label)
+        return self
+
+    def total(self, col):
+        if col in self._sums:
+            return self._sums[col]
+        if col in self._values:
+            return self._column(col).sum()
+        return np.int64(0)
+
+    def mean(self, col):
+        if self.count == 0:
+            return np.float64('nan')
+        total = self.total(col)
+        if total.dtype.kind == 'f':
+            return total / total.dtype.type(self.count)
+        return np.float64(total) / self.count
+
+    def median(self, col):
+        if self.count == 0:
+            return np.float64('nan')
+        return np.median(self._column(col).astype('float64', copy=False))
+
+    def argmax_label(self, col, default='N/A'):
+        """Label of the first row holding the column maximum"""
+        return self._best[col][1] if col in self._best else default
+
+    def _column(self, col):
+        chunks = self._values[col]
+        if len(chunks) > 1:
+            self._values[col] = [np.concatenate(chunks)]
+        return self._values[col][0]
+
+    def _add_sum(self, col, total):
+        self._sums[col] = self._sums[col] + total if col in self._sums else total
+
+    def _add_values(self, col, values):
+        self._values.setdefault(col, []).append(values)
+
+    def _add_best(self, col, value, label):
+        # Strictly greater keeps the earliest row on ties, like idxmax
+        if col not in self._best or value > self._best[col][0]:
+            self._best[col] = (value, label)
+
+
+class ChannelSummary(SummaryAccumulator):
+    """Accumulator behind get_channel_summary_stats"""
+    totals = ('subscribers', 'total_videos', 'total_views')
+    medians = ('subscribers',)
+    maxima = (('subscribers', 'channel_title'),)
+
+    def result(self):
+        return {
+            'total_channels': self.count,
+            'total_subscribers': self.total('subscribers'),
+            'total_videos': self.total('total_videos'),
+            'total_views': self.total('total_views'),
+            'avg_subscribers': self.mean('subscribers'),
+            'avg_videos_per_channel': self.mean('total_videos'),
+            'avg_views_per_channel': self.mean('total_views'),
+            'median_subscribers': self.median('subscribers'),
+            'top_channel': self.argmax_label('subscribers')
+        }
+
+
+class VideoSummary(SummaryAccumulator):
+    """Accumulator behind get_video_summary_stats"""
+    totals = ('views', 'likes', 'comments', 'engagement_rate')
+    medians = ('views',)
+    maxima = (('views', 'title'), ('engagement_rate', 'title'))
+
+    def result(self):
+        if self.count == 0:
+            return {
+                'total_videos': 0,
+                'total_views': 0,
+                'total_likes': 0,
+                'total_comments': 0,
+                'avg_views': 0,
+                'avg_engagement_rate': 0,
+                'most_viewed_video': 'N/A'
+            }
+
+        return {
+            'total_videos': self.count,
+            'total_views': int(self.total('views')),
+            'total_likes': int(self.total('likes')),
+            'total_comments': int(self.total('comments')),
+            'avg_views': int(self.mean('views')),
+            'avg_engagement_rate': float(self.mean('engagement_rate')),
+            'most_viewed_video': self.argmax_label('views'),
+            'avg_likes': int(self.mean('likes')),
+            'avg_comments': int(self.mean('comments')),
+            'median_views': int(self.median('views')),
+            'top_engagement_video': self.argmax_label('engagement_rate')
+        }
+
+
+def summarize_by(df, key, accumulator=VideoSummary):
+    """Build one accumulator per group, e.g. per channel, for later merging"""
+    return {
+        name: accumulator.from_frame(group)
+        for name, group in df.groupby(key, sort=False, observed=True)
+    }
@@ -1,17 +1,28 @@
 """
 Individual tab controller functions - Simplified for public data
 """
+import time
 import streamlit as st
 import pandas as pd
+from quota import QuotaExceededError
+from youtube import PartialFetchError
+from crawler import crawl_channels
+from summary_stats import VideoSummary, summarize_by
+from transcripts import YouTubeTranscriptSource, fetch_transcripts, transcript_text
+from search_index import video_documents
 from data_processor import (
     load_predefined_channels, 
     process_channel_data, 
     get_channel_summary_stats,
-    process_video_data,
-    get_video_summary_stats
+    process_video_stream,
+    get_format_breakdown,
+    compact_dataframe,
+    memory_report
 )
 from ui_components import (
     display_channel_search_results, 
+    display_channel_search_table, 
+    clear_channel_selection,
     display_metrics_cards, 
     display_top_channels_table,
     display_video_metrics_cards
@@ -20,10 +31,27 @@ from visualizations import (
     create_channel_comparison_chart, 
     create_video_performance_chart, 
     create_correlation_heatmap,
-    create_engagement_trends_chart
+    create_engagement_trends_chart,
+    create_channel_history_chart,
+    create_cross_channel_video_chart
 )
 
-def handle_channel_search_tab(yt_analytics):
+# Parallel channels().list chunks when analyzing large watchlists
+CHANNEL_FETCH_WORKERS = 8
+
+# Upper bound on concurrent page fetches during a multi-channel crawl
+CRAWL_MAX_IN_FLIGHT = 8
+
+# Transcripts fetched at once; higher values risk YouTube throttling the host
+TRANSCRIPT_WORKERS = 8
+
+# Hits shown for a full-text video search
+SEARCH_RESULT_LIMIT = 25
+
+# Latest batches shown in the video table while a fetch streams in; the full table follows at the end
+STREAM_TABLE_BATCHES = 4
+
+def handle_channel_search_tab(yt_analytics, snapshot_store=None, registry=None):
     """Handle Channel Search tab functionality"""
     st.header("🔍 Find Data Science Channels")
     
@@ -32,6 +60,8 @@ def handle_channel_search_tab(yt_analytics):
     with col1:
         search_query = st.text_input("Search for channels", 
                                    placeholder="e.g., python programming, machine learning, data science")
+        force_search = st.checkbox("Always search YouTube",
+                                   help="Skip the local channel registry; a search costs 100 quota units")
     
     with col2:
         max_results = st.selectbox("Max Results", [10, 20, 30, 50], index=1)
@@ -41,49 +71,77 @@ def handle_channel_search_tab(yt_analytics):
     with col1:
         if st.button("🔍 Search Channels", type="primary"):
             if search_query:
+                curated_ids, local_ids = ([], []) if force_search else find_local_channels(registry, search_query)
                 with st.spinner("Searching for channels..."):
-                    channels = yt_analytics.search_channels(search_query, max_results)
+                    try:
+                        if curated_ids:
+                            channels = yt_analytics.get_channel_snippets(curated_ids)
+                        else:
+                            channels = search_channels_with(yt_analytics, search_query, max_results, local_ids)
+                    except Exception as e:
+                        st.error(f"Error searching channels: {str(e)}")
+                        channels = []
                     if channels:
+                        remember_channels(registry, channels)
                         st.session_state.searched_channels = channels
+                        clear_channel_selection()
                         st.success(f"Found {len(channels)} channels!")
+                        if curated_ids:
+                            st.caption("Resolved from the predefined channels - "
+                                       "skipped the 100-unit YouTube search")
     
     with col2:
         if st.button("📊 Load Predefined DS/ML Channels"):
             with st.spinner("Loading predefined channels..."):
                 channel_ids = load_predefined_channels()
-                channel_data = yt_analytics.get_channel_stats(channel_ids)
+                channel_data = fetch_channel_stats(
+                    yt_analytics, channel_ids, max_workers=CHANNEL_FETCH_WORKERS
+                )
                 if channel_data:
                     st.session_state.channel_data = channel_data
+                    record_channel_snapshot(snapshot_store, channel_data)
                     st.success(f"Loaded {len(channel_data)} channels!")
     
     # Handle search results
     if 'searched_channels' in st.session_state:
-        selected_channels, selection_type = display_channel_search_results(
-            st.session_state.searched_channels
-        )
+        if st.toggle("Compact results table", value=True,
+                     help="One selectable table instead of a row of widgets per channel"):
+            selected_channels, selection_type = display_channel_search_table(
+                st.session_state.searched_channels
+            )
+        else:
+            selected_channels, selection_type = display_channel_search_results(
+                st.session_state.searched_channels
+            )
         
         if selection_type == 'single':
             with st.spinner("Getting channel stats..."):
-                channel_stats = yt_analytics.get_channel_stats(selected_channels)
+                channel_stats = fetch_channel_stats(yt_analytics, selected_channels)
                 if channel_stats:
                     st.session_state.current_channel = channel_stats[0]
                     st.session_state.channel_data = channel_stats
+                    record_channel_snapshot(snapshot_store, channel_stats)
                     st.success("✅ Channel analyzed! Check Analytics Dashboard.")
         
         elif selection_type == 'multiple' and st.button("Analyze Selected Channels"):
             if selected_channels:
                 with st.spinner("Analyzing selected channels..."):
-                    channel_data = yt_analytics.get_channel_stats(selected_channels)
+                    channel_data = fetch_channel_stats(
+                        yt_analytics, selected_channels, max_workers=CHANNEL_FETCH_WORKERS
+                    )
                     if channel_data:
                         st.session_state.channel_data = channel_data
+                        record_channel_snapshot(snapshot_store, channel_data)
                         st.success(f"✅ Analyzed {len(channel_data)} channels!")
 
-def handle_analytics_dashboard_tab():
+def handle_analytics_dashboard_tab(snapshot_store=None):
     """Handle Analytics Dashboard tab functionality"""
     st.header("📊 Channel Analytics Dashboard")
     
     if 'channel_data' in st.session_state and st.session_state.channel_data:
-        df = process_channel_data(st.session_state.channel_data)
+        df = process_channel_data(
+            st.session_state.channel_data, compact=st.session_state.get('compact_mode', False)
+        )
         stats = get_channel_summary_stats(df)
         
         is_single_channel = len(df) == 1
@@ -115,8 +173,17 @@ def handle_analytics_dashboard_tab():
             st.subheader("🔗 Correlation Analysis")
             st.plotly_chart(create_correlation_heatmap(df), use_container_width=True)
         
+        if snapshot_store is not None:
+            history = snapshot_store.read_channels(
+                columns=['channel_title', 'subscribers', 'total_views', 'snapshot_at'],
+                channel_ids=df['channel_id'].tolist()
+            )
+            if history['snapshot_at'].nunique() > 1:
+                st.subheader("🕒 Growth Over Time")
+                st.plotly_chart(create_channel_history_chart(history), use_container_width=True)
+        
         if st.button("🔄 Clear Current Analysis"):
-            for key in ['channel_data', 'current_channel', 'current_videos']:
+            for key in ['channel_data', 'current_channel', 'current_videos', 'current_transcripts']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
@@ -124,7 +191,8 @@ def handle_analytics_dashboard_tab():
     else:
         st.info("👆 Please search for channels or load predefined channels in the Channel Search tab.")
 
-def handle_video_analysis_tab(yt_analytics):
+def handle_video_analysis_tab(yt_analytics, video_store=None, snapshot_store=None, transcript_store=None,
+                              search_index=None):
     """Handle Video Analysis tab functionality"""
     st.header("🎥 Video Analysis")
     
@@ -146,45 +214,325 @@ def handle_video_analysis_tab(yt_analytics):
                 st.write(f"**Subscribers:** {channel_info['subscribers']:,}")
             
             with col2:
-                num_videos = st.slider("Number of videos to analyze", 10, 100, 50)
+                # Upper bound follows the channel's catalog so full back catalogs can be pulled
+                max_videos = max(int(channel_info['total_videos']), 100)
+                num_videos = st.slider("Number of videos to analyze", 10, max_videos, 50, step=10)
+            
+            incremental = video_store is not None and st.checkbox(
+                "⚡ Incremental sync",
+                value=True,
+                help="Only fetch uploads newer than the locally stored ones and refresh recent stats"
+            )
             
             if st.button("📹 Analyze Videos"):
-                with st.spinner("Fetching video data..."):
-                    videos = yt_analytics.get_video_details(
-                        channel_info['playlist_id'], num_videos
+                if incremental:
+                    try:
+                        with st.spinner("Syncing new uploads..."):
+                            videos = yt_analytics.sync_video_details(
+                                channel_info['playlist_id'], video_store, num_videos
+                            )
+                    except Exception as e:
+                        st.error(f"Error syncing videos: {str(e)}")
+                        videos = []
+                    video_batches = [videos]
+                else:
+                    video_batches = yt_analytics.iter_video_details(
+                        channel_info['playlist_id'], num_videos, pipelined=True
                     )
-                    
-                    if videos:
-                        video_df = process_video_data(videos)
-                        st.session_state.current_videos = video_df
-                        
-                        video_stats = get_video_summary_stats(video_df)
-                        display_video_metrics_cards(video_stats)
-                        
-                        st.plotly_chart(
-                            create_video_performance_chart(video_df, selected_channel), 
-                            use_container_width=True
-                        )
-                        
-                        st.subheader("📈 Engagement Trends Over Time")
-                        st.plotly_chart(
-                            create_engagement_trends_chart(video_df),
-                            use_container_width=True
-                        )
-                        
-                        st.subheader("📊 Video Performance Data")
-                        display_df = video_df[['title', 'views', 'likes', 'comments', 'engagement_rate', 'published_date']].copy()
-                        display_df['published_date'] = pd.to_datetime(display_df['published_date']).dt.date
-                        display_df['engagement_rate'] = display_df['engagement_rate'].round(2)
-                        st.dataframe(display_df, use_container_width=True)
-                        
-                        csv = display_df.to_csv(index=False)
-                        st.download_button(
-                            label="💾 Download Video Data (CSV)",
-                            data=csv,
-                            file_name=f"{selected_channel}_video_data.csv",
-                            mime="text/csv"
-                        )
+                fetched = []
+                render_video_analysis(
+                    collect_batches(video_batches, fetched), selected_channel, num_videos
+                )
+                if snapshot_store is not None and fetched:
+                    snapshot_store.append_videos(channel_info['channel_id'], fetched)
+                if search_index is not None and fetched:
+                    index_videos(search_index, video_documents(fetched, transcript_store, selected_channel))
+                    st.session_state.current_videos_channel = selected_channel
+            
+            current_videos = st.session_state.get('current_videos')
+            if transcript_store is not None and current_videos is not None and not current_videos.empty:
+                render_transcripts(current_videos, transcript_store, search_index)
     
     else:
         st.info("👆 Please analyze channels first in the Channel Search or Analytics Dashboard tab.")
+    
+    st.divider()
+    render_bulk_crawl(yt_analytics, search_index, transcript_store)
+    
+    if search_index is not None:
+        st.divider()
+        render_video_search(search_index)
+
+def render_bulk_crawl(yt_analytics, search_index=None, transcript_store=None):
+    """Crawl uploads of every analyzed or predefined channel into one DataFrame"""
+    st.subheader("🌐 Multi-Channel Video Crawl")
+    
+    sources = ["Predefined DS/ML channels"]
+    if st.session_state.get('channel_data'):
+        sources.insert(0, "Analyzed channels")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        source = st.radio("Channels to crawl", sources, horizontal=True)
+    with col2:
+        videos_per_channel = st.slider("Videos per channel", 10, 500, 50, step=10)
+    
+    if st.button("🌐 Crawl All Channels"):
+        if source == "Analyzed channels":
+            channels = st.session_state.channel_data
+        else:
+            with st.spinner("Loading predefined channels..."):
+                channels = fetch_channel_stats(
+                    yt_analytics, load_predefined_channels(), max_workers=CHANNEL_FETCH_WORKERS
+                )
+        
+        overall = st.progress(0.0, text=f"Crawling {len(channels)} channels...")
+        progress_table = st.empty()
+        
+        def show_progress(progress):
+            fetched = sum(done for done, _ in progress.values())
+            target = sum(total for _, total in progress.values())
+            overall.progress(min(fetched / max(target, 1), 1.0),
+                             text=f"Fetched {fetched:,} of ~{target:,} videos")
+            progress_table.dataframe(
+                pd.DataFrame(
+                    [(title, done, total) for title, (done, total) in progress.items()],
+                    columns=['channel_title', 'fetched', 'target']
+                ),
+                use_container_width=True
+            )
+        
+        video_df, errors = crawl_channels(
+            yt_analytics, channels, videos_per_channel,
+            max_in_flight=CRAWL_MAX_IN_FLIGHT, on_progress=show_progress,
+            compact=st.session_state.get('compact_mode', False)
+        )
+        overall.empty()
+        progress_table.empty()
+        for title, error in errors.items():
+            st.error(f"Error crawling {title}: {error}")
+        if search_index is not None and not video_df.empty:
+            index_videos(search_index, video_documents(video_df, transcript_store))
+        st.session_state.multi_channel_videos = video_df
+    
+    video_df = st.session_state.get('multi_channel_videos')
+    if video_df is not None and not video_df.empty:
+        st.success(
+            f"✅ {len(video_df):,} videos from {video_df['channel_title'].nunique()} channels"
+        )
+        channel_summaries = summarize_by(video_df, 'channel_title')
+        overall_summary = VideoSummary()
+        for summary in channel_summaries.values():
+            overall_summary.merge(summary)
+        display_video_metrics_cards(overall_summary.result())
+        with st.expander("📋 Per-Channel Summary"):
+            st.dataframe(
+                pd.DataFrame.from_dict(
+                    {title: summary.result() for title, summary in channel_summaries.items()},
+                    orient='index'
+                ),
+                use_container_width=True
+            )
+        st.plotly_chart(create_cross_channel_video_chart(video_df), use_container_width=True)
+        st.download_button(
+            label="💾 Download All Channel Videos (CSV)",
+            data=video_df.to_csv(index=False),
+            file_name="multi_channel_video_data.csv",
+            mime="text/csv"
+        )
+
+def render_transcripts(video_df, transcript_store, search_index=None):
+    """Fetch transcripts of the analyzed videos concurrently, reusing cached ones"""
+    st.subheader("📝 Transcripts")
+    if st.button(f"📝 Fetch Transcripts ({len(video_df):,} videos)"):
+        try:
+            source = YouTubeTranscriptSource()
+        except ImportError:
+            st.error("Transcript fetching needs the youtube-transcript-api package.")
+            return
+        
+        titles = dict(zip(video_df['video_id'], video_df['title']))
+        progress = st.progress(0.0, text="Fetching transcripts...")
+        rows = []
+        for result in fetch_transcripts(titles, source, transcript_store, max_workers=TRANSCRIPT_WORKERS):
+            text = transcript_text(result.segments)
+            rows.append({
+                'video_id': result.video_id,
+                'title': titles[result.video_id],
+                'status': result.status,
+                'words': len(text.split()),
+                'transcript': text if result.segments else str(result.error or ''),
+            })
+            progress.progress(len(rows) / len(titles), text=f"{len(rows):,} of {len(titles):,} transcripts")
+        progress.empty()
+        st.session_state.current_transcripts = pd.DataFrame(rows)
+        if search_index is not None:
+            index_videos(search_index, video_documents(
+                video_df, transcript_store, st.session_state.get('current_videos_channel')
+            ))
+    
+    transcript_df = st.session_state.get('current_transcripts')
+    if transcript_df is not None and not transcript_df.empty:
+        counts = transcript_df['status'].value_counts()
+        st.caption(" · ".join(f"{status}: {count:,}" for status, count in counts.items()))
+        st.dataframe(transcript_df[['title', 'status', 'words']], use_container_width=True)
+        st.download_button(
+            label="💾 Download Transcripts (CSV)",
+            data=transcript_df.to_csv(index=False),
+            file_name="video_transcripts.csv",
+            mime="text/csv"
+        )
+
+def render_video_search(search_index):
+    """Full-text search over every indexed video's title, description and transcript"""
+    st.subheader("🔎 Search Indexed Videos")
+    query = st.text_input("Search titles, descriptions and transcripts",
+                          placeholder="e.g., transformers, pandas groupby")
+    if query:
+        start = time.perf_counter()
+        hits = search_index.search(query, limit=SEARCH_RESULT_LIMIT)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"{len(hits)} best matches among {len(search_index):,} indexed videos "
+                   f"in {elapsed_ms:.1f} ms")
+        if hits:
+            st.dataframe(pd.DataFrame(hits)[['title', 'channel_title', 'score', 'video_id']],
+                         use_container_width=True)
+
+def render_video_analysis(video_batches, channel_name, expected_videos):
+    """Render video metrics and table progressively as batches arrive, then the charts"""
+    progress = st.progress(0.0, text="Fetching video data...")
+    metrics_slot = st.empty()
+    performance_slot = st.empty()
+    trends_slot = st.empty()
+    st.subheader("📊 Video Performance Data")
+    table_slot = st.empty()
+    
+    # Frames are concatenated once at the end; each batch only redraws a bounded tail of the table
+    frames = []
+    fetched = 0
+    summary = VideoSummary()
+    try:
+        for batch_df in process_video_stream(video_batches):
+            frames.append(batch_df)
+            fetched += len(batch_df)
+            
+            with metrics_slot.container():
+                display_video_metrics_cards(summary.update(batch_df).result())
+            recent_df = pd.concat(frames[-STREAM_TABLE_BATCHES:], ignore_index=True)
+            table_slot.dataframe(build_video_table(recent_df), use_container_width=True)
+            progress.progress(
+                min(fetched / max(expected_videos, 1), 1.0),
+                text=f"Fetched {fetched:,} videos..."
+            )
+    except QuotaExceededError as e:
+        st.warning(f"⚠️ Stopped early: {e}")
+    except Exception as e:
+        st.error(f"Error fetching videos: {str(e)}")
+    progress.empty()
+    
+    video_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if video_df.empty:
+        st.warning("No videos found for this channel.")
+        return
+    table_slot.dataframe(build_video_table(video_df), use_container_width=True)
+    
+    if st.session_state.get('compact_mode', False):
+        with st.expander("🧮 Memory Report"):
+            st.dataframe(memory_report(video_df), use_container_width=True)
+        video_df = compact_dataframe(video_df)
+    st.session_state.current_videos = video_df
+    st.session_state.pop('current_transcripts', None)
+    
+    performance_slot.plotly_chart(
+        create_video_performance_chart(video_df, channel_name), 
+        use_container_width=True
+    )
+    
+    with trends_slot.container():
+        st.subheader("📈 Engagement Trends Over Time")
+        st.plotly_chart(
+            create_engagement_trends_chart(video_df),
+            use_container_width=True
+        )
+    
+    st.subheader("⏱️ Shorts vs Long-form")
+    st.dataframe(get_format_breakdown(video_df), use_container_width=True)
+    
+    csv = build_video_table(video_df).to_csv(index=False)
+    st.download_button(
+        label="💾 Download Video Data (CSV)",
+        data=csv,
+        file_name=f"{channel_name}_video_data.csv",
+        mime="text/csv"
+    )
+
+def fetch_channel_stats(yt_analytics, channel_ids, **kwargs):
+    """Fetch channel stats, showing failed chunks as errors while keeping the rest"""
+    try:
+        return yt_analytics.get_channel_stats(channel_ids, **kwargs)
+    except PartialFetchError as e:
+        for label, error in e.errors.items():
+            st.error(f"Error fetching {label}: {error}")
+        return e.results
+    except Exception as e:
+        st.error(f"Error fetching channel stats: {str(e)}")
+        return []
+
+def index_videos(search_index, documents):
+    """Add documents to the search index, warning instead of failing the page if the index can't be written"""
+    try:
+        search_index.add(documents)
+    except OSError as e:
+        st.warning(f"⚠️ Videos were not added to the search index: {e}")
+
+def find_local_channels(registry, query):
+    """Return (IDs that replace the YouTube search, IDs to list alongside it) for a query
+
+    Only a predefined channel named exactly by the query skips the search.
+    Other registry channels are learned from earlier results, so one
+    titled 'Python' would otherwise hide every other Python channel; an
+    exact hit on those is listed first with the search results instead.
+    Prefix and fuzzy matches are not used at all.
+    """
+    if registry is None:
+        return [], []
+    channel_id = registry.resolve(query)
+    if channel_id is None:
+        return [], []
+    if channel_id in load_predefined_channels():
+        return [channel_id], []
+    return [], [channel_id]
+
+def search_channels_with(yt_analytics, query, max_results, local_ids):
+    """Search YouTube for channels, listing the given registry channels first"""
+    channels = yt_analytics.search_channels(query, max_results)
+    if not local_ids:
+        return channels
+    local = yt_analytics.get_channel_snippets(local_ids)
+    return local + [channel for channel in channels if channel['channel_id'] not in local_ids]
+
+def remember_channels(registry, channels):
+    """Add search results to the channel registry and persist it when anything changed"""
+    if registry is not None and registry.update((c['title'], c['channel_id']) for c in channels):
+        registry.save()
+
+def record_channel_snapshot(snapshot_store, channel_data):
+    """Append fetched channel stats to the snapshot store, if one is configured"""
+    if snapshot_store is not None and channel_data:
+        snapshot_store.append_channels(channel_data)
+
+def collect_batches(video_batches, sink):
+    """Pass video batches through unchanged while keeping a copy of every video"""
+    for batch in video_batches:
+        sink.extend(batch)
+        yield batch
+
+def build_video_table(video_df):
+    """Select and format the video columns shown in the data table"""
+    display_df = video_df[['title', 'views', 'likes', 'comments', 'engagement_rate', 'published_date',
+                           'format', 'duration_minutes', 'views_per_minute']].copy()
+    display_df['published_date'] = pd.to_datetime(display_df['published_date']).dt.date
+    display_df['engagement_rate'] = display_df['engagement_rate'].round(2)
+    display_df['duration_minutes'] = display_df['duration_minutes'].round(1)
+    display_df['views_per_minute'] = display_df['views_per_minute'].round(1)
+    return display_df
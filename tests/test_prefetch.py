@@ -0,0 +1,85 @@
+"""
+Regression tests for the pipelined playlist prefetch in YouTubeAnalytics
+"""
+import gc
+import threading
+import time
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from fake_youtube import FakeYouTubeServer, SyntheticFixtures
+from youtube import YouTubeAnalytics
+
+
+class FailingVideos(SyntheticFixtures):
+    """Serves playlist pages normally but fails every videos().list call after a delay
+
+    The delay lets the prefetch thread fill its buffer and reach the end of
+    the playlist before the consumer fails, which is when it used to hang.
+    """
+
+    def respond(self, resource, params):
+        if resource == 'videos':
+            time.sleep(0.3)
+            return 500, {'error': {'code': 500, 'message': 'boom', 'errors': [{'reason': 'backendError'}]}}
+        return super().respond(resource, params)
+
+
+def run_with_timeout(fn, seconds=10):
+    """Run fn on a daemon thread; fail the test if it, or collecting what it left behind, hangs
+
+    Only the exception type is kept, so its traceback (and any generator it
+    holds open) is released and finalized on that thread.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = fn()
+        except Exception as e:
+            outcome['error'] = type(e)
+        gc.collect()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), 'call did not return'
+    return outcome
+
+
+def make_client(server):
+    from quota import QuotaScheduler
+    return YouTubeAnalytics('test-key', scheduler=QuotaScheduler(max_retries=0), api_endpoint=server.endpoint)
+
+
+def test_error_mid_stream_does_not_hang():
+    with FakeYouTubeServer(FailingVideos(n_channels=1, videos_per_channel=150)) as server:
+        yt_analytics = make_client(server)
+        outcome = run_with_timeout(
+            lambda: yt_analytics.get_video_details('UU' + '0' * 22, 150, pipelined=True)
+        )
+    assert outcome.get('error') is HttpError
+
+
+def test_closing_early_does_not_hang():
+    with FakeYouTubeServer(SyntheticFixtures(n_channels=1, videos_per_channel=300)) as server:
+        yt_analytics = make_client(server)
+
+        def first_page_only():
+            pages = yt_analytics.iter_video_columns('UU' + '0' * 22, 300, pipelined=True)
+            first = next(pages)
+            pages.close()
+            return first
+
+        outcome = run_with_timeout(first_page_only)
+    assert len(outcome['result']['video_id']) == 50
+
+
+@pytest.mark.parametrize('max_results', [49, 150])
+def test_pipelined_matches_sequential(max_results):
+    with FakeYouTubeServer(SyntheticFixtures(n_channels=1, videos_per_channel=200)) as server:
+        yt_analytics = make_client(server)
+        playlist_id = 'UU' + '0' * 22
+        assert (yt_analytics.get_video_details(playlist_id, max_results, pipelined=True)
+                == yt_analytics.get_video_details(playlist_id, max_results))
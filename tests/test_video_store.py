@@ -0,0 +1,64 @@
+"""
+Tests for incremental syncs through VideoStore and what they hand to the search index
+"""
+import sqlite3
+
+from fake_youtube import FakeYouTubeServer, SyntheticFixtures
+from quota import QuotaScheduler
+from search_index import SearchIndex, tokenize, video_documents
+from video_store import VideoStore
+from youtube import YouTubeAnalytics
+
+PLAYLIST_ID = 'UU' + '0' * 22
+
+
+def sync(tmp_path, max_results=60):
+    with FakeYouTubeServer(SyntheticFixtures(n_channels=1, videos_per_channel=100)) as server:
+        yt_analytics = YouTubeAnalytics('test-key', scheduler=QuotaScheduler(max_retries=0),
+                                        api_endpoint=server.endpoint)
+        store = VideoStore(str(tmp_path / 'videos.sqlite3'))
+        synced = yt_analytics.sync_video_details(PLAYLIST_ID, store, max_results)
+        fetched = yt_analytics.get_video_details(PLAYLIST_ID, max_results)
+    return synced, fetched
+
+
+def test_synced_videos_keep_descriptions(tmp_path):
+    synced, fetched = sync(tmp_path)
+    assert sorted(synced[0]) == sorted(fetched[0])
+    by_id = {video['video_id']: video['description'] for video in fetched}
+    assert all(video['description'] and video['description'] == by_id[video['video_id']] for video in synced)
+
+
+def test_synced_description_reaches_the_index(tmp_path):
+    synced, _ = sync(tmp_path)
+    index = SearchIndex(str(tmp_path / 'index'))
+    index.add(video_documents(synced, channel_title='Synthetic'))
+
+    video = synced[0]
+    # Titles are 'Video <id>', so a description word can only match through the description
+    word = next(token for token in tokenize(video['description']) if token not in tokenize(video['title']))
+    hits = index.search(word, limit=len(synced))
+    assert video['video_id'] in {hit['video_id'] for hit in hits}
+
+
+def test_store_without_description_column_is_migrated(tmp_path):
+    path = str(tmp_path / 'videos.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE videos (
+            playlist_id TEXT NOT NULL, video_id TEXT NOT NULL, title TEXT, published_date TEXT,
+            views INTEGER, likes INTEGER, comments INTEGER, duration TEXT, synced_at REAL NOT NULL,
+            PRIMARY KEY (playlist_id, video_id)
+        )
+    """)
+    conn.execute("INSERT INTO videos VALUES ('PL', 'old', 'Old', '2024-01-01T00:00:00Z', 1, 0, 0, 'PT1M', 0)")
+    conn.commit()
+    conn.close()
+
+    store = VideoStore(path)
+    store.upsert('PL', [{'video_id': 'new', 'title': 'New', 'description': 'About pandas',
+                         'published_date': '2025-01-01T00:00:00Z', 'views': 2, 'likes': 1, 'comments': 0,
+                         'duration': 'PT2M'}])
+    assert [(video['video_id'], video['description']) for video in store.load('PL')] == [
+        ('new', 'About pandas'), ('old', '')
+    ]
@@ -0,0 +1,155 @@
+"""
+Concurrent transcript fetching with a compressed on-disk cache
+"""
+import gzip
+import json
+import os
+import tempfile
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_TRANSCRIPT_DIR = os.path.join('.yt_cache', 'transcripts')
+
+# status is fetched, cached, unavailable (no transcript, remembered like a cached one) or error
+TranscriptResult = namedtuple('TranscriptResult', ['video_id', 'segments', 'status', 'error'])
+
+
+class TranscriptUnavailable(Exception):
+    """The video has no transcript in any of the requested languages"""
+
+
+class YouTubeTranscriptSource:
+    """Fetch a video's transcript segments with youtube-transcript-api
+
+    The library is imported when the source is created rather than with
+    this module, so the cache and the stub source work without it.
+    """
+
+    def __init__(self, languages=('en',)):
+        from youtube_transcript_api import (
+            NoTranscriptFound, TranscriptsDisabled, VideoUnavailable, YouTubeTranscriptApi
+        )
+        self.languages = list(languages)
+        self._api = YouTubeTranscriptApi
+        self._unavailable = (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable)
+
+    def __call__(self, video_id):
+        try:
+            return self._api.get_transcript(video_id, languages=self.languages)
+        except self._unavailable as e:
+            raise TranscriptUnavailable(str(e)) from e
+
+
+class TranscriptStore:
+    """Gzipped JSON transcript per video, sharded into subdirectories by ID prefix"""
+
+    def __init__(self, directory=DEFAULT_TRANSCRIPT_DIR, compresslevel=6):
+        self.directory = directory
+        self.compresslevel = compresslevel
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, video_id):
+        return os.path.join(self.directory, video_id[:2], f'{video_id}.json.gz')
+
+    def __contains__(self, video_id):
+        return os.path.exists(self.path_for(video_id))
+
+    def get(self, video_id):
+        """Return the stored {'video_id', 'available', 'segments', 'fetched_at'} dict, or None"""
+        try:
+            with gzip.open(self.path_for(video_id), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, video_id, segments, available=True):
+        """Atomically store a transcript; available=False remembers that a video has none"""
+        path = self.path_for(video_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {'video_id': video_id, 'available': available, 'segments': segments,
+                 'fetched_at': time.time()}
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+                                         suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, \
+                    gzip.open(raw, 'wt', encoding='utf-8', compresslevel=self.compresslevel) as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def stats(self):
+        """Return the number of stored transcripts and their compressed size"""
+        files = size = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.json.gz'):
+                    files += 1
+                    size += os.path.getsize(os.path.join(root, name))
+        return {'transcripts': files, 'size_bytes': size}
+
+
+def transcript_text(segments):
+    """Join transcript segments into plain text"""
+    return ' '.join(segment['text'] for segment in segments or [])
+
+
+def fetch_transcripts(video_ids, source=None, store=None, max_workers=8, refresh=False,
+                      include_cached=True):
+    """Yield a TranscriptResult per video as soon as it is available
+
+    Videos already in the store, including ones recorded as having no
+    transcript, are yielded first without calling source (or skipped when
+    include_cached is False) unless refresh is set. The rest are fetched
+    with at most max_workers in flight, each stored before it is yielded,
+    and come back in completion order. Errors are yielded rather than
+    raised and are not stored, so the next run retries them. Closing the
+    generator early stops new fetches from being started.
+    """
+    source = source if source is not None else YouTubeTranscriptSource()
+    store = store if store is not None else TranscriptStore()
+
+    pending = deque()
+    for video_id in dict.fromkeys(video_ids):
+        if refresh:
+            pending.append(video_id)
+        elif not include_cached:
+            if video_id not in store:
+                pending.append(video_id)
+        else:
+            entry = store.get(video_id)
+            if entry is None:
+                pending.append(video_id)
+            else:
+                yield TranscriptResult(video_id, entry['segments'],
+                                       'cached' if entry['available'] else 'unavailable', None)
+
+    def fetch(video_id):
+        try:
+            segments = source(video_id)
+        except TranscriptUnavailable as e:
+            store.put(video_id, [], available=False)
+            return TranscriptResult(video_id, [], 'unavailable', e)
+        store.put(video_id, segments)
+        return TranscriptResult(video_id, segments, 'fetched', None)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < max_workers:
+                video_id = pending.popleft()
+                in_flight[pool.submit(fetch, video_id)] = video_id
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                video_id = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = TranscriptResult(video_id, None, 'error', e)
+                yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,13 @@
 """
 Streamlit UI components and layouts - Simplified
 """
+import math
 import streamlit as st
 import pandas as pd
 
+# Search results shown per page in the compact results table
+SEARCH_RESULTS_PAGE_SIZE = 20
+
 def setup_page_config():
     """Configure Streamlit page settings"""
     st.set_page_config(
@@ -52,6 +56,14 @@ def display_api_key_input():
     
     return api_key
 
+def display_performance_options():
+    """Display performance toggles in the sidebar"""
+    st.sidebar.checkbox(
+        "Compact memory mode",
+        key='compact_mode',
+        help="Store DataFrames with categoricals, downcast counters, float32 rates and Arrow strings"
+    )
+
 def display_channel_search_results(channels):
     """Display channel search results with selection options"""
     if not channels:
@@ -80,6 +92,77 @@ def display_channel_search_results(channels):
     
     return selected_channels, 'multiple' if selected_channels else 'none'
 
+def display_channel_search_table(channels, page_size=SEARCH_RESULTS_PAGE_SIZE):
+    """Display channel search results as one paginated, selectable table
+    
+    Selected IDs live in st.session_state.selected_channel_ids, so they
+    survive page changes without a widget per row.
+    """
+    if not channels:
+        return [], 'none'
+    
+    st.subheader("Search Results")
+    selected = st.session_state.setdefault('selected_channel_ids', [])
+    pages = math.ceil(len(channels) / page_size)
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1) if pages > 1 else 1
+    page_channels = channels[(page - 1) * page_size:page * page_size]
+    
+    # Apply the tick this rerun was triggered by before the button reads the selection
+    key = f"search_table_{st.session_state.get('search_table_version', 0)}_{page}"
+    edits = st.session_state.get(key, {}).get('edited_rows', {})
+    for row, changes in edits.items():
+        if 'select' in changes:
+            update_selection(selected, page_channels[int(row)]['channel_id'], changes['select'])
+    
+    with col2:
+        if st.button("Clear selection", disabled=not selected):
+            clear_channel_selection()
+            selected = st.session_state.setdefault('selected_channel_ids', [])
+            key = f"search_table_{st.session_state.search_table_version}_{page}"
+    status = col3.empty()
+    
+    table = pd.DataFrame({
+        'select': [channel['channel_id'] in selected for channel in page_channels],
+        'thumbnail': [channel['thumbnail'] for channel in page_channels],
+        'title': [channel['title'] for channel in page_channels],
+        'description': [channel['description'] for channel in page_channels],
+    })
+    edited = st.data_editor(
+        table,
+        column_config={
+            'select': st.column_config.CheckboxColumn("Select", width='small'),
+            'thumbnail': st.column_config.ImageColumn("", width='small'),
+            'title': st.column_config.TextColumn("Channel", width='medium'),
+            'description': st.column_config.TextColumn("Description", width='large'),
+        },
+        disabled=['thumbnail', 'title', 'description'],
+        hide_index=True,
+        use_container_width=True,
+        key=key
+    )
+    
+    for channel, is_selected in zip(page_channels, edited['select']):
+        update_selection(selected, channel['channel_id'], is_selected)
+    status.caption(f"{len(selected)} of {len(channels)} channels selected")
+    
+    return list(selected), 'multiple' if selected else 'none'
+
+def update_selection(selected, channel_id, is_selected):
+    """Add channel_id to or remove it from the selected list"""
+    if is_selected and channel_id not in selected:
+        selected.append(channel_id)
+    elif not is_selected and channel_id in selected:
+        selected.remove(channel_id)
+
+def clear_channel_selection():
+    """Drop the selected search results, along with the table edits that would tick them again"""
+    st.session_state.pop('selected_channel_ids', None)
+    # A new editor key drops its stored edits
+    st.session_state.search_table_version = st.session_state.get('search_table_version', 0) + 1
+
 def display_metrics_cards(stats):
     """Display key metrics in card layout"""
     col1, col2, col3, col4 = st.columns(4)
@@ -135,3 +218,57 @@ def display_video_metrics_cards(stats):
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric("Avg Engagement", f"{stats['avg_engagement_rate']:.2f}%")
         st.markdown('</div>', unsafe_allow_html=True)
+
+def display_quota_stats(stats):
+    """Display remaining API quota and units spent per method in the sidebar"""
+    st.sidebar.subheader("🎟️ API Quota")
+    st.sidebar.progress(
+        max(stats['remaining'], 0) / stats['capacity'],
+        text=f"{stats['remaining']:,.0f} / {stats['capacity']:,} units left"
+    )
+    if stats['spent_by_method']:
+        usage = pd.DataFrame({
+            'units': stats['spent_by_method'],
+            'calls': stats['calls_by_method'],
+            'retries': stats['retries_by_method'],
+            'refused': stats['refused_by_method']
+        }).fillna(0).astype(int)
+        st.sidebar.dataframe(usage, use_container_width=True)
+
+def display_cache_stats(stats):
+    """Display API response cache counters in the sidebar"""
+    st.sidebar.subheader("🗄️ API Cache")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Hits", f"{stats['hits']:,}")
+    col2.metric("Misses", f"{stats['misses'] + stats['stale']:,}")
+    col1.metric("Revalidated", f"{stats['revalidated']:,}")
+    col2.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+    st.sidebar.caption(
+        f"~{stats['units_saved']:,} quota units saved · "
+        f"{stats['entries']:,} entries ({stats['size_bytes'] / 1024:,.0f} KB)"
+    )
+
+def display_api_diagnostics(metrics):
+    """Display per-method API latency, bytes and quota burn plus the slowest calls in the sidebar"""
+    summary = metrics.summary()
+    with st.sidebar.expander("🩺 API Diagnostics"):
+        if not summary:
+            st.caption("No API calls yet.")
+            return
+        st.dataframe(
+            pd.DataFrame.from_dict(summary, orient='index').round(1),
+            use_container_width=True
+        )
+        st.caption("Slowest calls")
+        st.dataframe(
+            pd.DataFrame(
+                [call._asdict() for call in metrics.slowest()],
+                columns=['method', 'latency_ms', 'response_bytes', 'quota_units', 'retries', 'outcome']
+            ).round(1),
+            use_container_width=True
+        )
+        col1, col2 = st.columns(2)
+        col1.download_button("JSON", metrics.to_json(), file_name="api_metrics.json",
+                             mime="application/json")
+        col2.download_button("Prometheus", metrics.to_prometheus(), file_name="api_metrics.prom",
+                             mime="text/plain")
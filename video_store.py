@@ -0,0 +1,94 @@
+"""
+Local SQLite store of fetched videos, used for incremental channel syncs
+"""
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_STORE_PATH = os.path.join('.yt_cache', 'videos.sqlite3')
+
+VIDEO_COLUMNS = ['video_id', 'title', 'description', 'published_date', 'views', 'likes', 'comments',
+                 'duration']
+
+
+class VideoStore:
+    """Videos per uploads playlist, keyed by (playlist_id, video_id)"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS videos (
+                playlist_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                title TEXT,
+                description TEXT NOT NULL DEFAULT '',
+                published_date TEXT,
+                views INTEGER,
+                likes INTEGER,
+                comments INTEGER,
+                duration TEXT,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (playlist_id, video_id)
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(videos)')}
+        if 'description' not in columns:
+            # Stores created before descriptions were kept; rows get theirs on their next refresh
+            self._conn.execute("ALTER TABLE videos ADD COLUMN description TEXT NOT NULL DEFAULT ''")
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (playlist_id, published_date)'
+        )
+        self._conn.commit()
+
+    def known_video_ids(self, playlist_id):
+        """Return the set of video IDs already stored for a playlist"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT video_id FROM videos WHERE playlist_id = ?', (playlist_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def recent_video_ids(self, playlist_id, limit):
+        """Return the IDs of the most recently published stored videos"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT video_id FROM videos WHERE playlist_id = ? '
+                'ORDER BY published_date DESC LIMIT ?',
+                (playlist_id, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def upsert(self, playlist_id, videos):
+        """Insert new videos and overwrite statistics of existing ones"""
+        now = time.time()
+        rows = [
+            (playlist_id, *(video[col] for col in VIDEO_COLUMNS), now)
+            for video in videos
+        ]
+        # Columns are named because migrated tables have description last
+        columns = ['playlist_id', *VIDEO_COLUMNS, 'synced_at']
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO videos ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})", rows
+            )
+            self._conn.commit()
+
+    def load(self, playlist_id, limit=None):
+        """Return stored videos newest first, in the get_video_details schema"""
+        query = (f"SELECT {', '.join(VIDEO_COLUMNS)} FROM videos WHERE playlist_id = ? "
+                 'ORDER BY published_date DESC')
+        params = [playlist_id]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(VIDEO_COLUMNS, row)) for row in rows]
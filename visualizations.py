@@ -4,16 +4,25 @@ Chart and visualization functions - Simplified for public data
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
 
-def create_channel_comparison_chart(df):
+from memo import memoize
+
+# Above this many points per trace, scatter plots switch to WebGL and drop per-point text labels
+LARGE_DATA_THRESHOLD = 1000
+# Line series longer than this are downsampled with LTTB before serialization
+MAX_SERIES_POINTS = 500
+
+@memoize()
+def create_channel_comparison_chart(df, point_threshold=LARGE_DATA_THRESHOLD):
     """Create interactive comparison charts - adapted for single/multiple channels"""
     is_single_channel = len(df) == 1
     
     if is_single_channel:
         return create_single_channel_dashboard(df.iloc[0])
     else:
-        return create_multi_channel_dashboard(df)
+        return create_multi_channel_dashboard(df, point_threshold=point_threshold)
 
 def create_single_channel_dashboard(channel_data):
     """Create dashboard for single channel analysis"""
@@ -115,7 +124,7 @@ def create_single_channel_dashboard(channel_data):
     
     return fig
 
-def create_multi_channel_dashboard(df):
+def create_multi_channel_dashboard(df, point_threshold=LARGE_DATA_THRESHOLD):
     """Create dashboard for multiple channel comparison"""
     fig = make_subplots(
         rows=2, cols=2,
@@ -125,22 +134,25 @@ def create_multi_channel_dashboard(df):
                [{"secondary_y": False}, {"secondary_y": False}]]
     )
     
+    # Large frames render with WebGL and show channel names on hover only
+    large_data = len(df) > point_threshold
+    scatter = go.Scattergl if large_data else go.Scatter
+    labels = dict(mode='markers', hovertext=df['channel_title']) if large_data else \
+        dict(mode='markers+text', text=df['channel_title'], textposition="top center")
+    
     # Subscribers vs Views
     fig.add_trace(
-        go.Scatter(x=df['subscribers'], y=df['total_views'],
-                  mode='markers+text', text=df['channel_title'],
-                  textposition="top center", name='Channels',
-                  marker=dict(size=10, color=df['total_videos'], 
-                            colorscale='viridis', showscale=True)),
+        scatter(x=df['subscribers'], y=df['total_views'], name='Channels',
+                marker=dict(size=10, color=df['total_videos'], 
+                            colorscale='viridis', showscale=True),
+                **labels),
         row=1, col=1
     )
     
     # Videos vs Subscribers
     fig.add_trace(
-        go.Scatter(x=df['total_videos'], y=df['subscribers'],
-                  mode='markers+text', text=df['channel_title'],
-                  textposition="top center", name='Video Count vs Subs',
-                  marker=dict(size=8, color='red')),
+        scatter(x=df['total_videos'], y=df['subscribers'], name='Video Count vs Subs',
+                marker=dict(size=8, color='red'), **labels),
         row=1, col=2
     )
     
@@ -153,9 +165,8 @@ def create_multi_channel_dashboard(df):
     )
     
     # Timeline
-    if 'created_year' not in df.columns:
-        df['created_year'] = pd.to_datetime(df['created_date']).dt.year
-    timeline_data = df.groupby('created_year').size().reset_index(name='count')
+    created_year = df['created_year'] if 'created_year' in df.columns else pd.to_datetime(df['created_date']).dt.year
+    timeline_data = created_year.value_counts().sort_index().rename_axis('created_year').reset_index(name='count')
     fig.add_trace(
         go.Scatter(x=timeline_data['created_year'], y=timeline_data['count'],
                   mode='lines+markers', name='Channels Created',
@@ -167,6 +178,7 @@ def create_multi_channel_dashboard(df):
                      title_text="Multi-Channel Analytics")
     return fig
 
+@memoize()
 def create_video_performance_chart(video_df, channel_name):
     """Create video performance visualization"""
     if 'engagement_rate' not in video_df.columns:
@@ -189,6 +201,7 @@ def create_video_performance_chart(video_df, channel_name):
     fig.update_layout(height=600)
     return fig
 
+@memoize()
 def create_correlation_heatmap(df):
     """Create correlation matrix heatmap"""
     numeric_cols = ['subscribers', 'total_videos', 'total_views']
@@ -199,10 +212,13 @@ def create_correlation_heatmap(df):
                    color_continuous_scale='RdBu_r')
     return fig
 
-def create_engagement_trends_chart(video_df):
+@memoize()
+def create_engagement_trends_chart(video_df, max_points=MAX_SERIES_POINTS,
+                                   point_threshold=LARGE_DATA_THRESHOLD):
     """Create engagement trends over time"""
+    # Work on a copy: the caller's frame may be a memoized result shared across reruns
+    video_df = video_df.copy()
     if 'engagement_rate' not in video_df.columns:
-        video_df = video_df.copy()
         video_df['engagement_rate'] = (video_df['likes'] / video_df['views'].replace(0, 1)) * 100
     
     if not pd.api.types.is_datetime64_any_dtype(video_df['published_date']):
@@ -218,17 +234,16 @@ def create_engagement_trends_chart(video_df):
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
+    months = monthly_stats['month_year'].astype(str)
     fig.add_trace(
-        go.Scatter(x=monthly_stats['month_year'].astype(str), 
-                  y=monthly_stats['views'],
-                  mode='lines+markers', name='Avg Views'),
+        line_trace(months, monthly_stats['views'], max_points, point_threshold,
+                   mode='lines+markers', name='Avg Views'),
         secondary_y=False,
     )
     
     fig.add_trace(
-        go.Scatter(x=monthly_stats['month_year'].astype(str), 
-                  y=monthly_stats['engagement_rate'],
-                  mode='lines+markers', name='Avg Engagement Rate'),
+        line_trace(months, monthly_stats['engagement_rate'], max_points, point_threshold,
+                   mode='lines+markers', name='Avg Engagement Rate'),
         secondary_y=True,
     )
     
@@ -237,3 +252,90 @@ def create_engagement_trends_chart(video_df):
     fig.update_yaxes(title_text="Engagement Rate (%)", secondary_y=True)
     
     return fig
+
+@memoize()
+def create_channel_history_chart(history_df, max_points=MAX_SERIES_POINTS,
+                                 point_threshold=LARGE_DATA_THRESHOLD):
+    """Create subscriber and view growth lines from channel snapshots"""
+    history_df = history_df.sort_values('snapshot_at')
+    
+    fig = make_subplots(rows=1, cols=2, subplot_titles=('Subscribers', 'Total Views'))
+    for channel_title, channel_history in history_df.groupby('channel_title'):
+        fig.add_trace(
+            line_trace(channel_history['snapshot_at'], channel_history['subscribers'], max_points, point_threshold,
+                       mode='lines+markers', name=channel_title, legendgroup=channel_title),
+            row=1, col=1
+        )
+        fig.add_trace(
+            line_trace(channel_history['snapshot_at'], channel_history['total_views'], max_points, point_threshold,
+                       mode='lines+markers', name=channel_title, legendgroup=channel_title,
+                       showlegend=False),
+            row=1, col=2
+        )
+    
+    fig.update_layout(height=500, title_text="Channel Growth Over Time")
+    return fig
+
+@memoize()
+def create_cross_channel_video_chart(video_df):
+    """Compare per-video views and engagement across crawled channels"""
+    fig = make_subplots(rows=1, cols=2, subplot_titles=('Views per Video', 'Engagement Rate (%)'))
+    
+    for channel_title, channel_videos in video_df.groupby('channel_title'):
+        fig.add_trace(
+            go.Box(y=channel_videos['views'], name=channel_title, legendgroup=channel_title),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Box(y=channel_videos['engagement_rate'], name=channel_title,
+                   legendgroup=channel_title, showlegend=False),
+            row=1, col=2
+        )
+    
+    fig.update_yaxes(type='log', row=1, col=1)
+    fig.update_layout(height=600, title_text="Cross-Channel Video Performance")
+    return fig
+
+def line_trace(x, y, max_points=MAX_SERIES_POINTS, point_threshold=LARGE_DATA_THRESHOLD, **kwargs):
+    """Build a line trace, LTTB-downsampled to max_points and WebGL-rendered when large"""
+    x = pd.Series(x).reset_index(drop=True)
+    y = pd.Series(y).reset_index(drop=True)
+    scatter = go.Scattergl if len(x) > point_threshold else go.Scatter
+    if len(x) > max_points:
+        keep = lttb_indices(_numeric_axis(x), y.to_numpy(dtype='float64'), max_points)
+        x, y = x.iloc[keep], y.iloc[keep]
+    return scatter(x=x, y=y, **kwargs)
+
+def lttb_indices(x, y, n_out):
+    """Pick n_out point indices that preserve the visual shape of a series (Largest-Triangle-Three-Buckets)
+
+    x must be sorted ascending. The first and last points are always kept;
+    every bucket in between contributes the point forming the largest
+    triangle with the previously kept point and the next bucket's mean.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    y = np.nan_to_num(y)
+    # n_out - 2 buckets over the interior points, each at least one point wide since n_out < n
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64)[:-1], [n - 1, n])
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop, next_stop = edges[i], edges[i + 1], edges[i + 2]
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+def _numeric_axis(x):
+    """Map dates to seconds since the first point and categorical labels to positions for LTTB geometry"""
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return (x - x.iloc[0]).dt.total_seconds().to_numpy(dtype='float64')
+    if pd.api.types.is_numeric_dtype(x):
+        return x.to_numpy(dtype='float64')
+    return np.arange(len(x), dtype='float64')
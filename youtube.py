@@ -1,107 +1,559 @@
 """
 YouTube API handler module - Public Data Only
 """
-import streamlit as st
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest, build_http
+
+from instrumentation import ApiMetrics, MeteredHttp
+from quota import QuotaExceededError, QuotaScheduler, classify_error, quota_cost
+
+# Maximum number of calls the API accepts in one batch request
+BATCH_LIMIT = 50
+
+# Partial-response fields requested at each call site, so descriptions are
+# the only bulky strings on the wire. Override entries with
+# YouTubeAnalytics(fields={...}); None requests the whole parts.
+DEFAULT_FIELDS = {
+    'search_channels': 'etag,items/snippet(channelId,title,description,thumbnails/default/url)',
+    'channel_snippets': 'etag,items(id,snippet(title,description,thumbnails/default/url))',
+    'channel_stats': 'etag,items(id,snippet(title,description,publishedAt,country),'
+                     'statistics(subscriberCount,videoCount,viewCount),contentDetails/relatedPlaylists/uploads)',
+    'playlist_items': 'etag,nextPageToken,items/snippet/resourceId/videoId',
+    'video_details': 'etag,items(id,snippet(title,description,publishedAt),'
+                     'statistics(viewCount,likeCount,commentCount),contentDetails/duration)',
+}
+
+logger = logging.getLogger(__name__)
+
+
+class PartialFetchError(Exception):
+    """Some calls of a multi-call fetch failed
+    
+    results holds what the successful calls returned, in the shape the
+    method normally returns; errors maps a label for each failed call to
+    its exception.
+    """
+    
+    def __init__(self, message, results, errors):
+        super().__init__(message)
+        self.results = results
+        self.errors = errors
+
 
 class YouTubeAnalytics:
-    def __init__(self, api_key):
+    def __init__(self, api_key, cache=None, scheduler=None, api_endpoint=None, http_factory=build_http,
+                 metrics=None, fields=None):
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        # The bundled discovery document avoids a network fetch on every build;
+        # api_endpoint points the client at another server, e.g. fake_youtube
+        client_options = {'api_endpoint': api_endpoint} if api_endpoint else None
+        self.youtube = build('youtube', 'v3', developerKey=api_key,
+                             static_discovery=True, cache_discovery=False,
+                             client_options=client_options)
+        self.batch_uri = api_endpoint.rstrip('/') + '/batch' if api_endpoint else None
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.http_factory = http_factory
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self.fields = dict(DEFAULT_FIELDS, **(fields or {}))
+        self._idle_http = []
+        self._http_lock = threading.Lock()
+    
+    def _acquire_http(self):
+        """Borrow an idle HTTP client, or create one (httplib2 is not thread-safe)"""
+        with self._http_lock:
+            if self._idle_http:
+                return self._idle_http.pop()
+        return self.http_factory()
+    
+    def _release_http(self, http):
+        """Return an HTTP client, keeping its open connections for the next call"""
+        with self._http_lock:
+            self._idle_http.append(http)
+    
+    def _execute(self, resource, priority='normal', **params):
+        """Run a list() call on a resource through the response cache and quota scheduler"""
+        method = f'{resource}.list'
+        start = time.perf_counter()
+        cached = self.cache.get(method, params) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            self.metrics.record(method, params, (time.perf_counter() - start) * 1000,
+                                outcome='cache_hit', priority=priority)
+            return cached.body
+        
+        request = getattr(self.youtube, resource)().list(**params)
+        if cached is not None and cached.etag:
+            request.headers['If-None-Match'] = cached.etag
+        
+        attempts = 0
+        outcome = 'error'
+        pooled_http = self._acquire_http()
+        http = MeteredHttp(pooled_http)
+        
+        def send():
+            nonlocal attempts
+            attempts += 1
+            return request.execute(http=http)
         
-    def search_channels(self, query, max_results=50):
-        """Search for channels based on query"""
         try:
-            search_response = self.youtube.search().list(
-                q=query,
-                part='snippet',
-                type='channel',
-                maxResults=max_results,
-                relevanceLanguage='en'
-            ).execute()
+            response = self.scheduler.run(method, send, priority)
+            outcome = 'ok'
+        except HttpError as e:
+            if cached is not None and e.resp.status == 304:
+                self.cache.refresh(method, params)
+                outcome = 'not_modified'
+                return cached.body
+            raise
+        finally:
+            self._release_http(pooled_http)
+            self.metrics.record(
+                method, params, (time.perf_counter() - start) * 1000, http.response_bytes,
+                quota_cost(method) * attempts, max(attempts - 1, 0), outcome, priority
+            )
+        
+        if self.cache is not None:
+            self.cache.put(method, params, response)
+        return response
+        
+    def _execute_batch(self, calls, priority='normal'):
+        """Run independent list() calls as multipart batch requests
+        
+        calls is a list of (resource, params) pairs. Returns one entry per
+        call, in order: the response dict, or the exception that call raised.
+        Fresh cache entries are served locally and transient failures are
+        retried individually through _execute. Once the scheduler refuses a
+        call or the API reports the daily quota spent, every call not yet
+        sent gets a QuotaExceededError instead of being sent.
+        """
+        results = [None] * len(calls)
+        pending = []
+        for index, (resource, params) in enumerate(calls):
+            cached = self.cache.get(f'{resource}.list', params) if self.cache is not None else None
+            if cached is not None and cached.fresh:
+                results[index] = cached.body
+                self.metrics.record(f'{resource}.list', params, 0.0, outcome='cache_hit',
+                                    priority=priority, batched=True)
+            else:
+                pending.append(index)
+        
+        def store_result(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None:
+                results[index] = exception
+                return
+            results[index] = response
+            if self.cache is not None:
+                resource, params = calls[index]
+                self.cache.put(f'{resource}.list', params, response)
+        
+        quota_error = None
+        for start in range(0, len(pending), BATCH_LIMIT):
+            batch = self._new_batch(store_result)
+            group = []
+            for index in pending[start:start+BATCH_LIMIT]:
+                resource, params = calls[index]
+                if quota_error is None:
+                    try:
+                        self.scheduler.acquire(f'{resource}.list', priority)
+                    except QuotaExceededError as e:
+                        quota_error = e
+                if quota_error is not None:
+                    results[index] = quota_error
+                    continue
+                batch.add(getattr(self.youtube, resource)().list(**params), request_id=str(index))
+                group.append(index)
+            if not group:
+                continue
             
-            channels = []
-            for item in search_response['items']:
-                channels.append({
-                    'channel_id': item['snippet']['channelId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'][:200] + '...',
-                    'thumbnail': item['snippet']['thumbnails']['default']['url']
-                })
-            return channels
-        except Exception as e:
-            st.error(f"Error searching channels: {str(e)}")
-            return []
+            pooled_http = self._acquire_http()
+            http = MeteredHttp(pooled_http)
+            started = time.perf_counter()
+            try:
+                batch.execute(http=http)
+            except Exception as e:
+                for index in group:
+                    if results[index] is None:
+                        results[index] = e
+            finally:
+                self._release_http(pooled_http)
+            
+            for index in group:
+                if isinstance(results[index], Exception) and classify_error(results[index]) == 'quota':
+                    self.scheduler.exhaust()
+                    method = f'{calls[index][0]}.list'
+                    error = QuotaExceededError(f"Daily quota exhausted while calling {method}")
+                    error.__cause__ = results[index]
+                    results[index] = error
+                    quota_error = quota_error or error
+            
+            # Sub-calls share the batch round trip, so each is charged its latency and a share of the bytes
+            latency_ms = (time.perf_counter() - started) * 1000
+            for index in group:
+                resource, params = calls[index]
+                self.metrics.record(
+                    f'{resource}.list', params, latency_ms, http.response_bytes // len(group),
+                    quota_cost(f'{resource}.list'),
+                    outcome='error' if isinstance(results[index], Exception) else 'ok',
+                    priority=priority, batched=True
+                )
+        
+        for index in pending:
+            if isinstance(results[index], Exception) and classify_error(results[index]) == 'transient':
+                resource, params = calls[index]
+                try:
+                    results[index] = self._execute(resource, priority=priority, **params)
+                except Exception as e:
+                    results[index] = e
+        return results
     
-    def get_channel_stats(self, channel_ids):
-        """Get detailed channel statistics"""
-        all_data = []
+    def _new_batch(self, callback):
+        """Create a batch request, sent to api_endpoint when one is configured"""
+        if self.batch_uri is not None:
+            return BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+        return self.youtube.new_batch_http_request(callback=callback)
+    
+    def search_channels(self, query, max_results=50, priority='normal'):
+        """Search for channels based on query"""
+        search_response = self._execute(
+            'search',
+            priority=priority,
+            q=query,
+            part='snippet',
+            type='channel',
+            maxResults=max_results,
+            relevanceLanguage='en',
+            fields=self.fields['search_channels']
+        )
         
-        # Split channel_ids into chunks of 50 (API limit)
+        snippets = [item['snippet'] for item in search_response.get('items', [])]
+        return _rows(_parse_search_columns(snippets, [snippet['channelId'] for snippet in snippets]))
+    
+    def get_channel_snippets(self, channel_ids, priority='normal'):
+        """Fetch search-result rows for known channel IDs at 1 quota unit per 50 instead of 100 per search"""
+        channels = []
         for i in range(0, len(channel_ids), 50):
-            chunk = channel_ids[i:i+50]
-            
-            request = self.youtube.channels().list(
-                part='snippet,contentDetails,statistics',
-                id=','.join(chunk)
+            response = self._execute(
+                'channels',
+                priority=priority,
+                part='snippet',
+                id=','.join(channel_ids[i:i+50]),
+                fields=self.fields['channel_snippets']
             )
-            response = request.execute()
-            
-            for item in response['items']:
-                data = {
-                    'channel_id': item['id'],
-                    'channel_title': item['snippet']['title'],
-                    'created_date': item['snippet']['publishedAt'],
-                    'description': item['snippet']['description'][:300] + '...',
-                    'country': item['snippet'].get('country', 'Not specified'),
-                    'subscribers': int(item['statistics'].get('subscriberCount', 0)),
-                    'total_videos': int(item['statistics'].get('videoCount', 0)),
-                    'total_views': int(item['statistics'].get('viewCount', 0)),
-                    'playlist_id': item['contentDetails']['relatedPlaylists']['uploads']
-                }
-                all_data.append(data)
+            items = response.get('items', [])
+            channels.extend(_rows(_parse_search_columns(
+                [item['snippet'] for item in items], [item['id'] for item in items]
+            )))
+        return channels
+    
+    def get_channel_stats(self, channel_ids, max_workers=1, priority='normal', batched=False):
+        """Get detailed channel statistics
+        
+        With max_workers > 1 the 50-ID chunks are fetched in parallel; with
+        batched=True they are sent together as one batch HTTP request. Output
+        order follows channel_ids regardless of completion order. Failed
+        chunks raise PartialFetchError, whose results keep the chunks that
+        succeeded.
+        """
+        # Split channel_ids into chunks of 50 (API limit)
+        chunks = [channel_ids[i:i+50] for i in range(0, len(channel_ids), 50)]
+        fetch_chunk = partial(self._fetch_channel_chunk, priority=priority)
         
+        if batched and len(chunks) > 1:
+            responses = self._execute_batch(
+                [('channels', {'part': 'snippet,contentDetails,statistics', 'id': ','.join(chunk),
+                               'fields': self.fields['channel_stats']})
+                 for chunk in chunks],
+                priority
+            )
+            results = [
+                ([], response) if isinstance(response, Exception)
+                else (_rows(_parse_channel_columns(response.get('items', []))), None)
+                for response in responses
+            ]
+        elif max_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                results = list(pool.map(fetch_chunk, chunks))
+        else:
+            results = [fetch_chunk(chunk) for chunk in chunks]
+        
+        all_data = []
+        errors = {}
+        for chunk_number, (chunk_data, error) in enumerate(results, start=1):
+            if error is not None:
+                label = f"channel chunk {chunk_number}/{len(chunks)}"
+                logger.error("Error fetching %s: %s", label, error)
+                errors[label] = error
+            all_data.extend(chunk_data)
+        
+        if errors:
+            raise PartialFetchError(f"{len(errors)} of {len(chunks)} channel chunks failed", all_data, errors)
         return all_data
     
-    def get_video_details(self, playlist_id, max_results=50):
+    def _fetch_channel_chunk(self, chunk, priority='normal'):
+        """Fetch one chunk of up to 50 channels, returning (rows, error)"""
+        try:
+            response = self._execute(
+                'channels',
+                priority=priority,
+                part='snippet,contentDetails,statistics',
+                id=','.join(chunk),
+                fields=self.fields['channel_stats']
+            )
+        except Exception as e:
+            return [], e
+        
+        return _rows(_parse_channel_columns(response.get('items', []))), None
+    
+    def get_video_details(self, playlist_id, max_results=50, pipelined=False, priority='normal'):
         """Get video details from a channel's playlist"""
         videos = []
-        next_page_token = None
+        for batch in self.iter_video_details(playlist_id, max_results, pipelined, priority):
+            videos.extend(batch)
+        return videos
+    
+    def iter_video_details(self, playlist_id, max_results=50, pipelined=False, priority='normal'):
+        """Yield parsed video batches from a channel's playlist, one per page
         
-        while len(videos) < max_results:
-            request = self.youtube.playlistItems().list(
-                part='snippet',
-                playlistId=playlist_id,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
+        With pipelined=True a background thread pages through playlistItems
+        while the videos().list call for the previous page is in flight.
+        """
+        for columns in self.iter_video_columns(playlist_id, max_results, pipelined, priority):
+            yield _rows(columns)
+    
+    def iter_video_columns(self, playlist_id, max_results=50, pipelined=False, priority='normal'):
+        """Like iter_video_details, but yield each page as a dict of column lists
+        
+        Column dicts build DataFrames several times faster than lists of
+        row dicts, which matters for crawls of whole catalogs.
+        """
+        pages = self._iter_playlist_pages(playlist_id, max_results, priority)
+        if pipelined:
+            pages = self._prefetch(pages)
+        
+        # Close the pages explicitly so an error or early exit stops the prefetch thread now, not at GC
+        try:
+            for video_ids in pages:
+                yield self._fetch_video_columns(video_ids, priority)
+        finally:
+            pages.close()
+    
+    def get_video_details_for_channels(self, playlist_ids, max_results=50, priority='normal'):
+        """Get video details for several uploads playlists using batch requests
+        
+        Each round sends the next playlistItems page of every unfinished
+        playlist as one batch, then the matching videos().list calls as
+        another. Returns a dict mapping playlist_id to its list of videos;
+        failed calls raise PartialFetchError once every round is done.
+        """
+        videos = {playlist_id: [] for playlist_id in playlist_ids}
+        errors = {}
+        fetched = dict.fromkeys(playlist_ids, 0)
+        page_tokens = dict.fromkeys(playlist_ids)
+        active = list(playlist_ids)
+        
+        while active:
+            pages = self._execute_batch(
+                [('playlistItems', {
+                    'part': 'snippet',
+                    'playlistId': playlist_id,
+                    'maxResults': min(50, max_results - fetched[playlist_id]),
+                    'pageToken': page_tokens[playlist_id],
+                    'fields': self.fields['playlist_items']
+                }) for playlist_id in active],
+                priority
             )
-            response = request.execute()
             
-            video_ids = []
-            for item in response['items']:
-                video_ids.append(item['snippet']['resourceId']['videoId'])
+            owners, stats_calls, still_active = [], [], []
+            for playlist_id, response in zip(active, pages):
+                if isinstance(response, Exception):
+                    logger.error("Error fetching playlist %s: %s", playlist_id, response)
+                    errors[f"playlist {playlist_id}"] = response
+                    continue
+                video_ids = [item['snippet']['resourceId']['videoId'] for item in response['items']]
+                fetched[playlist_id] += len(video_ids)
+                if video_ids:
+                    owners.append(playlist_id)
+                    stats_calls.append(('videos', {
+                        'part': 'statistics,snippet,contentDetails',
+                        'id': ','.join(video_ids),
+                        'fields': self.fields['video_details']
+                    }))
+                page_tokens[playlist_id] = response.get('nextPageToken')
+                if page_tokens[playlist_id] and fetched[playlist_id] < max_results:
+                    still_active.append(playlist_id)
+            
+            for playlist_id, response in zip(owners, self._execute_batch(stats_calls, priority)):
+                if isinstance(response, Exception):
+                    logger.error("Error fetching video stats for %s: %s", playlist_id, response)
+                    errors[f"video stats for {playlist_id}"] = response
+                    continue
+                videos[playlist_id].extend(_rows(_parse_video_columns(response.get('items', []))))
             
-            # Get video statistics
-            stats_request = self.youtube.videos().list(
-                part='statistics,snippet,contentDetails',
-                id=','.join(video_ids)
+            active = still_active
+        
+        if errors:
+            raise PartialFetchError(f"{len(errors)} playlist calls failed", videos, errors)
+        return videos
+    
+    def sync_video_details(self, playlist_id, store, max_results=50, refresh_window=50,
+                           priority='normal'):
+        """Incrementally sync a channel's uploads into a VideoStore
+        
+        The uploads playlist is newest-first, so paging stops at the first
+        video already in the store. Statistics are fetched for the new videos
+        plus the refresh_window most recent stored ones. Returns up to
+        max_results stored videos in the get_video_details schema.
+        """
+        known = store.known_video_ids(playlist_id)
+        # Keep paging past known videos until the store can satisfy max_results
+        stop_at_known = len(known) >= max_results
+        
+        new_ids = []
+        for video_ids in self._iter_playlist_pages(playlist_id, max_results, priority):
+            unseen = [video_id for video_id in video_ids if video_id not in known]
+            new_ids.extend(unseen)
+            if stop_at_known and len(unseen) < len(video_ids):
+                break
+        
+        new_set = set(new_ids)
+        refresh_ids = [
+            video_id for video_id in store.recent_video_ids(playlist_id, refresh_window)
+            if video_id not in new_set
+        ]
+        
+        ids_to_fetch = new_ids + refresh_ids
+        for i in range(0, len(ids_to_fetch), 50):
+            store.upsert(playlist_id, _rows(self._fetch_video_columns(ids_to_fetch[i:i+50], priority)))
+        
+        return store.load(playlist_id, limit=max_results)
+    
+    def _iter_playlist_pages(self, playlist_id, max_results, priority='normal'):
+        """Yield lists of video IDs, one per playlistItems page"""
+        fetched = 0
+        next_page_token = None
+        
+        while fetched < max_results:
+            response = self._execute(
+                'playlistItems',
+                priority=priority,
+                part='snippet',
+                playlistId=playlist_id,
+                maxResults=min(50, max_results - fetched),
+                pageToken=next_page_token,
+                fields=self.fields['playlist_items']
             )
-            stats_response = stats_request.execute()
             
-            for item in stats_response['items']:
-                video_data = {
-                    'video_id': item['id'],
-                    'title': item['snippet']['title'],
-                    'published_date': item['snippet']['publishedAt'],
-                    'views': int(item['statistics'].get('viewCount', 0)),
-                    'likes': int(item['statistics'].get('likeCount', 0)),
-                    'comments': int(item['statistics'].get('commentCount', 0)),
-                    'duration': item.get('contentDetails', {}).get('duration', 'N/A')
-                }
-                videos.append(video_data)
+            video_ids = [item['snippet']['resourceId']['videoId'] for item in response.get('items', [])]
+            fetched += len(video_ids)
+            if video_ids:
+                yield video_ids
             
             next_page_token = response.get('nextPageToken')
             if not next_page_token:
                 break
-                
-        return videos
+    
+    def _prefetch(self, pages, depth=2):
+        """Drain a page iterator on a producer thread, yielding pages through a bounded queue"""
+        buffer = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+        
+        def send(item):
+            """Put item on the buffer unless the consumer has gone away; return whether it was sent"""
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for page in pages:
+                    if not send((page, None)):
+                        return
+                send((done, None))
+            except Exception as e:
+                send((done, e))
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                page, error = buffer.get()
+                if page is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield page
+        finally:
+            stop.set()
+            producer.join()
+    
+    def _fetch_video_columns(self, video_ids, priority='normal'):
+        """Get statistics, snippet and duration for up to 50 video IDs as column lists"""
+        stats_response = self._execute(
+            'videos',
+            priority=priority,
+            part='statistics,snippet,contentDetails',
+            id=','.join(video_ids),
+            fields=self.fields['video_details']
+        )
+        
+        return _parse_video_columns(stats_response.get('items', []))
+
+
+def _rows(columns):
+    """Turn a dict of equal-length column lists into a list of row dicts"""
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+def _parse_search_columns(snippets, channel_ids):
+    """Flatten search or channel snippets into search-result columns"""
+    return {
+        'channel_id': channel_ids,
+        'title': [snippet.get('title', '') for snippet in snippets],
+        'description': [snippet.get('description', '')[:200] + '...' for snippet in snippets],
+        'thumbnail': [snippet.get('thumbnails', {}).get('default', {}).get('url') for snippet in snippets]
+    }
+
+def _parse_channel_columns(items):
+    """Flatten channels().list items into channel stats columns; missing fields take defaults"""
+    snippets = [item.get('snippet', {}) for item in items]
+    statistics = [item.get('statistics', {}) for item in items]
+    return {
+        'channel_id': [item['id'] for item in items],
+        'channel_title': [snippet.get('title', '') for snippet in snippets],
+        'created_date': [snippet.get('publishedAt') for snippet in snippets],
+        'description': [snippet.get('description', '')[:300] + '...' for snippet in snippets],
+        'country': [snippet.get('country', 'Not specified') for snippet in snippets],
+        'subscribers': [int(stats.get('subscriberCount', 0)) for stats in statistics],
+        'total_videos': [int(stats.get('videoCount', 0)) for stats in statistics],
+        'total_views': [int(stats.get('viewCount', 0)) for stats in statistics],
+        'playlist_id': [item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+                        for item in items]
+    }
+
+def _parse_video_columns(items):
+    """Flatten videos().list items into video detail columns; missing fields take defaults"""
+    snippets = [item.get('snippet', {}) for item in items]
+    statistics = [item.get('statistics', {}) for item in items]
+    return {
+        'video_id': [item['id'] for item in items],
+        'title': [snippet.get('title', '') for snippet in snippets],
+        'description': [snippet.get('description', '')[:300] for snippet in snippets],
+        'published_date': [snippet.get('publishedAt') for snippet in snippets],
+        'views': [int(stats.get('viewCount', 0)) for stats in statistics],
+        'likes': [int(stats.get('likeCount', 0)) for stats in statistics],
+        'comments': [int(stats.get('commentCount', 0)) for stats in statistics],
+        'duration': [item.get('contentDetails', {}).get('duration', 'N/A') for item in items]
+    }